@@ -0,0 +1,59 @@
+"""
+Per-request setup overhead of research: building a ResearchAgent and a search
+tool for every request vs borrowing warm ones from an AgentPool.
+
+Only the setup is timed (the research itself is identical in both variants):
+"per-request" constructs ResearchAgent() + MockSearchTool() the way
+perform_research and google_search used to, "pool" acquires from a warmed pool
+of --concurrency agents while --concurrency requests run at once.
+
+    python -m benchmarks.bench_agent_pool --requests 2000 --concurrency 4
+"""
+import time
+import asyncio
+import argparse
+
+from src.core.metrics import LatencyRecorder
+from src.agents.pool import AgentPool
+from src.agents.researcher.agent import ResearchAgent
+from src.agents.researcher.tools import MockSearchTool
+
+async def per_request(args):
+    recorder = LatencyRecorder("per-request", max_samples=args.requests)
+    for _ in range(args.requests):
+        started = time.perf_counter()
+        ResearchAgent()
+        MockSearchTool()
+        recorder.record(time.perf_counter() - started)
+    return recorder, f"{args.requests} agents built for {args.requests} requests"
+
+async def pooled(args):
+    pool = AgentPool(ResearchAgent, args.concurrency, name="research_agents")
+    pool.warm()
+    recorder = LatencyRecorder("pool", max_samples=args.requests)
+    remaining = iter(range(args.requests))
+
+    async def worker():
+        for _ in remaining:
+            started = time.perf_counter()
+            async with pool.acquire():
+                recorder.record(time.perf_counter() - started)
+                # Yield so requests overlap like real research does
+                await asyncio.sleep(0)
+
+    await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+    stats = pool.stats
+    return recorder, f"{stats['created']} agents built for {stats['acquisitions']} requests, peak in use {stats['peak_in_use']}/{stats['size']}"
+
+async def main(args):
+    print(f"{'variant':<14}{'mean (us)':>12}{'p50 (us)':>12}{'p99 (us)':>12}  notes")
+    for run in (per_request, pooled):
+        recorder, note = await run(args)
+        summary = recorder.summary()
+        print(f"{run.__name__:<14}{summary['mean_ms'] * 1000:>12.1f}{summary['p50_ms'] * 1000:>12.1f}{summary['p99_ms'] * 1000:>12.1f}  {note}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=4)
+    asyncio.run(main(parser.parse_args()))
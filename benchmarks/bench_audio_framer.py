@@ -0,0 +1,147 @@
+"""
+Outbound host audio: one AudioFrame per model chunk vs the AudioFramer ring
+buffer with a PacedAudioSender.
+
+The model delivers --seconds of 24 kHz PCM in chunks of random (also odd) sizes,
+--speedup times faster than real time. Frames go to a stand-in for
+rtc.AudioSource that plays out in real time and blocks capture_frame once
+--queue-ms of audio is queued, as the LiveKit source does. The stand-in frame
+copies its data into a new buffer on construction like rtc.AudioFrame, which is
+where the per-chunk path allocates.
+
+Reported per variant: frame sizes, send interval jitter (|interval - previous
+frame's duration|), the most audio queued downstream (what a barge-in can no
+longer take back), frame buffers and bytes allocated per second of audio, and
+bytes lost to odd-length chunks.
+
+    python -m benchmarks.bench_audio_framer --seconds 5 --frame-ms 20
+"""
+import random
+import ctypes
+import asyncio
+import argparse
+
+from src.core.metrics import LatencyRecorder
+from src.infrastructure.audio_framer import AudioFramer, PacedAudioSender
+
+SAMPLE_RATE = 24000
+
+class Frame:
+    """Copies its samples on construction like rtc.AudioFrame; counts the allocations."""
+
+    allocations = 0
+    allocated_bytes = 0
+
+    def __init__(self, data, sample_rate: int, num_channels: int, samples_per_channel: int):
+        size = num_channels * samples_per_channel
+        self._data = (ctypes.c_int16 * size).from_buffer_copy(memoryview(data).cast("B")[:size * 2])
+        self.sample_rate = sample_rate
+        self.samples_per_channel = samples_per_channel
+        Frame.allocations += 1
+        Frame.allocated_bytes += size * 2
+
+    @classmethod
+    def create(cls, sample_rate: int, num_channels: int, samples_per_channel: int) -> "Frame":
+        return cls(bytes(num_channels * samples_per_channel * 2), sample_rate, num_channels, samples_per_channel)
+
+    @property
+    def data(self) -> memoryview:
+        return memoryview(self._data).cast("B").cast("h")
+
+class Source:
+    """Plays captured frames out in real time; capture blocks while the queue is full."""
+
+    def __init__(self, queue_ms: int):
+        self.queue = queue_ms / 1000
+        self.playout_end = 0.0
+        self.sends = []
+        self.max_queued = 0.0
+
+    async def capture_frame(self, frame: Frame) -> None:
+        loop = asyncio.get_running_loop()
+        duration = frame.samples_per_channel / frame.sample_rate
+        now = loop.time()
+        self.playout_end = max(self.playout_end, now)
+        if self.playout_end - now + duration > self.queue:
+            await asyncio.sleep(self.playout_end - now + duration - self.queue)
+            now = loop.time()
+        self.playout_end += duration
+        self.max_queued = max(self.max_queued, self.playout_end - now)
+        self.sends.append((now, duration))
+
+def model_chunks(args):
+    rng = random.Random(args.seed)
+    total, chunks = int(args.seconds * SAMPLE_RATE * 2), []
+    while total > 0:
+        size = min(total, rng.randint(args.min_chunk, args.max_chunk))
+        chunks.append(bytes(rng.getrandbits(8) for _ in range(size)))
+        total -= size
+    return chunks
+
+async def stream_model(chunks, send, args):
+    for chunk in chunks:
+        await send(chunk)
+        await asyncio.sleep(len(chunk) / 2 / SAMPLE_RATE / args.speedup)
+
+async def per_chunk(chunks, source, args):
+    lost = 0
+
+    async def send(chunk: bytes) -> None:
+        nonlocal lost
+        # The previous send_audio_chunk: a trailing odd byte is silently dropped
+        samples = len(chunk) // 2
+        lost += len(chunk) - samples * 2
+        await source.capture_frame(Frame(chunk, SAMPLE_RATE, 1, samples))
+
+    await stream_model(chunks, send, args)
+    return lost
+
+async def framed(chunks, source, args):
+    framer = AudioFramer(SAMPLE_RATE, 1, args.frame_ms)
+    sender = PacedAudioSender(
+        framer, source.capture_frame, lambda: Frame.create(SAMPLE_RATE, 1, framer.samples_per_frame), args.lead_ms
+    )
+
+    async def send(chunk: bytes) -> None:
+        framer.write(chunk)
+        sender.wake()
+
+    await stream_model(chunks, send, args)
+    framer.pad()
+    sender.wake()
+    while framer.buffered_bytes:
+        await asyncio.sleep(framer.frame_ms / 1000)
+    await sender.close()
+    return framer.dropped_bytes
+
+async def main(args):
+    chunks = model_chunks(args)
+    audio_seconds = sum(len(c) for c in chunks) / 2 / SAMPLE_RATE
+    print(f"{audio_seconds:.1f}s of audio in {len(chunks)} chunks of {args.min_chunk}-{args.max_chunk} bytes, model at {args.speedup}x real time")
+    print(f"{'variant':<10}{'frame ms':>14}{'jitter p50':>12}{'jitter p99':>12}{'max queued':>12}{'allocs/s':>10}{'KB/s':>8}{'lost B':>8}")
+    for run in (per_chunk, framed):
+        Frame.allocations = Frame.allocated_bytes = 0
+        source = Source(args.queue_ms)
+        lost = await run(chunks, source, args)
+        jitter = LatencyRecorder(run.__name__, max_samples=len(source.sends))
+        for (previous, duration), (sent, _) in zip(source.sends, source.sends[1:]):
+            jitter.record(abs(sent - previous - duration))
+        durations = [duration * 1000 for _, duration in source.sends]
+        print(
+            f"{run.__name__:<10}{f'{min(durations):.1f}-{max(durations):.1f}':>14}"
+            f"{jitter.percentile(50) * 1000:>10.1f}ms{jitter.percentile(99) * 1000:>10.1f}ms"
+            f"{source.max_queued * 1000:>10.0f}ms{Frame.allocations / audio_seconds:>10.1f}"
+            f"{Frame.allocated_bytes / audio_seconds / 1024:>8.1f}{lost:>8}"
+        )
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--frame-ms", type=int, default=20)
+    parser.add_argument("--lead-ms", type=int, default=60)
+    parser.add_argument("--queue-ms", type=int, default=1000)
+    parser.add_argument("--speedup", type=float, default=4.0)
+    parser.add_argument("--min-chunk", type=int, default=241)
+    parser.add_argument("--max-chunk", type=int, default=4801)
+    parser.add_argument("--seed", type=int, default=1)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,78 @@
+"""
+Encode/decode time and payload size of topic graph codecs.
+
+"json" is the original path (model_dump_json / model_validate_json). The
+"unvalidated" row decodes JSON with json.loads + model_construct, the usual way
+to skip validation; it shows why the codecs keep validating in pydantic-core.
+
+    python -m benchmarks.bench_codec --nodes 100 --content-bytes 4000
+"""
+import json
+import time
+import argparse
+
+from src.core.domain import TopicNode, TopicEdge
+from src.infrastructure.codec import JsonCodec, BinaryCodec, decode_node, decode_edges
+
+def make_nodes(count: int, content_bytes: int) -> list:
+    sentence = "The guest argued that open models narrow the gap within a year. "
+    content = (sentence * (content_bytes // len(sentence) + 1))[:content_bytes]
+    return [
+        TopicNode(id=f"n{i}", label=f"Topic {i}", content=content, metadata={"order": i, "sources": ["a", "b"]})
+        for i in range(count)
+    ]
+
+def best_of(repeats: int, fn) -> float:
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+def main(args):
+    nodes = make_nodes(args.nodes, args.content_bytes)
+    edges = [TopicEdge(source_id=f"n{i}", target_id=f"n{i + 1}", condition="time > 60") for i in range(args.nodes - 1)]
+
+    def unvalidated_node(payload):
+        return TopicNode.model_construct(**json.loads(payload))
+
+    def unvalidated_edges(payload):
+        return [TopicEdge.model_construct(**edge) for edge in json.loads(payload)]
+
+    variants = [
+        ("json", JsonCodec(), decode_node, decode_edges),
+        ("json unvalidated", JsonCodec(), unvalidated_node, unvalidated_edges),
+        ("binary", BinaryCodec(), decode_node, decode_edges),
+        ("binary raw", BinaryCodec(compress_threshold=1 << 30), decode_node, decode_edges),
+    ]
+
+    print(f"{args.nodes} nodes, {args.content_bytes} bytes of content each, best of {args.repeats}")
+    print(f"{'codec':<16}{'encode (ms)':>13}{'decode (ms)':>13}{'bytes':>11}{'size':>8}")
+    baseline = None
+    for name, codec, read_node, read_edges in variants:
+        node_payloads = [codec.encode_node(n) for n in nodes]
+        edge_payload = codec.encode_edges(edges)
+        size = sum(len(p) for p in node_payloads) + len(edge_payload)
+        baseline = baseline or size
+
+        def encode():
+            for node in nodes:
+                codec.encode_node(node)
+            codec.encode_edges(edges)
+
+        def decode():
+            for payload in node_payloads:
+                read_node(payload)
+            read_edges(edge_payload)
+
+        encode_ms = best_of(args.repeats, encode) * 1000
+        decode_ms = best_of(args.repeats, decode) * 1000
+        print(f"{name:<16}{encode_ms:>13.3f}{decode_ms:>13.3f}{size:>11}{size / baseline:>7.0%}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--nodes", type=int, default=100)
+    parser.add_argument("--content-bytes", type=int, default=4000)
+    parser.add_argument("--repeats", type=int, default=20)
+    main(parser.parse_args())
@@ -0,0 +1,107 @@
+"""
+Redis round-trips for topic graph reads with and without CachedStateStore.
+
+50 hosts share one episode and each looks up the current node once per turn
+while the producer moves the topic every few turns.
+
+    python -m benchmarks.bench_graph_cache --redis-url redis://localhost:6379
+"""
+import time
+import asyncio
+import argparse
+
+from src.core.domain import TopicGraph, TopicNode, TopicEdge
+from src.infrastructure.redis_store import RedisStateStore
+from src.infrastructure.graph_cache import CachedStateStore
+
+def count_round_trips(store: RedisStateStore) -> dict:
+    """Counts commands and pipelines sent by the store's client."""
+    counter = {"calls": 0}
+    client = store.client
+    execute_command = client.execute_command
+    make_pipeline = client.pipeline
+
+    async def counted_execute_command(*args, **kwargs):
+        counter["calls"] += 1
+        return await execute_command(*args, **kwargs)
+
+    def counted_pipeline(*args, **kwargs):
+        pipe = make_pipeline(*args, **kwargs)
+        execute = pipe.execute
+
+        async def counted_execute(*a, **kw):
+            counter["calls"] += 1
+            return await execute(*a, **kw)
+
+        pipe.execute = counted_execute
+        return pipe
+
+    client.execute_command = counted_execute_command
+    client.pipeline = counted_pipeline
+    return counter
+
+def make_graph(size: int) -> TopicGraph:
+    nodes = [TopicNode(id=f"n{i}", label=f"Topic {i}", content="Key facts. " * 50) for i in range(size)]
+    edges = [TopicEdge(source_id=f"n{i}", target_id=f"n{i + 1}") for i in range(size - 1)]
+    return TopicGraph(nodes=nodes, edges=edges, current_node_id="n0")
+
+async def run_scenario(readers, writer, hosts: int, turns: int, move_every: int, nodes: int) -> float:
+    async def host(reader):
+        for _ in range(turns):
+            await reader.get_current_node()
+            await asyncio.sleep(0)
+
+    async def producer():
+        for i in range(1, turns // move_every + 1):
+            await asyncio.sleep(0.001 * move_every)
+            await writer.update_current_node(f"n{i % nodes}")
+
+    started = time.perf_counter()
+    await asyncio.gather(producer(), *(host(readers[i % len(readers)]) for i in range(hosts)))
+    return time.perf_counter() - started
+
+async def main(args):
+    writer = RedisStateStore(args.redis_url)
+    await writer.set_topic_graph(make_graph(args.nodes))
+
+    results = []
+
+    store = RedisStateStore(args.redis_url)
+    counter = count_round_trips(store)
+    elapsed = await run_scenario([store], writer, args.hosts, args.turns, args.move_every, args.nodes)
+    results.append(("uncached", counter["calls"], elapsed, None))
+
+    store = RedisStateStore(args.redis_url)
+    counter = count_round_trips(store)
+    shared = CachedStateStore(store)
+    elapsed = await run_scenario([shared], writer, args.hosts, args.turns, args.move_every, args.nodes)
+    results.append(("shared cache", counter["calls"], elapsed, [shared]))
+    await shared.stop()
+
+    store = RedisStateStore(args.redis_url)
+    counter = count_round_trips(store)
+    per_host = [CachedStateStore(store) for _ in range(args.hosts)]
+    elapsed = await run_scenario(per_host, writer, args.hosts, args.turns, args.move_every, args.nodes)
+    results.append(("cache per host", counter["calls"], elapsed, per_host))
+    for cache in per_host:
+        await cache.stop()
+
+    baseline = results[0][1]
+    print(f"{args.hosts} hosts x {args.turns} turns, {args.nodes} nodes, move every {args.move_every} turns")
+    print(f"{'mode':<16}{'redis calls':>12}{'reduction':>11}{'hit ratio':>11}{'wall (s)':>10}")
+    for name, calls, elapsed, caches in results:
+        ratio = "-"
+        if caches:
+            hits = sum(c.hits for c in caches)
+            misses = sum(c.misses for c in caches)
+            ratio = f"{hits / max(1, hits + misses):.3f}"
+        print(f"{name:<16}{calls:>12}{baseline / max(1, calls):>10.1f}x{ratio:>11}{elapsed:>10.2f}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--redis-url", default="redis://localhost:6379")
+    parser.add_argument("--hosts", type=int, default=50)
+    parser.add_argument("--turns", type=int, default=200)
+    parser.add_argument("--move-every", type=int, default=20)
+    parser.add_argument("--nodes", type=int, default=100)
+    asyncio.run(main(parser.parse_args()))
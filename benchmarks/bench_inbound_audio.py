@@ -0,0 +1,89 @@
+"""
+Inbound audio to the live model: one types.Blob and send_realtime per 10 ms frame
+vs InboundAudioAggregator chunks.
+
+Feeds --seconds of 24 kHz mono frames per track for --tracks tracks through the
+real google.genai Blob and ADK LiveRequestQueue, and reports messages per second
+of audio, the CPU time spent per second of audio, and the longest the start of
+an utterance would wait in the buffer at a (random) speech onset without the
+adaptive mode, which flushes the partial chunk at onset instead.
+
+    python -m benchmarks.bench_inbound_audio --seconds 60 --tracks 4
+"""
+import time
+import random
+import argparse
+
+from google.genai import types
+from google.adk.agents.live_request_queue import LiveRequestQueue
+
+from src.infrastructure.audio_framer import InboundAudioAggregator
+
+SAMPLE_RATE = 24000
+FRAME_SAMPLES = SAMPLE_RATE // 100
+
+def make_frames(args):
+    rng = random.Random(args.seed)
+    # A few distinct frames are enough; the path under test doesn't look at the samples
+    return [memoryview(bytearray(rng.getrandbits(8) for _ in range(FRAME_SAMPLES * 2))).cast("h") for _ in range(16)]
+
+def drain(queue: LiveRequestQueue) -> None:
+    while not queue._queue.empty():
+        queue._queue.get_nowait()
+
+def per_frame(frames, args):
+    queue = LiveRequestQueue()
+    messages = 0
+    started = time.process_time()
+    for _ in range(args.tracks):
+        for i in range(int(args.seconds * 100)):
+            # The previous _handle_audio_stream
+            queue.send_realtime(types.Blob(mime_type="audio/pcm;rate=24000", data=frames[i % len(frames)].tobytes()))
+            messages += 1
+        drain(queue)
+    return messages, time.process_time() - started, 0.0
+
+def aggregated(chunk_ms):
+    def run(frames, args):
+        queue = LiveRequestQueue()
+        messages = 0
+        onset_wait = 0.0
+        rng = random.Random(args.seed)
+        started = time.process_time()
+        for _ in range(args.tracks):
+            aggregator = InboundAudioAggregator(SAMPLE_RATE, 1, chunk_ms)
+            for i in range(int(args.seconds * 100)):
+                chunk = aggregator.push(frames[i % len(frames)])
+                if chunk is not None:
+                    queue.send_realtime(types.Blob(mime_type="audio/pcm;rate=24000", data=chunk))
+                    messages += 1
+                if rng.random() < 0.01:
+                    # Speech onset: without the adaptive flush the onset waits for the rest of its chunk
+                    onset_wait = max(onset_wait, chunk_ms - aggregator.buffered_ms)
+            drain(queue)
+        return messages, time.process_time() - started, onset_wait
+    run.__name__ = f"chunk_{chunk_ms}ms"
+    return run
+
+def main(args):
+    frames = make_frames(args)
+    audio_seconds = args.seconds * args.tracks
+    print(f"{args.tracks} tracks x {args.seconds:.0f}s of 10 ms frames")
+    print(f"{'variant':<14}{'msgs/s':>10}{'CPU us/s':>10}{'vs frame':>10}{'onset wait':>14}")
+    baseline = None
+    for run in (per_frame, *(aggregated(ms) for ms in args.chunk_ms)):
+        messages, cpu, wait = run(frames, args)
+        cpu_per_second = cpu / audio_seconds * 1e6
+        baseline = baseline or cpu_per_second
+        print(
+            f"{run.__name__:<14}{messages / audio_seconds:>10.0f}{cpu_per_second:>10.0f}"
+            f"{baseline / cpu_per_second:>9.1f}x{wait:>12.0f}ms"
+        )
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seconds", type=float, default=60.0)
+    parser.add_argument("--tracks", type=int, default=4)
+    parser.add_argument("--chunk-ms", type=int, nargs="+", default=[40, 60, 100])
+    parser.add_argument("--seed", type=int, default=1)
+    main(parser.parse_args())
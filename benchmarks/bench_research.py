@@ -0,0 +1,90 @@
+"""
+Research wall-clock time: sequential searches vs the concurrent sub-query fan-out.
+
+Starts a stub search API on localhost that answers every query after an injected
+latency (uniform between --min-latency and --max-latency, fixed per query so both
+variants see the same delays), then researches --topics topics through
+HttpSearchProvider. "sequential" runs the sub-queries one at a time, "fanout"
+with --concurrency searches in flight. The fan-out should track the slowest
+query of each topic rather than the sum.
+
+    python -m benchmarks.bench_research --queries 6 --max-latency 0.3
+"""
+import json
+import random
+import asyncio
+import argparse
+from urllib.parse import urlsplit, parse_qs
+
+from src.core.metrics import LatencyRecorder
+from src.agents.researcher.fanout import ResearchFanout, plan_sub_queries
+from src.infrastructure.search import HttpSearchProvider
+
+def query_latency(query: str, args) -> float:
+    return random.Random(query).uniform(args.min_latency, args.max_latency)
+
+async def start_stub_server(args):
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                # Skip headers; the stub only serves GETs without a body
+                while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    pass
+                target = request_line.split()[1].decode()
+                query = parse_qs(urlsplit(target).query).get("q", [""])[0]
+                await asyncio.sleep(query_latency(query, args))
+                slug = query.replace(" ", "-")
+                body = json.dumps({"results": [
+                    {"title": f"{query} {rank}", "snippet": f"Finding {rank} on {query}", "url": f"https://stub/{slug}/{rank}"}
+                    for rank in range(5)
+                ]}).encode()
+                writer.write(
+                    b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                    + f"Content-Length: {len(body)}\r\n\r\n".encode()
+                    + body
+                )
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    server = await asyncio.start_server(handle, "127.0.0.1", 0)
+    return server, server.sockets[0].getsockname()[1]
+
+async def run_variant(name: str, concurrency: int, url: str, args) -> None:
+    provider = HttpSearchProvider(url)
+    fanout = ResearchFanout(provider, concurrency=concurrency, query_timeout=args.max_latency * 4)
+    recorder = LatencyRecorder(name)
+    try:
+        for i in range(args.topics):
+            with recorder.time():
+                await fanout.research(f"topic {i}", args.queries)
+    finally:
+        await provider.close()
+    summary = recorder.summary()
+    print(f"{name:<12}{summary['mean_ms']:>12.0f}{summary['p50_ms']:>12.0f}{summary['max_ms']:>12.0f}")
+
+async def main(args):
+    server, port = await start_stub_server(args)
+    url = f"http://127.0.0.1:{port}/search"
+    slowest = [max(query_latency(q, args) for _, q in plan_sub_queries(f"topic {i}", args.queries)) for i in range(args.topics)]
+    total = [sum(query_latency(q, args) for _, q in plan_sub_queries(f"topic {i}", args.queries)) for i in range(args.topics)]
+    print(f"{args.topics} topics x {args.queries} sub-queries, latency {args.min_latency}-{args.max_latency}s per query")
+    print(f"injected: slowest query {sum(slowest) / len(slowest) * 1000:.0f} ms, sum {sum(total) / len(total) * 1000:.0f} ms (mean per topic)")
+    print(f"{'variant':<12}{'mean (ms)':>12}{'p50 (ms)':>12}{'max (ms)':>12}")
+    async with server:
+        await run_variant("sequential", 1, url, args)
+        await run_variant("fanout", args.concurrency, url, args)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--topics", type=int, default=5)
+    parser.add_argument("--queries", type=int, default=6)
+    parser.add_argument("--concurrency", type=int, default=6)
+    parser.add_argument("--min-latency", type=float, default=0.05)
+    parser.add_argument("--max-latency", type=float, default=0.3)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,180 @@
+"""
+Throughput and latency of every StateStore operation, per backend.
+
+Each operation runs --ops times split across --concurrency tasks; the table
+shows ops/sec over the whole phase and p50/p99 per call.
+
+    python -m benchmarks.bench_state_store --backend memory redis
+    python -m benchmarks.bench_state_store --backend redis --redis-url redis://localhost:6379
+
+Without --redis-url the Redis backend runs against a redis-server spawned on a free port.
+"""
+import time
+import uuid
+import shutil
+import socket
+import asyncio
+import argparse
+import subprocess
+from contextlib import contextmanager, asynccontextmanager, ExitStack
+from typing import Iterator, AsyncIterator, Optional
+
+from src.core.domain import TopicGraph, TopicNode, TopicEdge
+from src.core.interfaces import StateStore
+from src.core.metrics import LatencyRecorder
+from src.infrastructure.memory_store import InMemoryStateStore
+from src.infrastructure.redis_store import RedisStateStore
+
+@contextmanager
+def spawn_redis_server() -> Iterator[str]:
+    binary = shutil.which("redis-server")
+    if not binary:
+        raise SystemExit("redis-server not found; pass --redis-url")
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    process = subprocess.Popen(
+        [binary, "--port", str(port), "--save", "", "--appendonly", "no"],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        deadline = time.monotonic() + 5
+        while True:
+            try:
+                socket.create_connection(("127.0.0.1", port), timeout=0.1).close()
+                break
+            except OSError:
+                if time.monotonic() > deadline:
+                    raise
+                time.sleep(0.05)
+        yield f"redis://127.0.0.1:{port}/0"
+    finally:
+        process.terminate()
+        process.wait()
+
+def make_graph(size: int) -> TopicGraph:
+    nodes = [TopicNode(id=f"n{i}", label=f"Topic {i}", content="Key facts. " * 50) for i in range(size)]
+    edges = [TopicEdge(source_id=f"n{i}", target_id=f"n{i + 1}") for i in range(size - 1)]
+    return TopicGraph(nodes=nodes, edges=edges, current_node_id="n0")
+
+async def measure(name: str, operation, ops: int, concurrency: int) -> tuple:
+    """Runs operation(i) ops times across concurrency tasks. Returns (name, ops/sec, recorder)."""
+    recorder = LatencyRecorder(name, max_samples=ops)
+    counter = iter(range(ops))
+
+    async def worker(worker_id: int):
+        for i in counter:
+            started = time.perf_counter()
+            await operation(worker_id, i)
+            recorder.record(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(w) for w in range(concurrency)))
+    return name, ops / (time.perf_counter() - started), recorder
+
+async def run_backend(store, args) -> list:
+    graph = make_graph(args.nodes)
+    await store.set_topic_graph(graph)
+    results = []
+
+    async def set_graph(w, i):
+        await store.set_topic_graph(graph)
+
+    async def get_graph(w, i):
+        await store.get_topic_graph()
+
+    async def get_subset(w, i):
+        await store.get_topic_graph(node_ids=[f"n{i % args.nodes}", f"n{(i + 1) % args.nodes}"])
+
+    async def current_node(w, i):
+        await store.get_current_node()
+
+    async def move(w, i):
+        await store.update_current_node(f"n{i % args.nodes}")
+
+    async def stick(w, i):
+        agent_id = f"host-{w}"
+        if await store.acquire_talking_stick(agent_id, timeout=5):
+            await store.release_talking_stick(agent_id)
+
+    async def stick_queue(w, i):
+        # Every worker queues for the stick, so with concurrency > 1 this measures handoffs
+        agent_id = f"host-{w}"
+        await store.wait_for_talking_stick(agent_id, ttl=5, timeout=10)
+        await store.handoff_talking_stick(agent_id)
+
+    async def publish(w, i):
+        await store.publish_event("BENCH", {"turn": i})
+
+    async def add_entry(w, i):
+        await store.add_to_stream("bench_stream", {"type": "text", "turn": i})
+
+    async def queue_entry(w, i):
+        await store.queue_stream_entry("bench_queued", {"type": "text", "turn": i})
+
+    phases = [
+        (f"set_topic_graph ({args.nodes} nodes)", set_graph, max(1, args.ops // 10)),
+        ("get_topic_graph", get_graph, max(1, args.ops // 10)),
+        ("get_topic_graph (2 nodes)", get_subset, args.ops),
+        ("get_current_node", current_node, args.ops),
+        ("update_current_node", move, args.ops),
+        ("acquire/release stick", stick, args.ops),
+        ("wait_for/handoff stick", stick_queue, args.ops),
+        ("publish_event", publish, args.ops),
+        ("add_to_stream", add_entry, args.ops),
+        ("queue_stream_entry", queue_entry, args.ops),
+    ]
+    for name, operation, ops in phases:
+        results.append(await measure(name, operation, ops, args.concurrency))
+
+    # One consumer draining a backlog through its group; the first read creates
+    # the group at the stream tail, so it has to be in flight before the writes
+    reader = store.read_stream("bench_group", "bench", "consumer", claim_idle_ms=None)
+    first = asyncio.ensure_future(reader.__anext__())
+    await asyncio.sleep(0.1)
+    for i in range(args.ops):
+        await store.queue_stream_entry("bench_group", {"type": "text", "turn": i})
+
+    async def read_ack(w, i):
+        entry = await (first if i == 0 else reader.__anext__())
+        await reader.ack(entry.id)
+
+    results.append(await measure("read_stream + ack", read_ack, args.ops, 1))
+    await reader.close()
+    return results
+
+@asynccontextmanager
+async def open_store(backend: str, redis_url: Optional[str]) -> AsyncIterator[StateStore]:
+    episode_id = f"bench-{uuid.uuid4().hex[:8]}"
+    if backend == "memory":
+        store = InMemoryStateStore(episode_id=episode_id)
+        yield store
+        await store.close()
+        return
+    with ExitStack() as stack:
+        url = redis_url or stack.enter_context(spawn_redis_server())
+        store = RedisStateStore(url, episode_id=episode_id)
+        await store.connect()
+        try:
+            yield store
+        finally:
+            await store.close()
+
+async def main(args):
+    for backend in args.backend:
+        async with open_store(backend, args.redis_url) as store:
+            results = await run_backend(store, args)
+
+        print(f"\n{backend}: {args.ops} ops, concurrency {args.concurrency}")
+        print(f"{'operation':<32}{'ops/sec':>12}{'p50 (ms)':>11}{'p99 (ms)':>11}")
+        for name, rate, recorder in results:
+            print(f"{name:<32}{rate:>12.0f}{recorder.percentile(50) * 1000:>11.3f}{recorder.percentile(99) * 1000:>11.3f}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backend", nargs="+", choices=["memory", "redis"], default=["memory", "redis"])
+    parser.add_argument("--redis-url", default=None)
+    parser.add_argument("--ops", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--nodes", type=int, default=100)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,93 @@
+"""
+Cost of picking the next topic after an utterance.
+
+Builds a graph with --nodes nodes and --fanout conditional edges per node
+(thousands of edges in total), then times TraversalEngine.choose_next on random
+conversation states. "scan" is the approach without an index: filter every
+edge of the graph by source and compile its condition on the spot.
+
+    python -m benchmarks.bench_traversal --nodes 1000 --fanout 8
+"""
+import time
+import random
+import argparse
+
+from src.core.domain import TopicGraph, TopicNode, TopicEdge
+from src.core.graph_index import TopicGraphIndex
+from src.core.metrics import LatencyRecorder
+from src.core.conditions import compile_condition
+from src.core.traversal import TraversalEngine
+
+CONDITIONS = [
+    "sentiment == skeptical",
+    "sentiment == curious and turns_on_topic >= {n}",
+    "time_on_topic > {n}0 or guest.agrees == false",
+    "'{n}' in tags",
+    "not (sentiment in [happy, neutral]) and turns > {n}",
+    "elapsed >= {n}00",
+    "",
+]
+
+def make_graph(nodes: int, fanout: int, rng: random.Random) -> TopicGraph:
+    ids = [f"n{i}" for i in range(nodes)]
+    edges = []
+    for i, source_id in enumerate(ids):
+        for j in range(fanout):
+            condition = rng.choice(CONDITIONS).format(n=rng.randint(1, 9))
+            edges.append(TopicEdge(source_id=source_id, target_id=ids[(i + j + 1) % nodes], condition=condition or None))
+    return TopicGraph(nodes=[TopicNode(id=i, label=i, content="") for i in ids], edges=edges, current_node_id=ids[0])
+
+def make_states(count: int, rng: random.Random) -> list:
+    return [
+        {
+            "sentiment": rng.choice(["skeptical", "curious", "happy", "neutral"]),
+            "turns": rng.randint(0, 40),
+            "turns_on_topic": rng.randint(0, 8),
+            "time_on_topic": rng.uniform(0, 120),
+            "elapsed": rng.uniform(0, 1200),
+            "guest": {"agrees": rng.random() < 0.5},
+            "tags": [str(rng.randint(1, 9))],
+        }
+        for _ in range(count)
+    ]
+
+def scan_choose_next(graph: TopicGraph, current_node_id: str, state: dict):
+    compile_condition.cache_clear()
+    for edge in graph.edges:
+        if edge.source_id == current_node_id and compile_condition(edge.condition or "")(state):
+            return edge.target_id
+    return None
+
+def main(args):
+    rng = random.Random(7)
+    graph = make_graph(args.nodes, args.fanout, rng)
+    states = make_states(args.turns, rng)
+    node_ids = [rng.choice(graph.nodes).id for _ in range(args.turns)]
+    print(f"{args.nodes} nodes, {len(graph.edges)} edges, {args.turns} decisions")
+
+    compile_condition.cache_clear()
+    started = time.perf_counter()
+    engine = TraversalEngine(TopicGraphIndex(graph))
+    print(f"index + compile: {(time.perf_counter() - started) * 1000:.1f} ms once per graph")
+
+    variants = [
+        ("engine", lambda node_id, state: engine.choose_next(node_id, state)),
+        ("scan", lambda node_id, state: scan_choose_next(graph, node_id, state)),
+    ]
+    print(f"{'variant':<10}{'p50 (us)':>10}{'p99 (us)':>10}{'max (us)':>10}")
+    for name, choose in variants:
+        turns = args.turns if name == "engine" else min(args.turns, 200)
+        recorder = LatencyRecorder(name, max_samples=turns)
+        for node_id, state in zip(node_ids[:turns], states):
+            started = time.perf_counter()
+            choose(node_id, state)
+            recorder.record(time.perf_counter() - started)
+        summary = recorder.summary()
+        print(f"{name:<10}{summary['p50_ms'] * 1000:>10.1f}{summary['p99_ms'] * 1000:>10.1f}{summary['max_ms'] * 1000:>10.1f}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--nodes", type=int, default=1000)
+    parser.add_argument("--fanout", type=int, default=8)
+    parser.add_argument("--turns", type=int, default=10000)
+    main(parser.parse_args())
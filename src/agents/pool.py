@@ -0,0 +1,80 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Callable, Generic, List, TypeVar
+from ..core.metrics import LatencyRecorder
+
+T = TypeVar("T")
+
+class AgentPool(Generic[T]):
+    """
+    Fixed-size pool of reusable, stateless objects (ADK agent definitions, tool
+    clients) for code that would otherwise build one per request.
+
+    Instances are created by `factory` on demand up to `size` (or all at once with
+    warm()) and handed out with `async with pool.acquire() as agent`. When all are
+    in use, callers queue, so the pool also bounds concurrency. Objects must not
+    keep per-request state; ADK keeps conversation state in sessions, not agents.
+    """
+
+    def __init__(self, factory: Callable[[], T], size: int, name: str = "pool"):
+        if size < 1:
+            raise ValueError("Pool size must be at least 1")
+        self.factory = factory
+        self.size = size
+        self.name = name
+        self._idle: List[T] = []
+        self._available = asyncio.Semaphore(size)
+        self.created = 0
+        self.acquisitions = 0
+        self.in_use = 0
+        self.peak_in_use = 0
+        self.waits = 0
+        self.wait = LatencyRecorder(f"{name}.wait")
+        self.factory_time = LatencyRecorder(f"{name}.create")
+
+    @property
+    def utilization(self) -> float:
+        return self.in_use / self.size
+
+    @property
+    def stats(self) -> dict:
+        return {
+            "size": self.size,
+            "created": self.created,
+            "idle": len(self._idle),
+            "in_use": self.in_use,
+            "peak_in_use": self.peak_in_use,
+            "utilization": self.utilization,
+            "acquisitions": self.acquisitions,
+            "waits": self.waits,
+            "wait_p99_ms": self.wait.percentile(99) * 1000,
+        }
+
+    def _create(self) -> T:
+        with self.factory_time.time():
+            instance = self.factory()
+        self.created += 1
+        return instance
+
+    def warm(self) -> None:
+        """Builds every instance up front so no request pays for construction."""
+        while self.created < self.size:
+            self._idle.append(self._create())
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[T]:
+        if self._available.locked():
+            self.waits += 1
+        started = time.perf_counter()
+        async with self._available:
+            self.wait.record(time.perf_counter() - started)
+            instance = self._idle.pop() if self._idle else self._create()
+            self.acquisitions += 1
+            self.in_use += 1
+            self.peak_in_use = max(self.peak_in_use, self.in_use)
+            try:
+                yield instance
+            finally:
+                self.in_use -= 1
+                self._idle.append(instance)
@@ -1,16 +1,89 @@
 from ..base import BaseAgent
 from ..researcher.agent import ResearchAgent
+from ..pool import AgentPool
 from ...core.domain import TopicGraph
-import json
+from ...core.graph_index import TopicGraphIndex
+from ..researcher.fanout import ResearchFanout
+from ..researcher.tools import MockSearchProvider
+from .publisher import StreamingEpisodePublisher
+from ...core.interfaces import SearchProvider
+from ...infrastructure.search_cache import CachedSearchProvider
 import asyncio
-from typing import Dict, Any
+import weakref
+from functools import lru_cache
+from typing import Dict, Any, List, Optional
+
+@lru_cache(maxsize=None)
+def default_search_provider() -> SearchProvider:
+    """Process-wide cached search, so producers planning concurrently share results."""
+    return CachedSearchProvider(MockSearchProvider())
+
+# A pool's semaphore belongs to the event loop it is first used on, so pools are kept per loop
+_research_pools: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[int, AgentPool]]" = weakref.WeakKeyDictionary()
+
+def default_research_pool(size: int) -> AgentPool:
+    """Warm ResearchAgents shared by producers with the same concurrency on the running loop."""
+    pools = _research_pools.setdefault(asyncio.get_running_loop(), {})
+    if size not in pools:
+        pools[size] = AgentPool(ResearchAgent, size, name="research_agents")
+    return pools[size]
+
+_SCHEMA = """
+            The TopicGraph schema is:
+            {
+              "nodes": [{"id": "...", "label": "...", "content": "..."}],
+              "edges": [{"source_id": "...", "target_id": "...", "condition": "..."}],
+              "current_node_id": "..."
+            }
+"""
+
+_PLAN_RULES = """
+            3.  **Synthesize Plan**: Create a 'TopicGraph' JSON structure.
+                - It must have at least 5 nodes.
+                - Use 'TopicEdge' to connect them.
+                - Include Conditional Edges (e.g., condition="sentiment == skeptical") to allow for non-linear flow.
+                - The 'content' of each node should be detailed script guidance for the hosts."""
+
+_PUBLISH_WHOLE = """
+            4.  **Publish**: Call the 'finalize_episode' tool with the complete JSON.
+"""
+
+# Hosts go live on the first node, so the plan is published while it is written
+_PUBLISH_STREAMING = """
+            4.  **Publish as you go**: Do not wait for the complete plan. Call 'publish_topic_node'
+                once per node, in show order, starting with the opening topic, passing the node and
+                its outgoing edges. Edges may point to nodes you have not published yet.
+            5.  **Complete**: Call 'complete_episode' after the last node and fix any reported errors.
+"""
 
 class ProducerAgent(BaseAgent):
     """
     The Executive Director agent.
     Orchestrates research and planning.
     """
-    def __init__(self, state_store, model: str = "gemini-3.0-pro", **kwargs):
+    # Seconds before a research call or a store write is abandoned with TimeoutError
+    research_timeout: float = 30.0
+    publish_timeout: float = 10.0
+    # Research fan-out: sub-queries per topic, searches in flight, seconds per search
+    search_provider: Optional[SearchProvider] = None
+    research_queries: int = 6
+    research_concurrency: int = 4
+    query_timeout: float = 5.0
+    # Warm ResearchAgents; defaults to a process-wide pool of research_concurrency agents
+    research_pool: Optional[AgentPool] = None
+    _fanout: Optional[ResearchFanout] = None
+    # Plan of the episode currently being streamed (streaming mode)
+    _publisher: Optional[StreamingEpisodePublisher] = None
+
+    def __init__(self, state_store, model: str = "gemini-3.0-pro", streaming: bool = True, **kwargs):
+        """
+        streaming: publish the plan node by node (hosts start on the first node)
+        instead of once the whole TopicGraph has been generated.
+        """
+        if streaming:
+            publish, tools = _PUBLISH_STREAMING, [self.perform_research, self.publish_topic_node, self.complete_episode]
+        else:
+            publish, tools = _PUBLISH_WHOLE, [self.perform_research, self.finalize_episode]
         super().__init__(
             name="producer",
             state_store=state_store,
@@ -21,82 +94,99 @@ class ProducerAgent(BaseAgent):
 
             WORKFLOW:
             1.  **Analyze the Request**: Understand the user's topic.
-            2.  **Conduct Research**: Call the 'perform_research' tool to get a summary of key facts and controversies.
-            3.  **Synthesize Plan**: Create a 'TopicGraph' JSON structure.
-                - It must have at least 5 nodes.
-                - Use 'TopicEdge' to connect them.
-                - Include Conditional Edges (e.g., condition="sentiment == skeptical") to allow for non-linear flow.
-                - The 'content' of each node should be detailed script guidance for the hosts.
-            4.  **Publish**: Call the 'finalize_episode' tool with the complete JSON.
-
-            The TopicGraph schema is:
-            {
-              "nodes": [{"id": "...", "label": "...", "content": "..."}],
-              "edges": [{"source_id": "...", "target_id": "...", "condition": "..."}],
-              "current_node_id": "..."
-            }
-            """,
-            tools=[self.perform_research, self.finalize_episode],
+            2.  **Conduct Research**: Call the 'perform_research' tool to get a summary of key facts and controversies.""" + _PLAN_RULES + publish + _SCHEMA,
+            tools=tools,
             **kwargs
         )
 
-    def perform_research(self, topic: str) -> str:
+    async def perform_research(self, topic: str) -> str:
         """
         Conducts research on a topic using the Research Agent.
         Returns a summary string.
         """
-        # In a real async environment, we'd await this.
-        # But if this tool is called synchronously by the runner, we might need a workaround.
-        # For now, let's assume we can run the researcher synchronously or the runner handles coroutines.
-        # We'll try to run the researcher in a new loop if needed, or just call its logic.
-
         print(f"[Producer] Delegating research for: {topic}")
-        researcher = ResearchAgent()
-
-        # Mocking the interaction for now since we don't have the full async runner context setup
-        # In production, this would be: summary = await researcher.run(topic)
-        # Here we manually invoke the tool and format the result to simulate the agent's work.
-        from ..researcher.tools import google_search
-        results = google_search(topic)
-
-        # Simple synthesis (mocking the Researcher's LLM step to avoid nesting complexity in this phase)
-        summary = {
-            "key_facts": [r['snippet'] for r in results],
-            "conflicting_views": ["Some sources disagree on the timeline."],
-            "primary_sources": [r['url'] for r in results]
-        }
-        return json.dumps(summary)
-
-    def finalize_episode(self, graph_json: Dict[str, Any]) -> str:
+        pool = self.research_pool or default_research_pool(self.research_concurrency)
+        async with pool.acquire() as researcher:
+            summary = await asyncio.wait_for(
+                researcher.research(topic, self._research_fanout(), self.research_queries), self.research_timeout
+            )
+        return summary.model_dump_json()
+
+    def _research_fanout(self) -> ResearchFanout:
+        if self._fanout is None:
+            provider = self.search_provider or default_search_provider()
+            self._fanout = ResearchFanout(
+                provider, concurrency=self.research_concurrency, query_timeout=self.query_timeout
+            )
+        return self._fanout
+
+    async def finalize_episode(self, graph_json: Dict[str, Any]) -> str:
         """
         Validates the TopicGraph and publishes the episode.
         Args:
             graph_json: The dictionary representing the TopicGraph.
         """
         print(f"[Producer] Finalizing episode...")
+        # Validation problems go back to the model so it can fix the plan
         try:
-            # Validate
             graph = TopicGraph.model_validate(graph_json)
+        except ValueError as e:
+            return f"Error validating graph: {str(e)}"
+        index = TopicGraphIndex(graph)
+        report = index.check()
+        if not report.ok:
+            return f"Error validating graph: {'; '.join(report.errors)}"
+        start = index.node(index.start_id)
+        if start is None:
+            return "Error validating graph: the graph has no nodes"
 
-            # Save to State Store
-            # We need to run async methods. If this tool is sync, we use a helper.
-            # Assuming we can use asyncio.run or similar if not in a loop, but we likely are.
-            # A safe way in a tool is to return a special signal or try to schedule.
-            # But let's try to use the event loop.
+        # Store failures and timeouts propagate: the episode was not published
+        await asyncio.wait_for(self._save(graph, start.id), self.publish_timeout)
+        print(f"[Producer] Episode published: {start.label}")
 
-            async def _save():
-                await self.state_store.set_topic_graph(graph)
-                await self.state_store.publish_event("EPISODE_READY", {"initial_node": graph.nodes[0].id})
-                print(f"[Producer] Episode published: {graph.nodes[0].label}")
+        if report.warnings:
+            # Not fatal, but worth telling the model in case it wants to fix the plan
+            return f"Episode successfully planned and published. Warnings: {'; '.join(report.warnings)}"
+        return "Episode successfully planned and published."
 
-            # If there's a running loop, create a task.
-            try:
-                loop = asyncio.get_running_loop()
-                loop.create_task(_save())
-            except RuntimeError:
-                asyncio.run(_save())
+    async def _save(self, graph: TopicGraph, initial_node: str) -> None:
+        await self.state_store.set_topic_graph(graph)
+        await self.state_store.publish_event("EPISODE_READY", {"initial_node": initial_node})
 
-            return "Episode successfully planned and published."
+    async def publish_topic_node(self, node: Dict[str, Any], edges: Optional[List[Dict[str, Any]]] = None) -> str:
+        """
+        Validates one topic and publishes it right away. The first topic opens the
+        episode: hosts start as soon as it is stored.
+        Args:
+            node: The TopicNode dictionary ({"id", "label", "content"}).
+            edges: The node's outgoing TopicEdge dictionaries.
+        """
+        if self._publisher is None:
+            self._publisher = StreamingEpisodePublisher(self.state_store)
+        was_ready = self._publisher.ready
+        try:
+            node, edges = self._publisher.validate(node, edges)
+        except ValueError as e:
+            return f"Error validating node: {str(e)}"
+        # Store failures and timeouts propagate
+        published = await asyncio.wait_for(self._publisher.add(node, edges), self.publish_timeout)
+        if not was_ready:
+            print(f"[Producer] Episode live after {self._publisher.ready_after:.2f}s: {published.label}")
+            return f"Published '{published.label}' as the opening topic. The episode is live, keep publishing."
+        return f"Published '{published.label}'."
 
-        except Exception as e:
-            return f"Error validating graph: {str(e)}"
+    async def complete_episode(self) -> str:
+        """
+        Checks the plan published with publish_topic_node once every node is out.
+        """
+        publisher, self._publisher = self._publisher, None
+        report = await asyncio.wait_for(publisher.finish(), self.publish_timeout) if publisher else None
+        if report is None:
+            return "Error validating graph: no topics were published"
+        if not report.ok:
+            # Keep the plan open so the model can publish the missing pieces
+            self._publisher = publisher
+            return f"Error validating graph: {'; '.join(report.errors)}"
+        if report.warnings:
+            return f"Episode complete with {len(publisher.node_ids)} topics. Warnings: {'; '.join(report.warnings)}"
+        return f"Episode complete with {len(publisher.node_ids)} topics."
@@ -0,0 +1,35 @@
+import logging
+from google.adk.runners import InMemoryRunner
+from google.genai import types
+from ...core.domain import PlanningJob
+from ...core.interfaces import StateStore
+from ...infrastructure.job_queue import ProgressReporter
+from .agent import ProducerAgent
+
+logger = logging.getLogger(__name__)
+
+APP_NAME = "podcaster_producer"
+
+async def run_producer_job(job: PlanningJob, store: StateStore, report: ProgressReporter) -> None:
+    """
+    PlanningWorkerPool handler: runs a ProducerAgent on the job's topic against
+    the job's episode store. Progress follows the topics the producer publishes.
+    """
+    producer = ProducerAgent(store)
+    runner = InMemoryRunner(agent=producer, app_name=APP_NAME)
+    session = await runner.session_service.create_session(app_name=APP_NAME, user_id=job.id)
+    message = types.Content(role="user", parts=[types.Part(text=f"Plan a podcast episode about: {job.topic}")])
+    await report(0.05, "researching")
+
+    published = 0
+    async for event in runner.run_async(user_id=job.id, session_id=session.id, new_message=message):
+        for call in event.get_function_calls() if hasattr(event, "get_function_calls") else []:
+            if call.name == "publish_topic_node":
+                published += 1
+                # The plan size is unknown until the producer completes it
+                await report(min(0.9, 0.1 + 0.1 * published), f"{published} topics published")
+
+    graph = await store.get_topic_graph()
+    if graph is None or not graph.nodes:
+        raise RuntimeError("Producer finished without publishing a plan")
+    logger.info(f"Planned episode {job.episode_id} with {len(graph.nodes)} topics")
@@ -0,0 +1,79 @@
+import time
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+from ...core.domain import TopicGraph, TopicNode, TopicEdge
+from ...core.graph_index import TopicGraphIndex, GraphIntegrityReport
+from ...core.interfaces import StateStore
+
+logger = logging.getLogger(__name__)
+
+class StreamingEpisodePublisher:
+    """
+    Publishes a plan to the store node by node while the model is still writing it.
+
+    The first node added is the opening topic. EPISODE_READY goes out as soon as it
+    and its outgoing edges are stored, so hosts go live after the first node rather
+    than after the whole plan; later nodes arrive as graph updates while the show
+    runs. Edges may point to nodes that are not published yet, hosts skip them until
+    they exist. The opening node replaces whatever graph the episode had, so a
+    rerun plan never mixes with an earlier attempt. finish() checks the complete
+    plan once the model is done.
+    """
+
+    READY_CHANNEL = "EPISODE_READY"
+
+    def __init__(self, store: StateStore):
+        self.store = store
+        self.opening_id: Optional[str] = None
+        self.node_ids: List[str] = []
+        self.started = time.perf_counter()
+        # Seconds from the start of planning to EPISODE_READY
+        self.ready_after: Optional[float] = None
+
+    @property
+    def ready(self) -> bool:
+        return self.ready_after is not None
+
+    def validate(self, node: Any, edges: Optional[List[Any]] = None) -> Tuple[TopicNode, List[TopicEdge]]:
+        """Raises ValueError (pydantic.ValidationError included) for invalid input."""
+        node = TopicNode.model_validate(node)
+        edges = [TopicEdge.model_validate(edge) for edge in edges or []]
+        for edge in edges:
+            if edge.source_id != node.id and edge.source_id not in self.node_ids:
+                raise ValueError(f"Edge {edge.source_id} -> {edge.target_id} starts at an unpublished node")
+        return node, edges
+
+    async def add(self, node: Any, edges: Optional[List[Any]] = None) -> TopicNode:
+        """Validates and stores one node with its outgoing edges."""
+        node, edges = self.validate(node, edges)
+        opening = self.opening_id is None
+        if opening:
+            await self.store.set_topic_graph(TopicGraph(nodes=[node], edges=edges, current_node_id=node.id))
+        else:
+            await self.store.upsert_topic_nodes([node], edges)
+        if node.id not in self.node_ids:
+            self.node_ids.append(node.id)
+        if opening:
+            self.opening_id = node.id
+            await self._announce_ready(node)
+        return node
+
+    async def _announce_ready(self, node: TopicNode) -> None:
+        self.ready_after = time.perf_counter() - self.started
+        await self.store.publish_event(self.READY_CHANNEL, {"initial_node": node.id, "streaming": True})
+        logger.info(f"Episode ready after {self.ready_after * 1000:.0f} ms, opening with {node.label}")
+
+    async def finish(self) -> Optional[GraphIntegrityReport]:
+        """Integrity report for the published plan, None if nothing was published."""
+        graph = await self.store.get_topic_graph()
+        if graph is None:
+            return None
+        return TopicGraphIndex(graph).check()
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "nodes": len(self.node_ids),
+            "ready_ms": self.ready_after * 1000 if self.ready else None,
+            "elapsed_ms": (time.perf_counter() - self.started) * 1000,
+        }
@@ -0,0 +1,36 @@
+import os
+import sys
+import asyncio
+import logging
+from ...infrastructure.redis_store import RedisStateStore
+from ...infrastructure.job_queue import PlanningJobQueue, PlanningWorkerPool
+from .jobs import run_producer_job
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+async def main(argv):
+    """
+    python -m src.agents.producer.worker                 run PLANNING_WORKERS jobs at a time
+    python -m src.agents.producer.worker submit TOPIC... queue one job per topic
+    """
+    redis_url = os.environ.get("REDIS_URL", "redis://redis:6379")
+    store = RedisStateStore(redis_url, episode_id="jobs", codec=os.environ.get("GRAPH_CODEC", "json"))
+    await store.connect()
+    queue = PlanningJobQueue(store)
+    try:
+        if argv[:1] == ["submit"]:
+            for topic in argv[1:]:
+                job = await queue.submit(topic)
+                print(f"{job.id}\t{job.status}\t{topic}")
+            return
+        workers = int(os.environ.get("PLANNING_WORKERS", "4"))
+        pool = PlanningWorkerPool(queue, run_producer_job, workers=workers)
+        logger.info(f"Planning worker {pool.consumer} running {workers} jobs at a time")
+        await pool.run()
+    finally:
+        await store.close()
+
+if __name__ == "__main__":
+    asyncio.run(main(sys.argv[1:]))
@@ -1,8 +1,7 @@
 from ..base import BaseAgent
 from ...core.domain import ResearchSummary
+from .fanout import ResearchFanout
 from .tools import google_search
-from typing import Optional, Dict, Any
-import json
 
 class ResearchAgent(BaseAgent):
     """
@@ -34,5 +33,12 @@ class ResearchAgent(BaseAgent):
             **kwargs
         )
 
-    # We might need a method to specifically return the Pydantic object
-    # But for now, we rely on the agent loop returning the final text/json.
+    async def research(self, topic: str, fanout: ResearchFanout, sub_queries: int = 6) -> ResearchSummary:
+        """
+        Researches a topic and returns the structured summary.
+
+        Mocking the LLM step for now: the topic is split into sub-queries (facts,
+        counter-arguments, news) that `fanout` searches concurrently and merges.
+        In production this would run the agent loop on the topic instead.
+        """
+        return await fanout.research(topic, sub_queries)
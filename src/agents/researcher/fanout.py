@@ -0,0 +1,98 @@
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+from ...core.domain import ResearchSummary
+from ...core.interfaces import SearchProvider
+from ...core.metrics import LatencyRecorder
+
+logger = logging.getLogger(__name__)
+
+# Angles a topic is researched from, in priority order. Results of "counter"
+# queries become conflicting_views, everything else key_facts.
+SUB_QUERY_TEMPLATES: List[Tuple[str, str]] = [
+    ("facts", "{topic}"),
+    ("counter", "{topic} criticism"),
+    ("news", "{topic} latest news"),
+    ("facts", "{topic} explained"),
+    ("counter", "{topic} controversy debate"),
+    ("facts", "{topic} history"),
+    ("news", "{topic} recent developments"),
+    ("facts", "{topic} future outlook"),
+]
+
+def plan_sub_queries(topic: str, count: int = 6) -> List[Tuple[str, str]]:
+    """Splits a topic into up to `count` (kind, query) pairs."""
+    return [(kind, template.format(topic=topic)) for kind, template in SUB_QUERY_TEMPLATES[:max(1, count)]]
+
+class ResearchFanout:
+    """
+    Researches a topic with several sub-queries at once.
+
+    Queries share one semaphore, so at most `concurrency` searches are in flight
+    across every topic researched through this instance, and each query gets
+    `query_timeout` seconds once it starts. A research run therefore takes about as
+    long as its slowest query. Failed or timed-out queries are skipped; only a run
+    where every query fails raises.
+    """
+
+    def __init__(
+        self,
+        provider: SearchProvider,
+        concurrency: int = 4,
+        query_timeout: float = 5.0,
+        max_items: int = 20,
+    ):
+        self.provider = provider
+        self.concurrency = concurrency
+        self.query_timeout = query_timeout
+        self.max_items = max_items
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self.latency = LatencyRecorder("research.query")
+        self.failures = 0
+
+    async def _search(self, query: str) -> List[Dict[str, Any]]:
+        async with self._semaphore:
+            with self.latency.time():
+                return await asyncio.wait_for(self.provider.search(query), self.query_timeout)
+
+    async def research(self, topic: str, sub_queries: int = 6) -> ResearchSummary:
+        queries = plan_sub_queries(topic, sub_queries)
+        results = await asyncio.gather(*(self._search(query) for _, query in queries), return_exceptions=True)
+
+        succeeded: List[Tuple[str, List[Dict[str, Any]]]] = []
+        first_error: Optional[BaseException] = None
+        for (kind, query), result in zip(queries, results):
+            if isinstance(result, BaseException):
+                self.failures += 1
+                first_error = first_error or result
+                logger.warning(f"Search for {query!r} failed: {result!r}")
+                continue
+            succeeded.append((kind, result))
+        if not succeeded:
+            raise RuntimeError(f"All {len(queries)} searches for {topic!r} failed") from first_error
+        return self._merge(succeeded)
+
+    def _merge(self, results: List[Tuple[str, List[Dict[str, Any]]]]) -> ResearchSummary:
+        """Takes results round-robin by rank so every angle is represented, dropping duplicates."""
+        facts: List[str] = []
+        views: List[str] = []
+        sources: List[str] = []
+        seen = set()
+        depth = max(len(items) for _, items in results)
+        for rank in range(depth):
+            for kind, items in results:
+                if rank >= len(items):
+                    continue
+                item = items[rank]
+                url = item.get("url")
+                snippet = item.get("snippet")
+                key = url or snippet
+                if not snippet or key in seen:
+                    continue
+                seen.add(key)
+                target = views if kind == "counter" else facts
+                if len(target) < self.max_items:
+                    target.append(snippet)
+                if url and len(sources) < self.max_items:
+                    sources.append(url)
+        return ResearchSummary(key_facts=facts, conflicting_views=views, primary_sources=sources)
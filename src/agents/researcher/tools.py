@@ -1,4 +1,5 @@
 from typing import List, Dict, Any
+from ...core.interfaces import SearchProvider
 
 class MockSearchTool:
     """
@@ -53,10 +54,21 @@ class MockSearchTool:
 
         return results
 
+# The tool is stateless, one instance serves every call
+_search_tool = MockSearchTool()
+
 # Function wrapper for ADK
 def google_search(query: str) -> List[Dict[str, Any]]:
     """
     Searches the web for the given query.
     """
-    tool = MockSearchTool()
-    return tool.search(query)
+    return _search_tool.search(query)
+
+class MockSearchProvider(SearchProvider):
+    """MockSearchTool behind the async SearchProvider interface."""
+
+    def __init__(self, tool: MockSearchTool = None):
+        self.tool = tool or _search_tool
+
+    async def search(self, query: str) -> List[Dict[str, Any]]:
+        return self.tool.search(query)
@@ -0,0 +1,116 @@
+import asyncio
+import logging
+from collections import OrderedDict
+from typing import Callable, Optional, Set
+from pydantic import BaseModel, Field
+from ...core.domain import TopicNode
+from ...core.interfaces import StateStore
+
+logger = logging.getLogger(__name__)
+
+class TopicContext(BaseModel):
+    """Everything the host needs to switch the model onto a topic, rendered ahead of time."""
+    node_id: str = Field(..., description="Topic node the context was rendered from")
+    label: str = Field(..., description="Topic label")
+    text: str = Field(..., description="Context block handed to the model")
+
+def render_topic_context(node: TopicNode) -> TopicContext:
+    return TopicContext(
+        node_id=node.id,
+        label=node.label,
+        text=f"Current Topic: {node.label}\nKey Facts: {node.content}",
+    )
+
+class ContextPrefetcher:
+    """
+    Renders the context of the topics the conversation can move to next while the
+    current one is still running, so a transition is a dictionary lookup.
+
+    prefetch_from() reads the node's outgoing edges and then its successors (two
+    subset reads, never the whole graph) in a background task. Prepared contexts
+    are kept in a small LRU; clear() drops them when the graph is rewritten.
+    """
+
+    def __init__(
+        self,
+        store: StateStore,
+        render: Callable[[TopicNode], TopicContext] = render_topic_context,
+        max_ahead: int = 4,
+        max_entries: int = 64,
+    ):
+        self.store = store
+        self.render = render
+        self.max_ahead = max_ahead
+        self.max_entries = max_entries
+        self._prepared: "OrderedDict[str, TopicContext]" = OrderedDict()
+        self._tasks: Set[asyncio.Task] = set()
+        # Bumped by clear() so prefetches started against an old graph are discarded
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def stats(self) -> dict:
+        return {"prepared": len(self._prepared), "hits": self.hits, "misses": self.misses}
+
+    def _keep(self, context: TopicContext) -> None:
+        self._prepared[context.node_id] = context
+        self._prepared.move_to_end(context.node_id)
+        while len(self._prepared) > self.max_entries:
+            self._prepared.popitem(last=False)
+
+    def prefetch_from(self, node_id: str) -> None:
+        """Start preparing the successors of node_id in the background."""
+        task = asyncio.create_task(self._prefetch_from(node_id, self._generation))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _prefetch_from(self, node_id: str, generation: int) -> None:
+        try:
+            graph = await self.store.get_topic_graph(node_ids=[node_id])
+            if graph is None:
+                return
+            targets = []
+            for edge in graph.edges:
+                target_id = edge.target_id
+                if edge.source_id == node_id and target_id not in self._prepared and target_id not in targets:
+                    targets.append(target_id)
+            if not targets:
+                return
+            successors = await self.store.get_topic_graph(node_ids=targets[:self.max_ahead])
+            if successors and generation == self._generation:
+                for node in successors.nodes:
+                    self._keep(self.render(node))
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            # Prefetching is an optimisation; a failure only costs a miss later
+            logger.warning(f"Context prefetch from {node_id} failed: {e}")
+
+    async def get(self, node_id: str) -> Optional[TopicContext]:
+        """The prepared context for node_id, waiting for an in-flight prefetch or rendering it now."""
+        context = self._prepared.get(node_id)
+        if context is None and self._tasks:
+            # A transition right after prefetch_from(): finishing the read beats starting another
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+            context = self._prepared.get(node_id)
+        if context is not None:
+            self.hits += 1
+            self._prepared.move_to_end(node_id)
+            return context
+        self.misses += 1
+        graph = await self.store.get_topic_graph(node_ids=[node_id])
+        if not graph or not graph.nodes:
+            return None
+        context = self.render(graph.nodes[0])
+        self._keep(context)
+        return context
+
+    def clear(self) -> None:
+        self._generation += 1
+        self._prepared.clear()
+
+    async def close(self) -> None:
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
@@ -1,8 +1,9 @@
 import os
 import json
+import time
 import asyncio
 import logging
-from typing import Optional
+from typing import Optional, Set
 from google import genai
 from google.genai import types
 from google.adk import agents, runners, events
@@ -10,8 +11,12 @@ from google.adk.agents.run_config import RunConfig
 
 from ...core.domain import HostPersona, TopicGraph
 from ...core.interfaces import StateStore
+from ...core.traversal import TraversalEngine, TraversalDecision
+from ...core.metrics import LatencyRecorder
 from ...agents.base import BaseAgent
 from ...infrastructure.livekit_adapter import LiveKitAdapter
+from ...personas.registry import PersonaRegistry, default_persona_registry
+from .context import ContextPrefetcher, TopicContext, render_topic_context
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -21,41 +26,224 @@ class UniversalHostAgent(BaseAgent):
     persona_id: str
     model_name: str
     persona: Optional[HostPersona] = None
+    # LiveKit room to join; LIVEKIT_ROOM when unset
+    room_id: Optional[str] = None
+    # Default (unconditional) edges are only taken after this many turns on a topic
+    min_turns_per_topic: int = 3
+    _personas: Optional[PersonaRegistry] = None
     _adapter: Optional[LiveKitAdapter] = None
+    _traversal: Optional[TraversalEngine] = None
+    _conversation_state: Optional[dict] = None
+    _prefetcher: Optional[ContextPrefetcher] = None
+    _active_context: Optional[TopicContext] = None
+    _topic_switch_latency: Optional[LatencyRecorder] = None
+    _topic_listener: Optional[asyncio.Task] = None
+    # Topic evaluation after a turn runs beside the audio loop, one at a time
+    _advance_task: Optional[asyncio.Task] = None
+    _advance_again: bool = False
+    # True while run_live is consuming the request queue; context is injected only then
+    _session_live: bool = False
 
     def __init__(
         self,
         name: str,
         persona_id: str,
         state_store: StateStore,
-        model_name: str = "gemini-3.0-flash-preview"
+        model_name: str = "gemini-3.0-flash-preview",
+        persona_registry: Optional[PersonaRegistry] = None,
+        room_id: Optional[str] = None,
+        peer_identities: Optional[Set[str]] = None,
     ):
         super().__init__(
             name=name,
             state_store=state_store,
             persona_id=persona_id,
             model_name=model_name,
-            persona=None
+            persona=None,
+            room_id=room_id,
         )
+        self._personas = persona_registry or default_persona_registry()
         self._load_persona()
-        self._adapter = LiveKitAdapter()
+        self._adapter = LiveKitAdapter(
+            identity=name,
+            display_name=self.persona.name if self.persona else name,
+            peer_identities=peer_identities,
+        )
+        # Inputs for edge conditions; other components may add keys such as "sentiment"
+        self._conversation_state = {"turns": 0, "turns_on_topic": 0, "time_on_topic": 0.0, "elapsed": 0.0}
+        self._episode_started = 0.0
+        self._topic_started = 0.0
+        # Successor topics are rendered ahead of time so a transition is a lookup
+        self._prefetcher = ContextPrefetcher(state_store)
+        # Time from the topic-change decision to the new context being active
+        self._topic_switch_latency = LatencyRecorder("topic_switch")
 
-    def _load_persona(self):
-        """Loads the persona JSON file."""
-        try:
-            persona_path = f"src/personas/{self.persona_id}.json"
-            if not os.path.exists(persona_path):
-                 logger.error(f"Persona file not found: {persona_path}")
-                 return
+    @property
+    def topic_switch_latency(self) -> LatencyRecorder:
+        return self._topic_switch_latency
 
-            with open(persona_path, "r") as f:
-                data = json.load(f)
-                self.persona = HostPersona(**data)
+    @property
+    def active_context(self) -> Optional[TopicContext]:
+        return self._active_context
 
-            logger.info(f"Loaded persona: {self.persona.name} ({self.persona.id})")
+    def _load_persona(self):
+        """Takes the shared persona from the registry; hosts don't read persona files themselves."""
+        try:
+            persona = self._personas.get(self.persona_id)
         except Exception as e:
             logger.error(f"Failed to load persona {self.persona_id}: {e}")
             raise
+        if persona is None:
+            if self.persona is None:
+                logger.error(f"Persona not found: {self.persona_id} in {self._personas.directory}")
+            return
+        if persona is not self.persona:
+            self.persona = persona
+            logger.info(f"Loaded persona: {self.persona.name} ({self.persona.id})")
+
+    def update_conversation_state(self, **values) -> None:
+        """Sets values that edge conditions can refer to, e.g. sentiment="skeptical"."""
+        self._conversation_state.update(values)
+
+    async def advance_topic(self) -> Optional[TraversalDecision]:
+        """
+        Evaluates the current topic's outgoing edges against the conversation state
+        and moves the episode on when one applies. Called after every completed turn.
+        """
+        index = await self.state_store.get_topic_index()
+        if index is None:
+            return None
+        if self._traversal is None or self._traversal.index is not index:
+            # Conditions are compiled once per graph
+            self._traversal = TraversalEngine(index)
+
+        now = asyncio.get_running_loop().time()
+        state = self._conversation_state
+        state["time_on_topic"] = now - self._topic_started
+        state["elapsed"] = now - self._episode_started
+        current_id = index.graph.current_node_id
+        decision = self._traversal.choose_next(
+            current_id, state, allow_default=state["turns_on_topic"] >= self.min_turns_per_topic
+        )
+        if decision.moved:
+            decided_at = time.perf_counter()
+            # Compare-and-set: if another host already moved the episode, keep its choice
+            if await self.state_store.update_current_node(decision.next_node_id, expected_node_id=current_id):
+                logger.info(f"Topic {current_id} -> {decision.next_node_id}: {decision.reason}")
+                await self._activate_topic(decision.next_node_id, decided_at)
+        return decision
+
+    def _schedule_advance(self) -> None:
+        """
+        Runs advance_topic in the background so the audio loop never waits on its
+        Redis round-trips. A turn completed while an evaluation is running gets
+        one more evaluation afterwards.
+        """
+        if self._advance_task is not None and not self._advance_task.done():
+            self._advance_again = True
+            return
+        self._advance_task = asyncio.create_task(self._advance_in_background())
+
+    async def _advance_in_background(self) -> None:
+        while True:
+            self._advance_again = False
+            try:
+                await self.advance_topic()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Failed to advance topic: {e}")
+            if not self._advance_again:
+                return
+
+    async def _stop_advance(self) -> None:
+        if self._advance_task:
+            self._advance_task.cancel()
+            try:
+                await self._advance_task
+            except asyncio.CancelledError:
+                pass
+            self._advance_task = None
+
+    async def _activate_topic(self, node_id: str, decided_at: float) -> None:
+        """Swap in the (normally prefetched) context of node_id and start preparing its successors."""
+        context = await self._prefetcher.get(node_id)
+        if context is None:
+            logger.warning(f"Topic {node_id} disappeared before it could be activated")
+            return
+        # Our own moves come back through the channel as well; activate once
+        if self._active_context is not None and self._active_context.node_id == node_id:
+            return
+        self._set_context(context)
+        self._topic_switch_latency.record(time.perf_counter() - decided_at)
+        self._prefetcher.prefetch_from(node_id)
+
+    def _set_context(self, context: TopicContext) -> None:
+        if self._active_context is None or self._active_context.node_id != context.node_id:
+            # A new topic, whichever host moved the episode
+            self._conversation_state["turns_on_topic"] = 0
+            self._topic_started = asyncio.get_running_loop().time()
+        self._active_context = context
+        if self._session_live:
+            self._inject_context(context)
+
+    def _inject_context(self, context: TopicContext) -> None:
+        """
+        Pushes the new topic into the running live session as a content turn.
+        The system instruction only holds the opening topic, and restarting
+        run_live would drop the audio session for seconds.
+        """
+        content = types.Content(
+            role="user",
+            parts=[types.Part(text=f"[Producer note, do not read aloud] The show moves on to a new topic.\n{context.text}")],
+        )
+        self._adapter.live_request_queue.send_content(content)
+        logger.info(f"Injected context for topic {context.node_id}")
+
+    async def _on_graph_message(self, message: dict) -> None:
+        """Follows moves and rewrites announced on TOPIC_GRAPH_CHANNEL, including other hosts' moves."""
+        if message.get("kind") == "move":
+            node_id = message.get("current_node_id")
+            if node_id:
+                await self._activate_topic(node_id, time.perf_counter())
+            return
+        # The plan was rewritten: prepared contexts are stale and the current topic may have changed
+        received_at = time.perf_counter()
+        self._prefetcher.clear()
+        node = await self.state_store.get_current_node()
+        if node is None:
+            return
+        context = render_topic_context(node)
+        if self._active_context is None or self._active_context.text != context.text:
+            self._set_context(context)
+            self._topic_switch_latency.record(time.perf_counter() - received_at)
+        self._prefetcher.prefetch_from(node.id)
+
+    async def _listen_for_topic_changes(self, pubsub) -> None:
+        try:
+            async for message in pubsub.listen():
+                if message["type"] != "message":
+                    continue
+                try:
+                    await self._on_graph_message(json.loads(message["data"]))
+                except Exception as e:
+                    # One bad update must not stop the host from following later ones
+                    logger.error(f"Failed to apply topic update: {e}")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Topic change listener failed: {e}")
+        finally:
+            await pubsub.close()
+
+    async def _stop_topic_listener(self) -> None:
+        if self._topic_listener:
+            self._topic_listener.cancel()
+            try:
+                await self._topic_listener
+            except asyncio.CancelledError:
+                pass
+            self._topic_listener = None
 
     async def run_loop(self):
         """
@@ -70,20 +258,29 @@ class UniversalHostAgent(BaseAgent):
             if message["type"] == "message":
                 logger.info("Received EPISODE_READY. Switching to State B: Active.")
                 break
+        # Drop our reference so the shared connection can unsubscribe the channel
+        await pubsub.close()
+
+        self._episode_started = self._topic_started = asyncio.get_running_loop().time()
 
         # 2. Initialize & Connect Adapter
-        room_id = os.getenv("LIVEKIT_ROOM", "daily_room")
+        room_id = self.room_id or os.getenv("LIVEKIT_ROOM", "daily_room")
         logger.info(f"Connecting to LiveKit room: {room_id}")
         await self._adapter.start_session(room_id)
 
         # 3. Setup ADK Agent
-        graph = await self.state_store.get_topic_graph()
+        # Subscribe before reading the opening topic so no move in between is missed
+        topic_updates = await self.state_store.subscribe_to_channel(self.state_store.TOPIC_GRAPH_CHANNEL)
+        # Only the active node is needed here, not the whole plan
+        node = await self.state_store.get_current_node()
         current_node_context = ""
-        if graph and graph.current_node_id:
-            node = next((n for n in graph.nodes if n.id == graph.current_node_id), None)
-            if node:
-                current_node_context = f"Current Topic: {node.label}\nKey Facts: {node.content}"
+        if node:
+            self._active_context = render_topic_context(node)
+            current_node_context = self._active_context.text
+            self._prefetcher.prefetch_from(node.id)
 
+        # Pick up persona edits made since this host started; a live session keeps its instruction
+        self._load_persona()
         system_instruction = f"""
 You are {self.persona.name}, a podcast host.
 Your personality: {self.persona.system_prompt}
@@ -106,6 +303,10 @@ Task: Engage in a natural conversation. You are live on air.
         queue = self._adapter.live_request_queue
         config = RunConfig(response_modalities=["AUDIO"])
 
+        # Topic changes from here on reach the model through the request queue
+        self._session_live = True
+        self._topic_listener = asyncio.create_task(self._listen_for_topic_changes(topic_updates))
+
         logger.info("Starting run_live loop...")
 
         try:
@@ -113,14 +314,21 @@ Task: Engage in a natural conversation. You are live on air.
                 # Handle interruptions
                 if getattr(event, "interrupted", False):
                     logger.info("Interruption detected (Cognitive Rewind).")
-                    await self.state_store.add_to_stream(
+                    # Silence the host first (local VAD usually already has), then
+                    # record how far the interrupted turn actually got
+                    position = self._adapter.interrupt()
+                    # Buffered: the audio loop must not wait on a Redis round-trip
+                    await self.state_store.queue_stream_entry(
                         "conversation_stream",
                         {
                             "type": "SYSTEM_SIGNAL",
                             "event": "INTERRUPTION",
                             "agent_id": self.name,
                             "timestamp": str(asyncio.get_event_loop().time()),
-                            "metadata": { "last_token_index": 0 }
+                            "metadata": {
+                                "last_token_index": position["last_token_index"],
+                                "played_ms": round(position["played_ms"]),
+                            }
                         }
                     )
                     continue
@@ -152,6 +360,18 @@ Task: Engage in a natural conversation. You are live on air.
                     if data:
                         await self._adapter.send_audio_chunk(data)
 
+                # After the event's own parts: audio carried on turn_complete belongs to this turn
+                if getattr(event, "turn_complete", False):
+                    self._adapter.end_of_turn()
+                    self._conversation_state["turns"] += 1
+                    self._conversation_state["turns_on_topic"] += 1
+                    self._schedule_advance()
+
         except Exception as e:
             logger.error(f"Error in run_live loop: {e}")
             raise
+        finally:
+            self._session_live = False
+            await self._stop_advance()
+            await self._stop_topic_listener()
+            await self._prefetcher.close()
@@ -2,7 +2,9 @@ import os
 import asyncio
 import logging
 from .engine import UniversalHostAgent
+from .runtime import HostRuntime
 from ...infrastructure.redis_store import RedisStateStore
+from ...personas.registry import PERSONA_DIR, PersonaRegistry
 from google.adk.a2a.utils.agent_to_a2a import to_a2a
 from a2a.types import AgentCard, AgentSkill, AgentCapabilities
 import uvicorn
@@ -11,36 +13,13 @@ import uvicorn
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-async def main():
-    persona_id = os.environ.get("HOST_PERSONA_ID", "host_sascha")
-    # Agent name convention: host_{persona_id}
-    agent_name = f"host_{persona_id}"
-
-    redis_url = os.environ.get("REDIS_URL", "redis://redis:6379")
-    store = RedisStateStore(redis_url)
-
-    logger.info(f"Initializing Universal Host Agent: {agent_name}")
-    agent = UniversalHostAgent(name=agent_name, persona_id=persona_id, state_store=store)
-
-    # Create Agent Card dynamically from Persona
-    # Assuming persona is loaded by __init__
-    if not agent.persona:
-        logger.error("Persona not loaded. Exiting.")
-        return
-
-    # Use environment variable for the host/port to be correct in Docker network
-    host_env = os.environ.get("HOST", "0.0.0.0")
-    port_env = int(os.environ.get("PORT", "8000"))
-    # The URL reported in the card must be reachable by others (e.g. Producer)
-    # In Docker Compose, service name might be used.
-    # We'll use a placeholder or ENV var for the external URL base.
-    external_url = os.environ.get("A2A_EXTERNAL_URL", f"http://localhost:{port_env}/a2a")
-
-    card = AgentCard(
+def agent_card(agent: UniversalHostAgent, url: str) -> AgentCard:
+    """Agent Card built from the host's persona."""
+    return AgentCard(
         name=agent.persona.name,
         description=agent.persona.system_prompt[:200] + "...",
         version="0.1.0",
-        url=external_url,
+        url=url,
         skills=[
             AgentSkill(
                 id="perform_dialogue",
@@ -54,17 +33,53 @@ async def main():
         defaultOutputModes=["text"]
     )
 
-    logger.info(f"Generated Agent Card for {agent.persona.name}")
+async def main():
+    # Comma-separated personas hosted by this process, each optionally as persona@episode
+    host_specs = os.environ.get("HOST_PERSONA_IDS", os.environ.get("HOST_PERSONA_ID", "host_sascha"))
 
-    # Wrap with A2A
-    app = to_a2a(agent, agent_card=card)
+    redis_url = os.environ.get("REDIS_URL", "redis://redis:6379")
+    # All state is scoped per episode; by default one episode per LiveKit room
+    episode_id = os.environ.get("EPISODE_ID", os.environ.get("LIVEKIT_ROOM", "daily_room"))
+    # "binary" once every agent of the deployment can read it (see infrastructure/codec.py)
+    graph_codec = os.environ.get("GRAPH_CODEC", "json")
+    # One connection pool for every host; topic graph reads are served from a
+    # per-episode cache until a writer bumps the version
+    store = RedisStateStore(redis_url, episode_id=episode_id, codec=graph_codec)
+
+    # Every persona is validated once up front; edits are picked up without a restart
+    personas = PersonaRegistry(os.environ.get("PERSONA_DIR", PERSONA_DIR))
+    personas.load()
+    personas.watch(float(os.environ.get("PERSONA_RELOAD_INTERVAL", "2.0")))
 
-    # Start the agent's main loop in the background
-    # We store the task to prevent garbage collection (though loop is infinite)
-    loop_task = asyncio.create_task(agent.run_loop())
+    runtime = HostRuntime(store, personas, episode_id=episode_id)
+    for spec in filter(None, (s.strip() for s in host_specs.split(","))):
+        persona_id, _, host_episode = spec.partition("@")
+        try:
+            runtime.add_host(persona_id, episode_id=host_episode or None)
+        except ValueError as e:
+            logger.error(f"Skipping host {spec}: {e}")
+    if not runtime.hosts:
+        logger.error("No host could be started. Exiting.")
+        await personas.stop()
+        await store.close()
+        return
+
+    # Use environment variable for the host/port to be correct in Docker network
+    host_env = os.environ.get("HOST", "0.0.0.0")
+    port_env = int(os.environ.get("PORT", "8000"))
+    # The URL reported in the cards must be reachable by others (e.g. Producer);
+    # each host is served under /<persona_id>/ of this base
+    external_url = os.environ.get("A2A_EXTERNAL_URL", f"http://localhost:{port_env}").rstrip("/")
+
+    # One A2A server for every host
+    app = runtime.build_app(lambda agent: to_a2a(agent, agent_card=agent_card(agent, f"{external_url}/{agent.persona_id}/")))
+    for agent in runtime.hosts.values():
+        logger.info(f"Serving {agent.persona.name} at {external_url}/{agent.persona_id}/")
+
+    await runtime.start()
 
     # Run the A2A server
-    logger.info(f"Starting A2A server on {host_env}:{port_env}")
+    logger.info(f"Starting A2A server for {len(runtime.hosts)} hosts on {host_env}:{port_env}")
     config = uvicorn.Config(app, host=host_env, port=port_env, log_level="info")
     server = uvicorn.Server(config)
 
@@ -73,11 +88,8 @@ async def main():
     except asyncio.CancelledError:
         logger.info("Server cancelled")
     finally:
-        loop_task.cancel()
-        try:
-            await loop_task
-        except asyncio.CancelledError:
-            pass
+        await runtime.stop()
+        await personas.stop()
 
 if __name__ == "__main__":
     asyncio.run(main())
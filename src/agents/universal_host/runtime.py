@@ -0,0 +1,239 @@
+import os
+import time
+import asyncio
+import logging
+import resource
+import contextvars
+from contextlib import AsyncExitStack, asynccontextmanager
+from typing import Any, Callable, Coroutine, Dict, Optional, Set
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Mount, Route
+
+from ...core.interfaces import StateStore
+from ...infrastructure.graph_cache import CachedStateStore
+from ...personas.registry import PersonaRegistry, default_persona_registry
+from .engine import UniversalHostAgent
+
+logger = logging.getLogger(__name__)
+
+# Usage of the host a task works for; tasks it creates inherit it through their context
+_current_host: contextvars.ContextVar[Optional["HostUsage"]] = contextvars.ContextVar("current_host", default=None)
+
+def rss_bytes() -> int:
+    """Resident set size of this process (peak RSS where /proc is not available)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+class HostUsage:
+    """CPU time charged to one host's tasks, and the memory the process grew by when it was added."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.cpu_seconds = 0.0
+        self.steps = 0
+        self.tasks = 0
+        self.rss_added = 0
+        self._since = time.monotonic()
+
+    @property
+    def stats(self) -> dict:
+        elapsed = time.monotonic() - self._since
+        return {
+            "cpu_seconds": self.cpu_seconds,
+            "cpu_percent": 100 * self.cpu_seconds / elapsed if elapsed > 0 else 0.0,
+            "steps": self.steps,
+            "tasks": self.tasks,
+            "rss_added_bytes": self.rss_added,
+        }
+
+class _Metered:
+    """Drives a coroutine, charging the event-loop thread's CPU time of each step to `usage`."""
+
+    def __init__(self, coro: Coroutine, usage: HostUsage):
+        self._coro = coro
+        self._usage = usage
+
+    def __await__(self):
+        coro, usage = self._coro, self._usage
+        value, error = None, None
+        while True:
+            started = time.thread_time()
+            try:
+                yielded = coro.send(value) if error is None else coro.throw(error)
+            except StopIteration as done:
+                return done.value
+            finally:
+                usage.cpu_seconds += time.thread_time() - started
+                usage.steps += 1
+            value, error = None, None
+            try:
+                value = yield yielded
+            except GeneratorExit:
+                coro.close()
+                raise
+            except BaseException as e:
+                # Cancellation and errors thrown in by the task go to the wrapped coroutine
+                error = e
+
+async def _run_metered(coro: Coroutine, usage: HostUsage) -> Any:
+    return await _Metered(coro, usage)
+
+def _metering_task_factory(previous: Optional[Callable]) -> Callable:
+    def factory(loop: asyncio.AbstractEventLoop, coro: Coroutine, **kwargs: Any) -> asyncio.Future:
+        context = kwargs.get("context")
+        usage = context.get(_current_host) if context is not None else _current_host.get()
+        if usage is not None:
+            usage.tasks += 1
+            coro = _run_metered(coro, usage)
+        if previous is not None:
+            return previous(loop, coro, **kwargs)
+        return asyncio.Task(coro, loop=loop, **kwargs)
+    return factory
+
+class HostRuntime:
+    """
+    Runs many UniversalHostAgents in one asyncio process.
+
+    Hosts share what a process-per-host deployment duplicates: the Redis connection
+    pool (episode stores are for_episode views of one store, and hosts of the same
+    episode share one graph cache), the Silero VAD model (default_vad) and the
+    persona registry. Hosts know each other's LiveKit identities, so a co-host
+    speaking in the same room doesn't barge in on them. build_app() serves every
+    host from one A2A app, routed by persona id. Each host's run_loop, and every
+    task it starts, is charged its CPU time in `usage`; memory is reported as what
+    each host added to the RSS when it was built, next to the process total.
+    """
+
+    def __init__(self, store: StateStore, personas: Optional[PersonaRegistry] = None, episode_id: Optional[str] = None):
+        self.store = store
+        self.personas = personas or default_persona_registry()
+        self.episode_id = episode_id or getattr(store, "episode_id", "default")
+        self.hosts: Dict[str, UniversalHostAgent] = {}
+        self.usage: Dict[str, HostUsage] = {}
+        # LiveKit identities of every host here, shared with each host's adapter
+        self.identities: Set[str] = set()
+        self._stores: Dict[str, CachedStateStore] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._previous_factory: Optional[Callable] = None
+        self._metering = False
+
+    @property
+    def stats(self) -> dict:
+        rss = rss_bytes()
+        return {
+            "hosts": len(self.hosts),
+            "episodes": len(self._stores),
+            "rss_bytes": rss,
+            "rss_per_host_bytes": rss // len(self.hosts) if self.hosts else 0,
+            "per_host": {
+                persona_id: {**usage.stats, "running": persona_id in self._tasks and not self._tasks[persona_id].done()}
+                for persona_id, usage in self.usage.items()
+            },
+        }
+
+    def episode_store(self, episode_id: str) -> CachedStateStore:
+        """The store shared by every host of `episode_id`."""
+        store = self._stores.get(episode_id)
+        if store is None:
+            store = self._stores[episode_id] = CachedStateStore(self.store.for_episode(episode_id))
+        return store
+
+    def add_host(self, persona_id: str, episode_id: Optional[str] = None, room_id: Optional[str] = None, **kwargs: Any) -> UniversalHostAgent:
+        """
+        Builds the host for `persona_id` in `episode_id` (the runtime's episode by
+        default). Hosts of another episode join the LiveKit room of that name
+        unless `room_id` is given. Hosts added after start() are started with it.
+        """
+        if persona_id in self.hosts:
+            raise ValueError(f"A host for persona {persona_id} is already running")
+        if self.personas.get(persona_id) is None:
+            raise ValueError(f"Unknown persona: {persona_id}")
+        if episode_id is not None and room_id is None:
+            room_id = episode_id
+        usage = HostUsage(persona_id)
+        before = rss_bytes()
+        host = UniversalHostAgent(
+            name=f"host_{persona_id}",
+            persona_id=persona_id,
+            state_store=self.episode_store(episode_id or self.episode_id),
+            persona_registry=self.personas,
+            room_id=room_id,
+            peer_identities=self.identities,
+            **kwargs,
+        )
+        self.identities.add(host.name)
+        usage.rss_added = max(0, rss_bytes() - before)
+        self.hosts[persona_id] = host
+        self.usage[persona_id] = usage
+        if self._metering:
+            self._start_host(persona_id)
+        return host
+
+    def build_app(self, host_app: Callable[[UniversalHostAgent], Any]) -> Starlette:
+        """
+        One ASGI app for every host: `/<persona_id>/` is served by host_app(host)
+        (e.g. to_a2a) and `/hosts` reports usage. Starlette doesn't run the lifespan
+        of mounted apps, and to_a2a registers its routes in its lifespan, so this
+        app's lifespan runs theirs.
+        """
+        apps = {persona_id: host_app(host) for persona_id, host in self.hosts.items()}
+
+        @asynccontextmanager
+        async def lifespan(app: Starlette):
+            async with AsyncExitStack() as stack:
+                for sub_app in apps.values():
+                    router = getattr(sub_app, "router", None)
+                    if router is not None:
+                        await stack.enter_async_context(router.lifespan_context(sub_app))
+                yield
+
+        async def hosts(request: Request) -> JSONResponse:
+            return JSONResponse(self.stats)
+
+        routes = [Route("/hosts", hosts)]
+        routes += [Mount(f"/{persona_id}", app=sub_app) for persona_id, sub_app in apps.items()]
+        return Starlette(routes=routes, lifespan=lifespan)
+
+    async def start(self) -> None:
+        """Connects the shared store and starts every host's run_loop."""
+        await self.store.connect()
+        if not self._metering:
+            loop = asyncio.get_running_loop()
+            self._previous_factory = loop.get_task_factory()
+            loop.set_task_factory(_metering_task_factory(self._previous_factory))
+            self._metering = True
+        for persona_id in self.hosts:
+            if persona_id not in self._tasks:
+                self._start_host(persona_id)
+
+    def _start_host(self, persona_id: str) -> None:
+        host = self.hosts[persona_id]
+        context = contextvars.copy_context()
+        context.run(_current_host.set, self.usage[persona_id])
+        task = asyncio.get_running_loop().create_task(host.run_loop(), name=host.name, context=context)
+        task.add_done_callback(lambda done: self._host_stopped(persona_id, done))
+        self._tasks[persona_id] = task
+
+    def _host_stopped(self, persona_id: str, task: asyncio.Task) -> None:
+        # One host failing must not take the others down
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(f"Host {persona_id} stopped: {task.exception()}")
+
+    async def stop(self) -> None:
+        """Stops every host, then closes the episode stores and the shared store."""
+        for task in self._tasks.values():
+            task.cancel()
+        await asyncio.gather(*self._tasks.values(), return_exceptions=True)
+        self._tasks.clear()
+        if self._metering:
+            asyncio.get_running_loop().set_task_factory(self._previous_factory)
+            self._metering = False
+        for store in self._stores.values():
+            await store.close()
+        # Flush buffered conversation_stream entries before exiting
+        await self.store.close()
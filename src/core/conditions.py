@@ -0,0 +1,212 @@
+import re
+from functools import lru_cache
+from typing import Any, Callable, List, Tuple
+
+# Edge conditions are small boolean expressions over the conversation state:
+#
+#   sentiment == skeptical
+#   turns >= 3 and not guest.agrees
+#   topic in [ai, "open source"] or time > 120
+#
+# Grammar (lowest precedence first):
+#   expr       := and_expr ("or" and_expr)*
+#   and_expr   := not_expr ("and" not_expr)*
+#   not_expr   := "not" not_expr | comparison
+#   comparison := value [op value]        op: == != < <= > >= in, "not in"
+#   value      := number | "string" | 'string' | true | false | none | [literal, ...]
+#               | name(.name)* | "(" expr ")"
+#
+# Names on the left of a comparison (or standing alone) are looked up in the
+# state dict, dotted names descend into nested dicts, and missing keys are None.
+# A bare word on the right of ==, != or an ordering is a string literal, so the
+# producer's `sentiment == skeptical` means what it says; after `in` it names a
+# state value (`"ai" in tags`). Lists hold literals only. Ordering comparisons
+# against missing or mismatched values are False rather than errors.
+#
+# Conditions are compiled once into nested closures; nothing is ever passed to eval().
+
+Predicate = Callable[[dict], bool]
+
+class ConditionError(ValueError):
+    """A condition string that does not parse."""
+
+_TOKEN = re.compile(r"""
+    \s*(?:
+        (?P<number>-?\d+(?:\.\d+)?)
+      | (?P<string>"[^"]*"|'[^']*')
+      | (?P<op>==|!=|<=|>=|<|>|\(|\)|\[|\]|,)
+      | (?P<name>[A-Za-z_][A-Za-z0-9_]*(?:\.[A-Za-z_][A-Za-z0-9_]*)*)
+    )""", re.VERBOSE)
+
+_KEYWORDS = {"and", "or", "not", "in", "true", "false", "none"}
+_CONSTANTS = {"true": True, "false": False, "none": None}
+
+def _tokenize(text: str) -> List[Tuple[str, Any]]:
+    tokens = []
+    position = 0
+    text = text.rstrip()
+    while position < len(text):
+        match = _TOKEN.match(text, position)
+        if not match or match.end() == position:
+            raise ConditionError(f"Unexpected character at {position} in {text!r}")
+        position = match.end()
+        kind = match.lastgroup
+        value = match.group(kind)
+        if kind == "number":
+            tokens.append(("const", float(value) if "." in value else int(value)))
+        elif kind == "string":
+            tokens.append(("const", value[1:-1]))
+        elif kind == "name" and value.lower() in _KEYWORDS:
+            lowered = value.lower()
+            if lowered in _CONSTANTS:
+                tokens.append(("const", _CONSTANTS[lowered]))
+            else:
+                tokens.append(("op", lowered))
+        else:
+            tokens.append((kind, value))
+    return tokens
+
+def _lookup(path: str) -> Callable[[dict], Any]:
+    keys = path.split(".")
+    if len(keys) == 1:
+        key = keys[0]
+        return lambda state: state.get(key)
+
+    def lookup(state: dict) -> Any:
+        value: Any = state
+        for key in keys:
+            if not isinstance(value, dict):
+                return None
+            value = value.get(key)
+        return value
+    return lookup
+
+def _ordered(compare: Callable[[Any, Any], bool]) -> Callable[[Any, Any], bool]:
+    def safe(left: Any, right: Any) -> bool:
+        try:
+            return left is not None and right is not None and compare(left, right)
+        except TypeError:
+            return False
+    return safe
+
+def _contains(left: Any, right: Any) -> bool:
+    try:
+        return right is not None and left in right
+    except TypeError:
+        return False
+
+_COMPARISONS = {
+    "==": lambda a, b: a == b,
+    "!=": lambda a, b: a != b,
+    "<": _ordered(lambda a, b: a < b),
+    "<=": _ordered(lambda a, b: a <= b),
+    ">": _ordered(lambda a, b: a > b),
+    ">=": _ordered(lambda a, b: a >= b),
+    "in": _contains,
+    "not in": lambda a, b: not _contains(a, b),
+}
+
+class _Parser:
+    def __init__(self, text: str):
+        self.text = text
+        self.tokens = _tokenize(text)
+        self.position = 0
+
+    def _peek(self) -> Tuple[str, Any]:
+        return self.tokens[self.position] if self.position < len(self.tokens) else ("end", None)
+
+    def _take(self) -> Tuple[str, Any]:
+        token = self._peek()
+        self.position += 1
+        return token
+
+    def _expect(self, value: str) -> None:
+        kind, actual = self._take()
+        if actual != value or kind != "op":
+            raise ConditionError(f"Expected {value!r} in {self.text!r}, found {actual!r}")
+
+    def parse(self) -> Callable[[dict], Any]:
+        expression = self._or()
+        if self._peek()[0] != "end":
+            raise ConditionError(f"Unexpected {self._peek()[1]!r} in {self.text!r}")
+        return expression
+
+    def _or(self) -> Callable[[dict], Any]:
+        operands = [self._and()]
+        while self._peek() == ("op", "or"):
+            self._take()
+            operands.append(self._and())
+        if len(operands) == 1:
+            return operands[0]
+        return lambda state: any(operand(state) for operand in operands)
+
+    def _and(self) -> Callable[[dict], Any]:
+        operands = [self._not()]
+        while self._peek() == ("op", "and"):
+            self._take()
+            operands.append(self._not())
+        if len(operands) == 1:
+            return operands[0]
+        return lambda state: all(operand(state) for operand in operands)
+
+    def _not(self) -> Callable[[dict], Any]:
+        if self._peek() == ("op", "not"):
+            self._take()
+            operand = self._not()
+            return lambda state: not operand(state)
+        return self._comparison()
+
+    def _comparison(self) -> Callable[[dict], Any]:
+        left = self._value(literal_names=False)
+        kind, op = self._peek()
+        if kind != "op" or op not in _COMPARISONS and op != "not":
+            return left
+        self._take()
+        if op == "not":
+            self._expect("in")
+            op = "not in"
+        right = self._value(literal_names=op not in ("in", "not in"))
+        compare = _COMPARISONS[op]
+        return lambda state: compare(left(state), right(state))
+
+    def _value(self, literal_names: bool) -> Callable[[dict], Any]:
+        kind, value = self._take()
+        if kind == "const":
+            return lambda state: value
+        if kind == "name":
+            if literal_names:
+                return lambda state: value
+            return _lookup(value)
+        if (kind, value) == ("op", "("):
+            expression = self._or()
+            self._expect(")")
+            return expression
+        if (kind, value) == ("op", "["):
+            items = set()
+            while self._peek() != ("op", "]"):
+                item_kind, item = self._take()
+                if item_kind not in ("const", "name"):
+                    raise ConditionError(f"Lists may only hold literals, found {item!r} in {self.text!r}")
+                items.add(item)
+                if self._peek() == ("op", ","):
+                    self._take()
+                elif self._peek() != ("op", "]"):
+                    raise ConditionError(f"Expected ',' or ']' in {self.text!r}")
+            self._take()
+            constant = frozenset(items)
+            return lambda state: constant
+        if kind == "end":
+            raise ConditionError(f"Incomplete condition {self.text!r}")
+        raise ConditionError(f"Unexpected {value!r} in {self.text!r}")
+
+@lru_cache(maxsize=4096)
+def compile_condition(text: str) -> Predicate:
+    """
+    Compiles a condition into a predicate over the conversation state. Empty
+    conditions always hold. Results are cached, so each distinct string is
+    parsed once per process.
+    """
+    if not text or not text.strip():
+        return lambda state: True
+    expression = _Parser(text).parse()
+    return lambda state: bool(expression(state))
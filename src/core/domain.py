@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import List, Optional, Any
 
 class TopicNode(BaseModel):
@@ -17,12 +17,19 @@ class TopicGraph(BaseModel):
     edges: List[TopicEdge] = Field(default_factory=list, description="Connections between nodes")
     current_node_id: Optional[str] = Field(None, description="The ID of the currently active topic")
 
+class StreamEntry(BaseModel):
+    stream: str = Field(..., description="Stream the entry was read from")
+    id: str = Field(..., description="Stream entry ID")
+    fields: dict = Field(default_factory=dict, description="Entry fields; nested values are JSON strings")
+
 class ResearchSummary(BaseModel):
     key_facts: List[str] = Field(..., description="List of key facts extracted from research")
     conflicting_views: List[str] = Field(..., description="Points of disagreement or conflict")
     primary_sources: List[str] = Field(..., description="URLs or names of primary sources")
 
 class HostPersona(BaseModel):
+    # Loaded once and shared by every host using it (see personas/registry.py)
+    model_config = ConfigDict(frozen=True)
     voice_settings: dict = Field(default_factory=dict, description="Voice settings for TTS (stability, clarity, etc.)")
     interaction_rules: List[str] = Field(default_factory=list, description="Stylistic interaction rules")
     a2a_id: str = Field(..., description="Unique identifier for A2A discovery")
@@ -31,3 +38,17 @@ class HostPersona(BaseModel):
     voice_id: str = Field(..., description="Voice ID for TTS")
     system_prompt: str = Field(..., description="System prompt defining personality")
     interruption_sensitivity: float = Field(0.5, ge=0.0, le=1.0, description="Sensitivity to interruptions (0-1)")
+
+class PlanningJob(BaseModel):
+    id: str = Field(..., description="Job id; submitting the same id again returns the existing job")
+    topic: str = Field(..., description="Topic submitted for the episode")
+    episode_id: str = Field(..., description="Episode namespace the finished plan is written to")
+    status: str = Field("queued", description="queued, running, retrying, succeeded or failed")
+    progress: float = Field(0.0, ge=0.0, le=1.0, description="Fraction of the plan completed")
+    message: str = Field("", description="Latest progress note from the worker")
+    attempts: int = Field(0, description="Times a worker has started the job")
+    error: Optional[str] = Field(None, description="Error of the last failed attempt")
+    worker: Optional[str] = Field(None, description="Worker running or last running the job")
+    entry_id: Optional[str] = Field(None, description="Queue stream entry of the running or last attempt")
+    submitted_at: float = Field(..., description="Unix time of submission")
+    updated_at: float = Field(..., description="Unix time of the last status change or heartbeat")
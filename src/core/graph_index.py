@@ -0,0 +1,138 @@
+from collections import deque
+from typing import Dict, List, Optional, Set
+from pydantic import BaseModel, Field
+from .domain import TopicGraph, TopicNode, TopicEdge
+
+class GraphIntegrityReport(BaseModel):
+    """Structural problems found in a TopicGraph."""
+    duplicate_ids: List[str] = Field(default_factory=list, description="Node ids that appear more than once")
+    dangling_edges: List[TopicEdge] = Field(default_factory=list, description="Edges whose source or target is not a node")
+    missing_start: bool = Field(False, description="current_node_id is set but not a node")
+    unreachable: List[str] = Field(default_factory=list, description="Nodes that cannot be reached from the start node")
+    cycles: List[List[str]] = Field(default_factory=list, description="Node id paths that loop back to their first node")
+
+    @property
+    def errors(self) -> List[str]:
+        """Problems that make the graph unusable."""
+        errors = [f"duplicate node id '{node_id}'" for node_id in self.duplicate_ids]
+        errors += [f"edge {e.source_id} -> {e.target_id} references a missing node" for e in self.dangling_edges]
+        if self.missing_start:
+            errors.append("current_node_id is not a node")
+        return errors
+
+    @property
+    def warnings(self) -> List[str]:
+        """Problems a host can live with: dead topics and loops."""
+        warnings = [f"node '{node_id}' is unreachable" for node_id in self.unreachable]
+        warnings += [f"cycle {' -> '.join(cycle + cycle[:1])}" for cycle in self.cycles]
+        return warnings
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+class TopicGraphIndex:
+    """
+    Read-only index over a TopicGraph, built once in O(nodes + edges).
+    Node lookup and a node's outgoing/incoming edges are O(1); reachability and
+    integrity checks are linear in the graph size.
+    """
+
+    def __init__(self, graph: TopicGraph):
+        self.graph = graph
+        self.nodes: Dict[str, TopicNode] = {}
+        self.outgoing: Dict[str, List[TopicEdge]] = {}
+        self.incoming: Dict[str, List[TopicEdge]] = {}
+        self._duplicates: List[str] = []
+        for node in graph.nodes:
+            if node.id in self.nodes:
+                self._duplicates.append(node.id)
+                continue
+            self.nodes[node.id] = node
+        for edge in graph.edges:
+            self.outgoing.setdefault(edge.source_id, []).append(edge)
+            self.incoming.setdefault(edge.target_id, []).append(edge)
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    def __contains__(self, node_id: str) -> bool:
+        return node_id in self.nodes
+
+    @property
+    def start_id(self) -> Optional[str]:
+        """Where an episode begins: the current node, or the first node in plan order."""
+        if self.graph.current_node_id:
+            return self.graph.current_node_id
+        return self.graph.nodes[0].id if self.graph.nodes else None
+
+    def node(self, node_id: Optional[str]) -> Optional[TopicNode]:
+        return self.nodes.get(node_id) if node_id else None
+
+    def edges_from(self, node_id: str) -> List[TopicEdge]:
+        return self.outgoing.get(node_id, [])
+
+    def edges_to(self, node_id: str) -> List[TopicEdge]:
+        return self.incoming.get(node_id, [])
+
+    def successors(self, node_id: str) -> List[TopicNode]:
+        return [self.nodes[e.target_id] for e in self.edges_from(node_id) if e.target_id in self.nodes]
+
+    def reachable(self, start_id: Optional[str] = None) -> Set[str]:
+        """Ids of the nodes reachable from start_id (default: start_id property), including itself."""
+        start_id = start_id or self.start_id
+        if start_id not in self.nodes:
+            return set()
+        seen = {start_id}
+        queue = deque([start_id])
+        while queue:
+            for edge in self.outgoing.get(queue.popleft(), ()):
+                if edge.target_id in self.nodes and edge.target_id not in seen:
+                    seen.add(edge.target_id)
+                    queue.append(edge.target_id)
+        return seen
+
+    def find_cycles(self) -> List[List[str]]:
+        """
+        One cycle per back edge found by an iterative depth-first search, so
+        detection is linear; a graph with many overlapping loops may have more.
+        """
+        visiting, done = 1, 2
+        state: Dict[str, int] = {}
+        cycles = []
+        for root in self.nodes:
+            if root in state:
+                continue
+            state[root] = visiting
+            path = [root]
+            # Position of each node on the current path
+            depth = {root: 0}
+            stack = [iter(self.successors(root))]
+            while stack:
+                child = next(stack[-1], None)
+                if child is None:
+                    stack.pop()
+                    node_id = path.pop()
+                    del depth[node_id]
+                    state[node_id] = done
+                elif state.get(child.id) == visiting:
+                    cycles.append(path[depth[child.id]:])
+                elif child.id not in state:
+                    state[child.id] = visiting
+                    depth[child.id] = len(path)
+                    path.append(child.id)
+                    stack.append(iter(self.successors(child.id)))
+        return cycles
+
+    def check(self) -> GraphIntegrityReport:
+        current = self.graph.current_node_id
+        reachable = self.reachable()
+        return GraphIntegrityReport(
+            duplicate_ids=self._duplicates,
+            dangling_edges=[
+                e for e in self.graph.edges if e.source_id not in self.nodes or e.target_id not in self.nodes
+            ],
+            missing_start=bool(current) and current not in self.nodes,
+            unreachable=[node_id for node_id in self.nodes if node_id not in reachable],
+            cycles=self.find_cycles(),
+        )
@@ -1,20 +1,73 @@
 from abc import ABC, abstractmethod
 from typing import Optional, List, Any, AsyncIterator, Callable
-from .domain import TopicGraph, TopicNode
+from .domain import TopicGraph, TopicNode, TopicEdge, StreamEntry
+from .graph_index import TopicGraphIndex
 
 class StateStore(ABC):
     """Interface for managing shared state (Redis)."""
 
+    # Writers announce graph changes here as {"version", "kind", ...} so that
+    # readers holding a cached graph know when to refetch.
+    TOPIC_GRAPH_CHANNEL = "TOPIC_GRAPH_UPDATED"
+
     @abstractmethod
     async def set_topic_graph(self, graph: TopicGraph) -> None:
         pass
 
     @abstractmethod
-    async def get_topic_graph(self) -> Optional[TopicGraph]:
+    async def get_topic_graph(self, node_ids: Optional[List[str]] = None) -> Optional[TopicGraph]:
+        """Return the graph, or only the given nodes and their outgoing edges."""
         pass
 
+    async def upsert_topic_nodes(
+        self,
+        nodes: List[TopicNode],
+        edges: List[TopicEdge] = (),
+        current_node_id: Optional[str] = None,
+    ) -> None:
+        """
+        Add or replace nodes and add edges (duplicates are ignored) without
+        rewriting the rest of the graph, so a plan can be published while it is
+        still being generated. New nodes are appended in plan order; edges may
+        point to nodes that do not exist yet. Announced on TOPIC_GRAPH_CHANNEL as
+        {"version", "kind": "nodes", "node_ids"}.
+
+        This default rewrites the whole graph and is not atomic; backends
+        override it.
+        """
+        graph = await self.get_topic_graph()
+        merged = {node.id: node for node in graph.nodes} if graph else {}
+        merged.update((node.id, node) for node in nodes)
+        all_edges = list(graph.edges) if graph else []
+        all_edges.extend(edge for edge in edges if edge not in all_edges)
+        await self.set_topic_graph(TopicGraph(
+            nodes=list(merged.values()),
+            edges=all_edges,
+            current_node_id=current_node_id or (graph.current_node_id if graph else None),
+        ))
+
+    async def get_topic_graph_version(self) -> int:
+        """Return a counter that increases on every graph write (0 if unknown)."""
+        return 0
+
+    async def get_current_node(self) -> Optional[TopicNode]:
+        """Return the currently active node."""
+        graph = await self.get_topic_graph()
+        if graph and graph.current_node_id:
+            return next((n for n in graph.nodes if n.id == graph.current_node_id), None)
+        return None
+
+    async def get_topic_index(self) -> Optional[TopicGraphIndex]:
+        """Return an index over the whole graph for O(1) node and edge lookups."""
+        graph = await self.get_topic_graph()
+        return TopicGraphIndex(graph) if graph else None
+
     @abstractmethod
-    async def update_current_node(self, node_id: str) -> None:
+    async def update_current_node(self, node_id: str, expected_node_id: Optional[str] = None) -> bool:
+        """
+        Move the current node pointer. If expected_node_id is given, only move
+        when the graph is still on that node. Returns True if the move happened.
+        """
         pass
 
     @abstractmethod
@@ -26,6 +79,33 @@ class StateStore(ABC):
     async def release_talking_stick(self, agent_id: str) -> None:
         pass
 
+    @abstractmethod
+    async def wait_for_talking_stick(
+        self,
+        agent_id: str,
+        ttl: float = 5,
+        priority: int = 0,
+        timeout: Optional[float] = None,
+    ) -> bool:
+        """
+        Block until the caller holds the lock. Waiters are served by priority
+        (higher first), then in arrival order. Returns False on timeout.
+        """
+        pass
+
+    @abstractmethod
+    async def renew_talking_stick(self, agent_id: str, ttl: float = 5) -> bool:
+        """Extend the holder's lease. Returns False if the caller no longer holds it."""
+        pass
+
+    @abstractmethod
+    async def handoff_talking_stick(self, agent_id: str, to_agent_id: Optional[str] = None) -> Optional[str]:
+        """
+        Release the lock directly to to_agent_id (if waiting) or the next waiter.
+        Returns the new holder, or None if nobody was waiting.
+        """
+        pass
+
     @abstractmethod
     async def publish_event(self, channel: str, message: dict) -> None:
         """Publish a message to a channel."""
@@ -36,9 +116,83 @@ class StateStore(ABC):
         """Add a message to a Redis Stream. Returns the message ID."""
         pass
 
+    async def queue_stream_entry(self, stream_key: str, fields: dict) -> None:
+        """
+        Add a message to a stream without waiting for the write.
+        Implementations may buffer and batch entries until close().
+        """
+        await self.add_to_stream(stream_key, fields)
+
+    @abstractmethod
+    def read_stream(
+        self,
+        stream_key: str,
+        group: str,
+        consumer: str,
+        count: int = 100,
+        block_ms: int = 5000,
+        prefetch: int = 500,
+        claim_idle_ms: Optional[int] = 30000,
+    ) -> AsyncIterator[StreamEntry]:
+        """
+        Consume a stream as `consumer` in consumer group `group`, creating the group
+        if needed. Entries must be acknowledged with ack_stream(); entries left
+        pending by dead consumers for claim_idle_ms are redelivered.
+        """
+        pass
+
+    @abstractmethod
+    async def ack_stream(self, stream_key: str, group: str, *entry_ids: str) -> int:
+        """Acknowledge processed stream entries. Returns how many were pending."""
+        pass
+
+    @abstractmethod
+    async def claim_stream(self, stream_key: str, group: str, consumer: str, *entry_ids: str) -> int:
+        """
+        Make `consumer` the owner of pending entries and reset their idle time
+        (XCLAIM), so a consumer still working on an entry keeps it from being
+        claimed as abandoned. Returns how many were pending.
+        """
+        pass
+
+    @abstractmethod
+    async def create_stream_group(self, stream_key: str, group: str) -> None:
+        """
+        Create a consumer group at the current end of the stream (no-op if it
+        exists). Entries added afterwards are kept for the group even before any
+        consumer of it reads, which is what a durable work queue needs.
+        """
+        pass
+
+    @abstractmethod
+    async def create_record(self, key: str, fields: dict) -> bool:
+        """Store a flat record of string fields unless one exists. Returns True if created."""
+        pass
+
+    @abstractmethod
+    async def update_record(self, key: str, fields: dict) -> None:
+        """Set the given fields of a record, creating it if needed."""
+        pass
+
+    @abstractmethod
+    async def get_record(self, key: str) -> Optional[dict]:
+        """Return a record's fields, or None if it does not exist."""
+        pass
+
     @abstractmethod
     async def subscribe_to_channel(self, channel: str) -> Any:
-        """Subscribe to a channel and return a listener."""
+        """
+        Subscribe to a channel and return a listener. The listener is iterated
+        with `async for message in listener.listen()` and released with close().
+        """
+        pass
+
+    async def connect(self) -> None:
+        """Prepare connections and server-side resources before first use."""
+        pass
+
+    async def close(self) -> None:
+        """Flush pending writes and release connections."""
         pass
 
 class LlmProvider(ABC):
@@ -47,6 +201,18 @@ class LlmProvider(ABC):
     async def generate_response(self, prompt: str, history: List[dict]) -> str:
         pass
 
+class SearchProvider(ABC):
+    """Interface for web search backends used by research."""
+
+    @abstractmethod
+    async def search(self, query: str) -> List[dict]:
+        """Returns results as {"title", "snippet", "url"} dicts, best first."""
+        pass
+
+    async def close(self) -> None:
+        """Release connections."""
+        pass
+
 class AudioProvider(ABC):
     """Interface for Audio/WebRTC (LiveKit)."""
 
@@ -60,6 +226,17 @@ class AudioProvider(ABC):
         """Sends an audio chunk to the stream."""
         pass
 
+    def end_of_turn(self) -> None:
+        """Marks the end of the model's turn so audio still buffered is sent out."""
+        pass
+
+    def interrupt(self) -> dict:
+        """
+        Stops playback of the interrupted turn at once; returns how far it got:
+        {"last_token_index": index of the last chunk played or -1, "played_ms": ...}.
+        """
+        return {"last_token_index": -1, "played_ms": 0.0}
+
     @abstractmethod
     async def on_user_speech(self, callback: Callable) -> None:
         """Registers a callback for when user speech is detected."""
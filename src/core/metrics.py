@@ -0,0 +1,76 @@
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Deque, Iterator
+
+class LatencyRecorder:
+    """
+    Keeps a rolling window of latency samples (in seconds) for percentile reporting.
+    Cheap enough to call on hot paths: recording is an append to a bounded deque.
+    """
+
+    def __init__(self, name: str, max_samples: int = 1024):
+        self.name = name
+        self.count = 0
+        self.total = 0.0
+        self._samples: Deque[float] = deque(maxlen=max_samples)
+
+    def record(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        self._samples.append(seconds)
+
+    @contextmanager
+    def time(self) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(time.perf_counter() - started)
+
+    def percentile(self, p: float) -> float:
+        """Nearest-rank percentile over the current window, 0.0 when empty."""
+        if not self._samples:
+            return 0.0
+        ordered = sorted(self._samples)
+        index = min(len(ordered) - 1, max(0, int(round(p / 100.0 * len(ordered))) - 1))
+        return ordered[index]
+
+    def summary(self) -> dict:
+        return {
+            "count": self.count,
+            "mean_ms": (self.total / self.count * 1000) if self.count else 0.0,
+            "p50_ms": self.percentile(50) * 1000,
+            "p99_ms": self.percentile(99) * 1000,
+            "max_ms": max(self._samples, default=0.0) * 1000,
+        }
+
+class TurnTakingMetrics:
+    """Contention and handoff statistics for the talking stick."""
+
+    def __init__(self):
+        self.attempts = 0
+        self.acquired = 0
+        self.contended = 0
+        self.timeouts = 0
+        self.handoffs = 0
+        # Time a speaker spent queued before getting the stick
+        self.wait = LatencyRecorder("talking_stick.wait")
+        # Time from release/handoff on the server to the next speaker waking up
+        self.handoff = LatencyRecorder("talking_stick.handoff")
+
+    @property
+    def contention_rate(self) -> float:
+        return self.contended / self.attempts if self.attempts else 0.0
+
+    def summary(self) -> dict:
+        return {
+            "attempts": self.attempts,
+            "acquired": self.acquired,
+            "contended": self.contended,
+            "timeouts": self.timeouts,
+            "handoffs": self.handoffs,
+            "contention_rate": self.contention_rate,
+            "wait": self.wait.summary(),
+            "handoff": self.handoff.summary(),
+        }
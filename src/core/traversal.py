@@ -0,0 +1,80 @@
+import logging
+from typing import Dict, List, Optional, Tuple
+from pydantic import BaseModel, Field
+from .domain import TopicEdge
+from .graph_index import TopicGraphIndex
+from .conditions import compile_condition, ConditionError, Predicate
+
+logger = logging.getLogger(__name__)
+
+class TraversalDecision(BaseModel):
+    """Where the conversation goes after a turn, and why."""
+    current_node_id: Optional[str] = Field(None, description="Node the decision was made on")
+    next_node_id: Optional[str] = Field(None, description="Node to move to; None means stay")
+    edge: Optional[TopicEdge] = Field(None, description="Edge that was taken")
+    reason: str = Field(..., description="Human-readable explanation for logs and the producer")
+
+    @property
+    def moved(self) -> bool:
+        return self.next_node_id is not None
+
+class TraversalEngine:
+    """
+    Picks the next topic from the current node's outgoing edges.
+
+    Every condition in the graph is compiled once when the engine is built; a
+    decision is then one pass over the current node's edges. The first edge (in
+    plan order) whose condition holds wins; unconditional edges are the default
+    and only taken when no conditional edge matches and the caller allows it
+    (e.g. once a topic has run long enough). Edges with conditions that do not
+    parse are never taken and are listed in `errors`.
+    """
+
+    def __init__(self, index: TopicGraphIndex):
+        self.index = index
+        self.errors: Dict[str, str] = {}
+        # node id -> ([(edge, predicate)], default edge)
+        self._candidates: Dict[str, Tuple[List[Tuple[TopicEdge, Predicate]], Optional[TopicEdge]]] = {}
+        for source_id, edges in index.outgoing.items():
+            conditional = []
+            default = None
+            for edge in edges:
+                if edge.target_id not in index:
+                    continue
+                if not edge.condition or not edge.condition.strip():
+                    default = default or edge
+                    continue
+                try:
+                    conditional.append((edge, compile_condition(edge.condition)))
+                except ConditionError as e:
+                    self.errors[edge.condition] = str(e)
+                    logger.warning(f"Ignoring edge {edge.source_id} -> {edge.target_id}: {e}")
+            self._candidates[source_id] = (conditional, default)
+
+    def choose_next(self, current_node_id: Optional[str], state: dict, allow_default: bool = True) -> TraversalDecision:
+        candidates = self._candidates.get(current_node_id)
+        if not candidates:
+            return TraversalDecision(current_node_id=current_node_id, reason="no outgoing edges")
+        conditional, default = candidates
+        for edge, predicate in conditional:
+            try:
+                matched = predicate(state)
+            except Exception as e:
+                # A condition must never break the turn loop
+                logger.warning(f"Condition {edge.condition!r} failed: {e}")
+                continue
+            if matched:
+                return TraversalDecision(
+                    current_node_id=current_node_id,
+                    next_node_id=edge.target_id,
+                    edge=edge,
+                    reason=f"condition '{edge.condition}' matched",
+                )
+        if default is not None and allow_default:
+            return TraversalDecision(
+                current_node_id=current_node_id,
+                next_node_id=default.target_id,
+                edge=default,
+                reason="no condition matched, took the default edge" if conditional else "default edge",
+            )
+        return TraversalDecision(current_node_id=current_node_id, reason="no condition matched")
@@ -0,0 +1,325 @@
+import asyncio
+from typing import Any, Awaitable, Callable, List, Optional, Union
+from ..core.metrics import LatencyRecorder
+
+class AudioFramer:
+    """
+    Re-frames 16-bit PCM arriving in chunks of any size into fixed 10 or 20 ms frames.
+
+    Chunks are copied into a preallocated ring buffer and next_frame() hands out
+    exactly one frame as a memoryview into it, so steady-state framing allocates
+    nothing. The capacity is a whole number of frames and reads always take whole
+    frames, so a frame never wraps around the end of the ring. A chunk ending
+    mid-sample keeps its byte until the next chunk completes the sample. A turn
+    that outgrows the ring doubles it instead of dropping audio.
+
+    A frame is only valid until the next write; copy it out before yielding.
+    """
+
+    def __init__(self, sample_rate: int = 24000, channels: int = 1, frame_ms: int = 20, capacity_ms: int = 2000):
+        if frame_ms not in (10, 20):
+            raise ValueError("frame_ms must be 10 or 20")
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.frame_ms = frame_ms
+        self.sample_bytes = 2 * channels
+        self.samples_per_frame = sample_rate * frame_ms // 1000
+        self.frame_bytes = self.samples_per_frame * self.sample_bytes
+        self._silence = bytes(self.frame_bytes)
+        self._allocate(max(2, -(-capacity_ms // frame_ms)) * self.frame_bytes)
+        # Read offset (always frame aligned) and bytes buffered from it
+        self._start = 0
+        self._size = 0
+        self.grows = 0
+        self.padded = 0
+        self.dropped_bytes = 0
+
+    def _allocate(self, capacity: int) -> None:
+        self._buffer = bytearray(capacity)
+        self._view = memoryview(self._buffer)
+        # One view per frame slot, so reading a frame creates no objects either
+        self._frames: List[memoryview] = [
+            self._view[offset:offset + self.frame_bytes] for offset in range(0, capacity, self.frame_bytes)
+        ]
+
+    @property
+    def capacity(self) -> int:
+        return len(self._buffer)
+
+    @property
+    def buffered_bytes(self) -> int:
+        return self._size
+
+    @property
+    def buffered_ms(self) -> float:
+        return self._size / self.sample_bytes / self.sample_rate * 1000
+
+    @property
+    def frames_ready(self) -> int:
+        return self._size // self.frame_bytes
+
+    @property
+    def stats(self) -> dict:
+        return {
+            "capacity_bytes": self.capacity,
+            "buffered_ms": self.buffered_ms,
+            "grows": self.grows,
+            "padded": self.padded,
+            "dropped_bytes": self.dropped_bytes,
+        }
+
+    def write(self, chunk: Union[bytes, bytearray, memoryview]) -> None:
+        data = memoryview(chunk).cast("B")
+        n = len(data)
+        if self._size + n > self.capacity:
+            self._grow(self._size + n)
+        capacity = self.capacity
+        end = (self._start + self._size) % capacity
+        first = min(n, capacity - end)
+        self._view[end:end + first] = data[:first]
+        if first < n:
+            self._view[:n - first] = data[first:]
+        self._size += n
+
+    def _grow(self, needed: int) -> None:
+        capacity = self.capacity
+        while capacity < needed:
+            capacity *= 2
+        old, start, size = self._view, self._start, self._size
+        # Frames already handed out keep pointing at the old buffer
+        self._allocate(capacity)
+        first = min(size, len(old) - start)
+        self._view[:first] = old[start:start + first]
+        self._view[first:size] = old[:size - first]
+        self._start = 0
+        self.grows += 1
+
+    def next_frame(self) -> Optional[memoryview]:
+        """The next full frame, or None until enough audio has been written."""
+        if self._size < self.frame_bytes:
+            return None
+        frame = self._frames[self._start // self.frame_bytes]
+        self._start = (self._start + self.frame_bytes) % self.capacity
+        self._size -= self.frame_bytes
+        return frame
+
+    def pad(self) -> None:
+        """
+        Completes a trailing partial frame with silence so the end of a turn is
+        played. A trailing partial sample cannot be played and is dropped.
+        """
+        partial = self._size % self.frame_bytes
+        if not partial:
+            return
+        dropped = partial % self.sample_bytes
+        self.dropped_bytes += dropped
+        # The partial frame starts on a frame boundary, so it is contiguous
+        offset = (self._start + self._size - partial) % self.capacity
+        self._view[offset + partial - dropped:offset + self.frame_bytes] = self._silence[:self.frame_bytes - partial + dropped]
+        self._size += self.frame_bytes - partial
+        self.padded += 1
+
+    def clear(self) -> int:
+        """Drops everything buffered; returns the number of bytes dropped."""
+        dropped = self._size
+        self._start = 0
+        self._size = 0
+        return dropped
+
+class PacedAudioSender:
+    """
+    Sends a framer's frames to `capture` in real time, at most `lead_ms` ahead of
+    playout, from a single task started on demand.
+
+    Every frame is copied into one reusable frame object from `create_frame()`
+    (shaped like rtc.AudioFrame: `.data` is a memoryview of int16 samples), so
+    `capture` must be done with it once its awaitable completes, as
+    rtc.AudioSource.capture_frame is. A small lead keeps little audio queued
+    downstream; flush() drops the rest (`clear_downstream`, e.g.
+    rtc.AudioSource.clear_queue) together with everything still buffered here.
+    """
+
+    def __init__(
+        self,
+        framer: AudioFramer,
+        capture: Callable[[Any], Awaitable[None]],
+        create_frame: Callable[[], Any],
+        lead_ms: int = 60,
+        clear_downstream: Optional[Callable[[], None]] = None,
+    ):
+        self.framer = framer
+        self.capture = capture
+        self.create_frame = create_frame
+        self.lead_ms = lead_ms
+        self.clear_downstream = clear_downstream
+        self._frame: Any = None
+        self._ready = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        # Playout end of the audio sent so far if it plays in real time
+        self._due = 0.0
+        self.frames_sent = 0
+        self.bytes_sent = 0
+        self.flushes = 0
+        # How late each paced frame went out relative to its schedule
+        self.jitter = LatencyRecorder("audio.send_jitter")
+
+    @property
+    def stats(self) -> dict:
+        return {
+            **self.framer.stats,
+            "frames_sent": self.frames_sent,
+            "flushes": self.flushes,
+            "send_jitter_p99_ms": self.jitter.percentile(99) * 1000,
+        }
+
+    @property
+    def queued_seconds(self) -> float:
+        """Audio sent downstream that has not been played yet."""
+        return max(0.0, self._due - asyncio.get_running_loop().time())
+
+    @property
+    def playing(self) -> bool:
+        return self.framer.buffered_bytes > 0 or self.queued_seconds > 0
+
+    @property
+    def played_bytes(self) -> int:
+        """Bytes sent so far that have been played."""
+        framer = self.framer
+        queued = int(self.queued_seconds * framer.sample_rate) * framer.sample_bytes
+        return max(0, self.bytes_sent - queued)
+
+    def wake(self) -> None:
+        """Called after writing to the framer."""
+        if self.framer.frames_ready:
+            self._ready.set()
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        framer = self.framer
+        frame_seconds = framer.frame_ms / 1000
+        lead = self.lead_ms / 1000
+        while True:
+            if not framer.frames_ready:
+                self._ready.clear()
+                await self._ready.wait()
+                continue
+            now = loop.time()
+            # After a gap (start of a turn, underrun) playout restarts from now
+            due = self._due = max(self._due, now)
+            if due - now > lead:
+                await asyncio.sleep(due - lead - now)
+                self.jitter.record(max(0.0, loop.time() - (due - lead)))
+            # Taken only now: writes during the sleep may reuse the slot of a frame read earlier
+            data = framer.next_frame()
+            if data is None:
+                continue
+            if self._frame is None:
+                self._frame = self.create_frame()
+            self._frame.data.cast("B")[:] = data
+            await self.capture(self._frame)
+            self.frames_sent += 1
+            self.bytes_sent += len(data)
+            self._due += frame_seconds
+
+    def flush(self) -> int:
+        """
+        Silences output now: drops buffered audio, cancels a capture in flight and
+        clears what is queued downstream. Returns the bytes that had been played.
+        """
+        played = self.played_bytes
+        self.bytes_sent = played
+        self.framer.clear()
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        if self.clear_downstream is not None:
+            self.clear_downstream()
+        self._due = 0.0
+        self.flushes += 1
+        return played
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+class InboundAudioAggregator:
+    """
+    Packs inbound PCM frames (typically 10 ms each) into chunks of about
+    `chunk_ms` (40-100 ms) for the live model, so the connection carries one message per
+    chunk rather than one per frame.
+
+    Frames are copied straight from their buffers into one reusable buffer; the
+    only allocation is the bytes of each emitted chunk. Frames are never split, so
+    a chunk is `chunk_ms` rounded up to whole frames. flush() emits whatever is
+    buffered; in adaptive mode the caller flushes on speech onset so the start
+    of an utterance isn't held back to fill a chunk.
+    """
+
+    def __init__(self, sample_rate: int = 24000, channels: int = 1, chunk_ms: int = 60, adaptive: bool = True):
+        if not 40 <= chunk_ms <= 100:
+            raise ValueError("chunk_ms must be between 40 and 100")
+        self.sample_rate = sample_rate
+        self.sample_bytes = 2 * channels
+        self.chunk_ms = chunk_ms
+        self.adaptive = adaptive
+        self.chunk_bytes = sample_rate * chunk_ms // 1000 * self.sample_bytes
+        # Room for a chunk that ends with a whole 10 ms frame past the target
+        self._buffer = bytearray(self.chunk_bytes + sample_rate // 100 * self.sample_bytes)
+        self._view = memoryview(self._buffer)
+        self._size = 0
+        self.frames = 0
+        self.chunks = 0
+        self.onset_flushes = 0
+
+    @property
+    def buffered_ms(self) -> float:
+        return self._size / self.sample_bytes / self.sample_rate * 1000
+
+    @property
+    def stats(self) -> dict:
+        return {
+            "frames": self.frames,
+            "chunks": self.chunks,
+            "frames_per_chunk": self.frames / self.chunks if self.chunks else 0.0,
+            "onset_flushes": self.onset_flushes,
+        }
+
+    def push(self, data: Union[bytes, bytearray, memoryview]) -> Optional[bytes]:
+        """Adds one frame's samples; returns a chunk once `chunk_ms` is buffered."""
+        data = memoryview(data).cast("B")
+        n = len(data)
+        if self._size + n > len(self._buffer):
+            # Frames larger than expected: make room once rather than split them
+            self._buffer = self._buffer[:self._size] + bytearray(max(n, len(self._buffer)))
+            self._view = memoryview(self._buffer)
+        self._view[self._size:self._size + n] = data
+        self._size += n
+        self.frames += 1
+        if self._size >= self.chunk_bytes:
+            return self.flush()
+        return None
+
+    def flush(self) -> Optional[bytes]:
+        """Emits everything buffered, or None if empty."""
+        if not self._size:
+            return None
+        chunk = bytes(self._view[:self._size])
+        self._size = 0
+        self.chunks += 1
+        return chunk
+
+    def speech_started(self) -> Optional[bytes]:
+        """Called on speech onset: in adaptive mode the partial chunk goes out now."""
+        if not self.adaptive:
+            return None
+        chunk = self.flush()
+        if chunk is not None:
+            self.onset_flushes += 1
+        return chunk
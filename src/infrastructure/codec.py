@@ -0,0 +1,156 @@
+import json
+import zlib
+import struct
+from typing import List, Union
+from pydantic import TypeAdapter
+from ..core.domain import TopicNode, TopicEdge
+
+# Serialization of topic graph payloads (one node, or one node's outgoing edges).
+#
+# Every payload carries its format, so readers decode whatever any agent wrote:
+#   JSON    - Pydantic JSON, starts with "{" or "[" (the original format)
+#   binary  - MAGIC, format version, flags, the field lengths, then the UTF-8 fields
+# Writers pick a codec; switch to "binary" once every agent reading the episode
+# can decode it.
+#
+# Decoding always validates: pydantic-core checks these flat models faster than
+# model_construct() can build them in Python (see benchmarks/bench_codec.py).
+
+MAGIC = b"PC"
+BINARY_VERSION = 1
+# Flags
+COMPRESSED_CONTENT = 0x01
+
+_HEADER = struct.Struct("!2sBB")
+_LENGTH = struct.Struct("!I")
+_NONE = 0xFFFFFFFF
+
+_EDGE_LIST = TypeAdapter(List[TopicEdge])
+
+class CodecError(ValueError):
+    """Payload is corrupt or was written in a format version this agent does not know."""
+
+class JsonCodec:
+    name = "json"
+
+    def encode_node(self, node: TopicNode) -> bytes:
+        # Pydantic v2: model_dump_json
+        return node.model_dump_json().encode()
+
+    def encode_edges(self, edges: List[TopicEdge]) -> bytes:
+        return _EDGE_LIST.dump_json(edges)
+
+class BinaryCodec:
+    """
+    Fields without key names or escaping, preceded by a table of their lengths so a
+    reader unpacks all of them in one call. Node content longer than
+    compress_threshold bytes is zlib-compressed when that makes it smaller.
+    """
+
+    name = "binary"
+
+    def __init__(self, compress_threshold: int = 1024, level: int = 1):
+        self.compress_threshold = compress_threshold
+        self.level = level
+
+    def encode_node(self, node: TopicNode) -> bytes:
+        flags = 0
+        content = node.content.encode()
+        if len(content) > self.compress_threshold:
+            compressed = zlib.compress(content, self.level)
+            if len(compressed) < len(content):
+                content = compressed
+                flags |= COMPRESSED_CONTENT
+        metadata = json.dumps(node.metadata).encode() if node.metadata else b""
+        return _pack(flags, [node.id.encode(), node.label.encode(), content, metadata])
+
+    def encode_edges(self, edges: List[TopicEdge]) -> bytes:
+        fields = []
+        for edge in edges:
+            fields.append(edge.source_id.encode())
+            fields.append(edge.target_id.encode())
+            fields.append(edge.condition.encode() if edge.condition is not None else None)
+        return _pack(0, fields)
+
+CODECS = {"json": JsonCodec, "binary": BinaryCodec}
+
+def get_codec(name: str) -> Union[JsonCodec, BinaryCodec]:
+    try:
+        return CODECS[name]()
+    except KeyError:
+        raise ValueError(f"Unknown graph codec: {name}") from None
+
+def _pack(flags: int, fields: list) -> bytes:
+    lengths = [_NONE if field is None else len(field) for field in fields]
+    header = _HEADER.pack(MAGIC, BINARY_VERSION, flags) + _LENGTH.pack(len(fields))
+    return b"".join([header, struct.pack(f"!{len(fields)}I", *lengths), *filter(None, fields)])
+
+def _unpack(data: bytes) -> tuple:
+    """Returns (flags, fields) of a binary payload; None fields stay None."""
+    try:
+        _, version, flags = _HEADER.unpack_from(data)
+        if version != BINARY_VERSION:
+            raise CodecError(f"Unsupported graph payload version {version}")
+        (count,) = _LENGTH.unpack_from(data, _HEADER.size)
+        offset = _HEADER.size + _LENGTH.size
+        lengths = struct.unpack_from(f"!{count}I", data, offset)
+    except struct.error as e:
+        raise CodecError(f"Truncated graph payload: {e}") from None
+    offset += count * _LENGTH.size
+    fields = []
+    for length in lengths:
+        if length == _NONE:
+            fields.append(None)
+            continue
+        fields.append(data[offset:offset + length])
+        offset += length
+    if offset != len(data):
+        raise CodecError("Graph payload length does not match its field table")
+    return flags, fields
+
+def _is_binary(data: bytes) -> bool:
+    return data[:2] == MAGIC
+
+def decode_node(data: Union[bytes, str]) -> TopicNode:
+    """Decodes a node in any known format."""
+    if isinstance(data, str):
+        data = data.encode()
+    if not _is_binary(data):
+        # Pydantic v2: model_validate_json
+        return TopicNode.model_validate_json(data)
+
+    flags, fields = _unpack(data)
+    if len(fields) != 4:
+        raise CodecError(f"Expected 4 node fields, got {len(fields)}")
+    node_id, label, content, metadata = fields
+    if flags & COMPRESSED_CONTENT:
+        try:
+            content = zlib.decompress(content)
+        except zlib.error as e:
+            raise CodecError(f"Corrupt node content: {e}") from None
+    return TopicNode(
+        id=node_id.decode(),
+        label=label.decode(),
+        content=content.decode(),
+        metadata=json.loads(metadata) if metadata else {},
+    )
+
+def decode_edges(data: Union[bytes, str]) -> List[TopicEdge]:
+    """Decodes a list of edges in any known format."""
+    if isinstance(data, str):
+        data = data.encode()
+    if not _is_binary(data):
+        return _EDGE_LIST.validate_json(data)
+
+    _, fields = _unpack(data)
+    if len(fields) % 3:
+        raise CodecError(f"Edge payload has {len(fields)} fields, expected triples")
+    edges = []
+    for i in range(0, len(fields), 3):
+        source_id, target_id, condition = fields[i:i + 3]
+        edges.append(TopicEdge(
+            source_id=source_id.decode(),
+            target_id=target_id.decode(),
+            condition=condition.decode() if condition is not None else None,
+        ))
+    return edges
@@ -0,0 +1,246 @@
+import json
+import asyncio
+import logging
+from typing import Optional, Any, List, AsyncIterator
+from ..core.domain import TopicGraph, TopicNode, TopicEdge, StreamEntry
+from ..core.interfaces import StateStore
+from ..core.graph_index import TopicGraphIndex
+
+logger = logging.getLogger(__name__)
+
+class CachedStateStore(StateStore):
+    """
+    Read-through TopicGraph cache layered on another StateStore.
+
+    The parsed graph is kept in memory together with the version it was read at.
+    While subscribed to TOPIC_GRAPH_CHANNEL, reads are served without touching the
+    backing store until a writer announces a newer version; node moves are applied
+    in place instead of refetching. Without the subscription every read costs one
+    version check.
+
+    Graphs returned from the cache are shared between callers and must be treated
+    as read-only.
+    """
+
+    def __init__(self, store: StateStore, subscribe: bool = True):
+        self.store = store
+        self._subscribe = subscribe
+        self._graph: Optional[TopicGraph] = None
+        # Built on first use per fetched graph; node moves don't change its structure
+        self._index: Optional[TopicGraphIndex] = None
+        self._version = 0
+        self._stale = True
+        # Bumped by every invalidation; a fetch that overlapped one is not cached
+        self._generation = 0
+        self._listening = False
+        self._listener: Optional[asyncio.Task] = None
+        self._lock = asyncio.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    @property
+    def stats(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+            "version": self._version,
+        }
+
+    async def start(self) -> None:
+        """Subscribe to graph invalidations. Called lazily on first read."""
+        if self._listener is None and self._subscribe:
+            pubsub = await self.store.subscribe_to_channel(self.TOPIC_GRAPH_CHANNEL)
+            self._listening = True
+            self._listener = asyncio.create_task(self._listen(pubsub))
+
+    async def stop(self) -> None:
+        if self._listener:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+        self._listening = False
+        self._stale = True
+
+    async def _listen(self, pubsub: Any) -> None:
+        try:
+            async for message in pubsub.listen():
+                if message["type"] == "message":
+                    self._invalidate(json.loads(message["data"]))
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Topic graph invalidation listener failed: {e}")
+        finally:
+            # Fall back to per-read version checks
+            self._listening = False
+            await pubsub.close()
+
+    def _invalidate(self, message: dict) -> None:
+        version = int(message.get("version", 0))
+        if version <= self._version:
+            return
+        self.invalidations += 1
+        self._generation += 1
+        if (
+            message.get("kind") == "move"
+            and version == self._version + 1
+            and self._graph is not None
+            and not self._stale
+        ):
+            # A pointer move is the only change, patch it without a refetch.
+            # model_copy keeps graphs already handed out unchanged.
+            self._graph = self._graph.model_copy(update={"current_node_id": message["current_node_id"]})
+            self._version = version
+        else:
+            self._stale = True
+
+    async def get_topic_graph(self, node_ids: Optional[List[str]] = None) -> Optional[TopicGraph]:
+        if node_ids is not None:
+            # Subset reads are already cheap on the backing store
+            return await self.store.get_topic_graph(node_ids)
+
+        await self.start()
+        if self._listening:
+            if not self._stale and self._graph is not None:
+                self.hits += 1
+                return self._graph
+        elif self._graph is not None and await self.store.get_topic_graph_version() == self._version:
+            self.hits += 1
+            return self._graph
+
+        async with self._lock:
+            # Another reader may have refreshed the cache while we waited
+            if self._listening and not self._stale and self._graph is not None:
+                self.hits += 1
+                return self._graph
+            self.misses += 1
+            generation = self._generation
+            # Read the version first: if a write lands in between, the graph is
+            # newer than its tag and the next invalidation refetches it.
+            version = await self.store.get_topic_graph_version()
+            graph = await self.store.get_topic_graph()
+            if generation != self._generation:
+                # The graph may predate a write announced meanwhile: serve it
+                # to this caller but leave the cache stale.
+                return graph
+            self._stale = False
+            self._graph = graph
+            self._index = None
+            self._version = version
+            return graph
+
+    async def get_topic_graph_version(self) -> int:
+        if self._listening and not self._stale:
+            return self._version
+        return await self.store.get_topic_graph_version()
+
+    async def get_topic_index(self) -> Optional[TopicGraphIndex]:
+        graph = await self.get_topic_graph()
+        if graph is None:
+            return None
+        if self._index is None or self._index.graph.nodes is not graph.nodes:
+            self._index = TopicGraphIndex(graph)
+        else:
+            # Same structure after a patched move, only the current node differs
+            self._index.graph = graph
+        return self._index
+
+    async def get_current_node(self) -> Optional[TopicNode]:
+        graph = await self.get_topic_graph()
+        if graph and graph.current_node_id:
+            index = await self.get_topic_index()
+            return index.node(graph.current_node_id)
+        return None
+
+    async def set_topic_graph(self, graph: TopicGraph) -> None:
+        self._stale = True
+        self._generation += 1
+        await self.store.set_topic_graph(graph)
+
+    async def upsert_topic_nodes(
+        self,
+        nodes: List[TopicNode],
+        edges: List[TopicEdge] = (),
+        current_node_id: Optional[str] = None,
+    ) -> None:
+        self._stale = True
+        self._generation += 1
+        await self.store.upsert_topic_nodes(nodes, edges, current_node_id)
+
+    async def update_current_node(self, node_id: str, expected_node_id: Optional[str] = None) -> bool:
+        return await self.store.update_current_node(node_id, expected_node_id)
+
+    async def acquire_talking_stick(self, agent_id: str, timeout: int = 5) -> bool:
+        return await self.store.acquire_talking_stick(agent_id, timeout)
+
+    async def release_talking_stick(self, agent_id: str) -> None:
+        await self.store.release_talking_stick(agent_id)
+
+    async def wait_for_talking_stick(
+        self,
+        agent_id: str,
+        ttl: float = 5,
+        priority: int = 0,
+        timeout: Optional[float] = None,
+    ) -> bool:
+        return await self.store.wait_for_talking_stick(agent_id, ttl, priority, timeout)
+
+    async def renew_talking_stick(self, agent_id: str, ttl: float = 5) -> bool:
+        return await self.store.renew_talking_stick(agent_id, ttl)
+
+    async def handoff_talking_stick(self, agent_id: str, to_agent_id: Optional[str] = None) -> Optional[str]:
+        return await self.store.handoff_talking_stick(agent_id, to_agent_id)
+
+    async def publish_event(self, channel: str, message: dict) -> None:
+        await self.store.publish_event(channel, message)
+
+    async def add_to_stream(self, stream_key: str, fields: dict) -> str:
+        return await self.store.add_to_stream(stream_key, fields)
+
+    async def queue_stream_entry(self, stream_key: str, fields: dict) -> None:
+        await self.store.queue_stream_entry(stream_key, fields)
+
+    def read_stream(
+        self,
+        stream_key: str,
+        group: str,
+        consumer: str,
+        count: int = 100,
+        block_ms: int = 5000,
+        prefetch: int = 500,
+        claim_idle_ms: Optional[int] = 30000,
+    ) -> AsyncIterator[StreamEntry]:
+        return self.store.read_stream(stream_key, group, consumer, count, block_ms, prefetch, claim_idle_ms)
+
+    async def ack_stream(self, stream_key: str, group: str, *entry_ids: str) -> int:
+        return await self.store.ack_stream(stream_key, group, *entry_ids)
+
+    async def claim_stream(self, stream_key: str, group: str, consumer: str, *entry_ids: str) -> int:
+        return await self.store.claim_stream(stream_key, group, consumer, *entry_ids)
+
+    async def create_stream_group(self, stream_key: str, group: str) -> None:
+        await self.store.create_stream_group(stream_key, group)
+
+    async def create_record(self, key: str, fields: dict) -> bool:
+        return await self.store.create_record(key, fields)
+
+    async def update_record(self, key: str, fields: dict) -> None:
+        await self.store.update_record(key, fields)
+
+    async def get_record(self, key: str) -> Optional[dict]:
+        return await self.store.get_record(key)
+
+    async def subscribe_to_channel(self, channel: str) -> Any:
+        return await self.store.subscribe_to_channel(channel)
+
+    async def connect(self) -> None:
+        await self.store.connect()
+
+    async def close(self) -> None:
+        await self.stop()
+        await self.store.close()
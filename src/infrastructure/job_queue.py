@@ -0,0 +1,241 @@
+import os
+import time
+import uuid
+import socket
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Optional, Set
+from ..core.domain import PlanningJob, StreamEntry, TopicGraph
+from ..core.interfaces import StateStore
+from ..core.metrics import LatencyRecorder
+
+logger = logging.getLogger(__name__)
+
+# report(progress, message) -> updates the job's status record
+ProgressReporter = Callable[[float, str], Awaitable[None]]
+# handler(job, episode_store, report) plans job.topic into episode_store
+JobHandler = Callable[[PlanningJob, StateStore, ProgressReporter], Awaitable[None]]
+
+def _encode(fields: dict) -> dict:
+    return {k: v for k, v in fields.items() if v is not None}
+
+class PlanningJobQueue:
+    """
+    Durable queue of episode planning jobs on a StateStore.
+
+    Job ids are entries of the `planning_jobs` stream, consumed by the `planners`
+    group; each job's status is a record (`job:<id>`). Both live in the store's
+    `namespace` episode (for_episode), so every process connected to the same
+    Redis shares one queue. Submitting an existing job id returns that job
+    instead of queueing it twice.
+    """
+
+    STREAM = "planning_jobs"
+    GROUP = "planners"
+    TERMINAL = ("succeeded", "failed")
+
+    def __init__(self, store: StateStore, namespace: str = "jobs"):
+        # Episode stores for finished plans are derived from this one
+        self.base_store = store
+        self.store = store.for_episode(namespace)
+        self._group_ready = False
+
+    @staticmethod
+    def _key(job_id: str) -> str:
+        return f"job:{job_id}"
+
+    async def _ensure_group(self) -> None:
+        # Jobs submitted before the first worker starts must not be skipped
+        if not self._group_ready:
+            await self.store.create_stream_group(self.STREAM, self.GROUP)
+            self._group_ready = True
+
+    async def submit(self, topic: str, job_id: Optional[str] = None, episode_id: Optional[str] = None) -> PlanningJob:
+        job_id = job_id or uuid.uuid4().hex
+        now = time.time()
+        job = PlanningJob(id=job_id, topic=topic, episode_id=episode_id or job_id, submitted_at=now, updated_at=now)
+        await self._ensure_group()
+        if not await self.store.create_record(self._key(job_id), _encode(job.model_dump())):
+            existing = await self.get(job_id)
+            if existing.status == "queued":
+                # The first submission may have died before queueing; a duplicate entry is skipped
+                await self.store.add_to_stream(self.STREAM, {"job_id": job_id})
+            return existing
+        await self.store.add_to_stream(self.STREAM, {"job_id": job_id})
+        return job
+
+    async def get(self, job_id: str) -> Optional[PlanningJob]:
+        record = await self.store.get_record(self._key(job_id))
+        return PlanningJob.model_validate(record) if record else None
+
+    async def update(self, job_id: str, **fields: Any) -> None:
+        fields["updated_at"] = time.time()
+        await self.store.update_record(self._key(job_id), _encode(fields))
+
+    async def claim(self, job_id: str, attempt: int, worker: str) -> bool:
+        """Exactly one worker wins each attempt of a job."""
+        return await self.store.create_record(f"{self._key(job_id)}:attempt:{attempt}", {"worker": worker})
+
+    async def requeue(self, job_id: str) -> None:
+        await self.store.add_to_stream(self.STREAM, {"job_id": job_id})
+
+class PlanningWorkerPool:
+    """
+    Runs up to `workers` planning jobs at once in this process.
+
+    One consumer (host-pid) reads the stream only when a slot is free and without
+    prefetching, so jobs are never parked behind a busy process. A failed attempt is requeued until
+    `max_attempts`; a job that outlives `job_timeout` fails the attempt. Running
+    jobs heartbeat their record and their stream entry (claim_stream), so only
+    jobs of a process that stopped heartbeating are claimed by other processes
+    after `stale_after`, and restarted. Entries a worker skips (finished jobs,
+    duplicates of a job running elsewhere) are acked rather than left pending,
+    except the entry a running attempt holds, which its worker claims back. Every attempt
+    starts from an empty graph, so a rerun never publishes a mix of its plan and
+    the partial plan of an earlier attempt.
+    """
+
+    def __init__(
+        self,
+        queue: PlanningJobQueue,
+        handler: JobHandler,
+        workers: int = 4,
+        consumer: Optional[str] = None,
+        max_attempts: int = 3,
+        job_timeout: float = 600,
+        heartbeat_interval: float = 10,
+        block_ms: int = 1000,
+    ):
+        self.queue = queue
+        self.handler = handler
+        self.workers = workers
+        self.consumer = consumer or f"{socket.gethostname()}-{os.getpid()}"
+        self.max_attempts = max_attempts
+        self.job_timeout = job_timeout
+        self.heartbeat_interval = heartbeat_interval
+        self.stale_after = heartbeat_interval * 3
+        self.block_ms = block_ms
+        self._tasks: Set[asyncio.Task] = set()
+        self.succeeded = 0
+        self.failed = 0
+        self.retried = 0
+        self.skipped = 0
+        # Submission to first start, and one attempt's run time
+        self.queue_wait = LatencyRecorder("planning.queue_wait")
+        self.run_time = LatencyRecorder("planning.run")
+
+    @property
+    def stats(self) -> dict:
+        return {
+            "running": len(self._tasks),
+            "succeeded": self.succeeded,
+            "failed": self.failed,
+            "retried": self.retried,
+            "skipped": self.skipped,
+            "queue_wait_p50_ms": self.queue_wait.percentile(50) * 1000,
+            "run_p50_ms": self.run_time.percentile(50) * 1000,
+        }
+
+    async def run(self) -> None:
+        """Pull and run jobs until cancelled. Running jobs are cancelled with it and picked up elsewhere."""
+        store = self.queue.store
+        await self.queue._ensure_group()
+        reader = store.read_stream(
+            self.queue.STREAM, self.queue.GROUP, self.consumer,
+            count=1, prefetch=0, block_ms=self.block_ms, claim_idle_ms=int(self.stale_after * 1000),
+        )
+        slots = asyncio.Semaphore(self.workers)
+        try:
+            while True:
+                await slots.acquire()
+                try:
+                    entry = await reader.__anext__()
+                except BaseException:
+                    slots.release()
+                    raise
+                task = asyncio.create_task(self._process(entry))
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+                task.add_done_callback(lambda _: slots.release())
+        finally:
+            for task in list(self._tasks):
+                task.cancel()
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+            await reader.close()
+
+    async def _process(self, entry: StreamEntry) -> None:
+        queue = self.queue
+        job_id = entry.fields.get("job_id")
+        job = await queue.get(job_id) if job_id else None
+        if job is None or job.status in queue.TERMINAL:
+            await self._skip(entry)
+            return
+        if job.status == "running" and time.time() - job.updated_at < self.stale_after:
+            # A duplicate, or the running attempt's own entry claimed while its heartbeat lagged
+            await self._skip(entry, ack=job.entry_id != entry.id)
+            return
+
+        attempt = job.attempts + 1
+        if attempt > self.max_attempts:
+            await queue.update(job_id, status="failed")
+            self.failed += 1
+            await queue.store.ack_stream(queue.STREAM, queue.GROUP, entry.id)
+            return
+        if not await queue.claim(job_id, attempt, self.consumer):
+            # The winner may be running this very entry, leave it to its heartbeat
+            await self._skip(entry, ack=False)
+            return
+
+        if job.attempts == 0:
+            self.queue_wait.record(max(0.0, time.time() - job.submitted_at))
+        await queue.update(job_id, status="running", attempts=attempt, worker=self.consumer, entry_id=entry.id, message="started")
+        await self._run(job, attempt, entry.id)
+        await queue.store.ack_stream(queue.STREAM, queue.GROUP, entry.id)
+
+    async def _skip(self, entry: StreamEntry, ack: bool = True) -> None:
+        self.skipped += 1
+        if ack:
+            # Left pending, XAUTOCLAIM would hand it from consumer to consumer forever
+            await self.queue.store.ack_stream(self.queue.STREAM, self.queue.GROUP, entry.id)
+
+    async def _run(self, job: PlanningJob, attempt: int, entry_id: str) -> None:
+        queue = self.queue
+
+        async def report(progress: float, message: str = "") -> None:
+            await queue.update(job.id, progress=min(1.0, max(0.0, progress)), message=message)
+
+        heartbeat = asyncio.create_task(self._heartbeat(job.id, entry_id))
+        started = time.perf_counter()
+        try:
+            # Plans go to the job's own episode namespace
+            episode_store = queue.base_store.for_episode(job.episode_id)
+            await episode_store.set_topic_graph(TopicGraph(nodes=[]))
+            await asyncio.wait_for(self.handler(job, episode_store, report), self.job_timeout)
+        except Exception as e:
+            error = str(e) or type(e).__name__
+            if attempt < self.max_attempts:
+                logger.warning(f"Planning job {job.id} attempt {attempt} failed, retrying: {error}")
+                await queue.update(job.id, status="retrying", error=error)
+                await queue.requeue(job.id)
+                self.retried += 1
+            else:
+                logger.error(f"Planning job {job.id} failed after {attempt} attempts: {error}")
+                await queue.update(job.id, status="failed", error=error)
+                self.failed += 1
+        else:
+            await queue.update(job.id, status="succeeded", progress=1.0, message="done")
+            self.succeeded += 1
+        finally:
+            self.run_time.record(time.perf_counter() - started)
+            heartbeat.cancel()
+
+    async def _heartbeat(self, job_id: str, entry_id: str) -> None:
+        queue = self.queue
+        while True:
+            await asyncio.sleep(self.heartbeat_interval)
+            try:
+                await queue.update(job_id)
+                # Keeps the entry from looking abandoned while the job runs
+                await queue.store.claim_stream(queue.STREAM, queue.GROUP, self.consumer, entry_id)
+            except Exception as e:
+                logger.warning(f"Heartbeat for planning job {job_id} failed: {e}")
@@ -0,0 +1,26 @@
+class EpisodeKeyspace:
+    """
+    Names every key, stream and channel of one episode.
+
+    Names look like `podcaster:{episode_id}:topic_graph:nodes`. The braces are a
+    Redis Cluster hash tag: only the episode id is hashed, so all keys of an
+    episode share one slot and multi-key scripts and transactions never cross
+    slots, while different episodes spread across the cluster.
+    """
+
+    def __init__(self, episode_id: str, prefix: str = "podcaster"):
+        if not episode_id or "{" in episode_id or "}" in episode_id:
+            raise ValueError(f"Invalid episode id: {episode_id!r}")
+        self.episode_id = episode_id
+        self.prefix = prefix
+        self._base = f"{prefix}:{{{episode_id}}}:"
+
+    def key(self, name: str) -> str:
+        return self._base + name
+
+    def channel(self, name: str) -> str:
+        # Channels are not slot-bound, but sharing the naming keeps them per-episode
+        return self._base + name
+
+    def __repr__(self) -> str:
+        return f"EpisodeKeyspace({self.episode_id!r})"
@@ -1,7 +1,9 @@
 import os
 import asyncio
+import bisect
 import logging
-from typing import Callable, Optional
+from functools import lru_cache
+from typing import Any, Callable, List, Optional, Set
 from livekit import rtc, api
 from livekit.plugins import silero
 from livekit.agents import vad
@@ -9,20 +11,69 @@ from google.adk.agents.live_request_queue import LiveRequestQueue
 from google.genai import types
 
 from ..core.interfaces import AudioProvider
+from ..core.metrics import LatencyRecorder
+from .audio_framer import AudioFramer, InboundAudioAggregator, PacedAudioSender
 
 logger = logging.getLogger(__name__)
 
+@lru_cache(maxsize=None)
+def default_vad() -> Any:
+    """
+    Process-wide Silero VAD model. Loading it is the expensive part; every track
+    gets its own stream from the shared model, so hosts in one process share it.
+    """
+    return silero.VAD.load()
+
 class LiveKitAdapter(AudioProvider):
-    def __init__(self):
+    def __init__(
+        self,
+        vad_model: Any = None,
+        identity: str = "agent-host",
+        display_name: str = "Universal Host",
+        frame_ms: int = 20,
+        lead_ms: int = 60,
+        inbound_chunk_ms: int = 60,
+        inbound_adaptive: bool = True,
+        peer_identities: Optional[Set[str]] = None,
+    ):
+        # Hosts sharing a room need distinct participant identities
+        self.identity = identity
+        self.display_name = display_name
+        # Co-hosts in the room: the model hears them, but they don't barge in
+        self.peer_identities = peer_identities if peer_identities is not None else set()
         self._queue = LiveRequestQueue()
         self._room = rtc.Room()
         self._callback: Optional[Callable] = None
         # Gemini uses 24kHz usually
         self._audio_source = rtc.AudioSource(24000, 1)
         self._track = rtc.LocalAudioTrack.create_audio_track("agent_mic", self._audio_source)
-        self._vad = silero.VAD.load()
+        self._vad = vad_model or default_vad()
         # Track active speakers for local audio gating
         self._active_speakers = 0
+        # Model audio is re-framed into fixed frames and sent in real time
+        self._framer = AudioFramer(24000, 1, frame_ms)
+        self._sender = PacedAudioSender(
+            self._framer,
+            self._audio_source.capture_frame,
+            lambda: rtc.AudioFrame.create(24000, 1, self._framer.samples_per_frame),
+            lead_ms,
+            self._audio_source.clear_queue,
+        )
+        # Model chunks of the current turn, as end offsets in the sender's byte
+        # count, so a played offset maps back to the chunk being played
+        self._turn_open = False
+        self._turn_start = 0
+        self._turn_chunk_ends: List[int] = []
+        # Set by a barge-in until the model acknowledges it (interrupted or turn_complete)
+        self._discarding = False
+        self._last_interruption: Optional[dict] = None
+        # User speech onset (per VAD) to host audio silenced; should stay under 150 ms
+        self.barge_in_latency = LatencyRecorder("barge_in")
+        # Inbound frames are sent to the model in chunks of inbound_chunk_ms per track
+        self.inbound_chunk_ms = inbound_chunk_ms
+        self.inbound_adaptive = inbound_adaptive
+        self.inbound_frames = 0
+        self.inbound_messages = 0
 
     async def start_session(self, room_id: str) -> None:
         url = os.getenv("LIVEKIT_URL")
@@ -34,8 +85,8 @@ class LiveKitAdapter(AudioProvider):
             raise ValueError("LiveKit credentials not found")
 
         token = api.AccessToken(api_key, api_secret) \
-            .with_identity("agent-host") \
-            .with_name("Universal Host") \
+            .with_identity(self.identity) \
+            .with_name(self.display_name) \
             .with_grants(api.VideoGrants(room_join=True, room=room_id)) \
             .to_jwt()
 
@@ -46,20 +97,41 @@ class LiveKitAdapter(AudioProvider):
             if track.kind == rtc.TrackKind.KIND_AUDIO:
                 logger.info(f"Subscribed to audio track from {participant.identity}")
                 # Create stream with 24kHz sample rate to match Gemini preference
-                asyncio.create_task(self._handle_audio_stream(rtc.AudioStream(track, sample_rate=24000)))
+                stream = rtc.AudioStream(track, sample_rate=24000)
+                asyncio.create_task(self._handle_audio_stream(stream, from_agent=self._is_agent(participant)))
 
         await self._room.connect(url, token)
         logger.info("Connected to LiveKit")
 
         await self._room.local_participant.publish_track(self._track)
 
-    async def _handle_audio_stream(self, stream: rtc.AudioStream):
+    def _is_agent(self, participant: Any) -> bool:
+        """Another host, known to this process or marked as an agent by LiveKit."""
+        if participant.identity in self.peer_identities:
+            return True
+        return getattr(participant, "kind", None) == rtc.ParticipantKind.PARTICIPANT_KIND_AGENT
+
+    def _send_inbound(self, chunk: Optional[bytes]) -> None:
+        if chunk:
+            # Data is int16 PCM at 24000Hz
+            self._queue.send_realtime(types.Blob(mime_type="audio/pcm;rate=24000", data=chunk))
+            self.inbound_messages += 1
+
+    async def _handle_audio_stream(self, stream: rtc.AudioStream, from_agent: bool = False):
+        """
+        Forwards a track to the model. Only tracks of people run VAD: a co-host
+        starting to speak must not flush this host's audio or open an activity.
+        """
         # Local VAD stream for this track
-        vad_stream = self._vad.stream()
+        vad_stream = None if from_agent else self._vad.stream()
+        aggregator = InboundAudioAggregator(24000, 1, self.inbound_chunk_ms, self.inbound_adaptive)
 
         async def listen_vad():
             async for event in vad_stream:
                 if event.type == vad.VADEventType.START_OF_SPEECH:
+                    # VAD reports speech once it has lasted speech_duration; it began that long ago
+                    onset = asyncio.get_running_loop().time() - (getattr(event, "speech_duration", 0.0) or 0.0)
+                    self.barge_in(onset)
                     logger.info("VAD: Start of speech")
 
                     self._active_speakers += 1
@@ -67,6 +139,8 @@ class LiveKitAdapter(AudioProvider):
                     if self._active_speakers == 1:
                         if hasattr(self._queue, "send_activity_start"):
                             self._queue.send_activity_start()
+                    # The utterance's first audio goes out now instead of waiting to fill a chunk
+                    self._send_inbound(aggregator.speech_started())
 
                     if self._callback:
                         if asyncio.iscoroutinefunction(self._callback):
@@ -76,6 +150,8 @@ class LiveKitAdapter(AudioProvider):
 
                 elif event.type == vad.VADEventType.END_OF_SPEECH:
                     logger.info("VAD: End of speech")
+                    # The tail of the utterance must reach the model before the activity ends
+                    self._send_inbound(aggregator.flush())
 
                     self._active_speakers = max(0, self._active_speakers - 1)
                     # Signal ADK only on transition to 0 (all silent)
@@ -84,31 +160,95 @@ class LiveKitAdapter(AudioProvider):
                             self._queue.send_activity_end()
 
         # Start VAD listener
-        asyncio.create_task(listen_vad())
+        vad_task = asyncio.create_task(listen_vad()) if vad_stream is not None else None
 
-        async for frame in stream:
-            # Push to VAD
-            vad_stream.push_frame(frame)
+        try:
+            async for frame in stream:
+                # Push to VAD
+                if vad_stream is not None:
+                    vad_stream.push_frame(frame)
 
-            # Push to Gemini
-            # Data is int16 PCM at 24000Hz
-            blob = types.Blob(
-                mime_type="audio/pcm;rate=24000",
-                data=frame.data.tobytes()
-            )
-            self._queue.send_realtime(blob)
+                # Push to Gemini, one message per chunk rather than per frame
+                self.inbound_frames += 1
+                self._send_inbound(aggregator.push(frame.data))
+            self._send_inbound(aggregator.flush())
+        finally:
+            # The track is gone; its VAD listener would otherwise wait forever
+            if vad_task is not None:
+                vad_task.cancel()
 
     async def send_audio_chunk(self, chunk: bytes) -> None:
-        # Local gating: drop audio if user is speaking
-        if self._active_speakers > 0:
+        # Local gating: drop audio if user is speaking, or of a turn that was barged in on
+        if self._active_speakers > 0 or self._discarding:
             return
 
-        # chunk is PCM bytes
-        # Create frame
-        # Assuming 24kHz, mono, 16-bit
-        samples_per_channel = len(chunk) // 2
-        frame = rtc.AudioFrame(data=chunk, sample_rate=24000, num_channels=1, samples_per_channel=samples_per_channel)
-        await self._audio_source.capture_frame(frame)
+        if not self._turn_open:
+            # The turn's audio is sent after whatever is still buffered
+            self._turn_open = True
+            self._turn_start = self._sender.bytes_sent + self._framer.buffered_bytes
+            self._turn_chunk_ends.clear()
+        # chunk is 24kHz mono 16-bit PCM of any length; the sender paces it out
+        self._framer.write(chunk)
+        self._turn_chunk_ends.append(self._turn_start + self._framer.buffered_bytes)
+        self._sender.wake()
+
+    def end_of_turn(self) -> None:
+        # The last partial frame of a turn is padded so it doesn't wait for the next turn
+        self._framer.pad()
+        self._sender.wake()
+        self._turn_open = False
+        self._discarding = False
+
+    def barge_in(self, speech_started_at: Optional[float] = None) -> Optional[dict]:
+        """
+        Silences the host at once if it is speaking: buffered and queued audio is
+        dropped and the capture in flight cancelled. Returns where playback
+        stopped (see interrupt()), or None if the host was silent.
+        """
+        if not self._sender.playing:
+            return None
+        played = self._sender.flush()
+        if speech_started_at is not None:
+            self.barge_in_latency.record(max(0.0, asyncio.get_running_loop().time() - speech_started_at))
+        position = self._playback_position(played)
+        self._turn_open = False
+        self._discarding = True
+        self._last_interruption = position
+        logger.info(f"Barge-in: stopped at chunk {position['last_token_index']} after {position['played_ms']:.0f} ms")
+        return position
+
+    def interrupt(self) -> dict:
+        """
+        The model reports an interruption: silences the host if local VAD didn't
+        already, and returns the playback position of the interrupted turn:
+        `last_token_index` (index of the last model chunk of the turn that was
+        played, -1 if none) and `played_ms`.
+        """
+        position = self.barge_in() or self._last_interruption or self._playback_position(self._sender.played_bytes)
+        self._discarding = False
+        self._last_interruption = None
+        return position
+
+    def _playback_position(self, played: int) -> dict:
+        played_in_turn = max(0, played - self._turn_start)
+        index = -1
+        if played_in_turn:
+            index = min(bisect.bisect_right(self._turn_chunk_ends, self._turn_start + played_in_turn - 1), len(self._turn_chunk_ends) - 1)
+        framer = self._framer
+        return {
+            "last_token_index": index,
+            "played_ms": played_in_turn / framer.sample_bytes / framer.sample_rate * 1000,
+        }
+
+    @property
+    def audio_stats(self) -> dict:
+        return {
+            **self._sender.stats,
+            "barge_ins": self.barge_in_latency.count,
+            "barge_in_p99_ms": self.barge_in_latency.percentile(99) * 1000,
+            "inbound_frames": self.inbound_frames,
+            "inbound_messages": self.inbound_messages,
+        }
 
     async def on_user_speech(self, callback: Callable) -> None:
         self._callback = callback
@@ -0,0 +1,431 @@
+import json
+import time
+import heapq
+import bisect
+import asyncio
+from typing import Optional, List, Dict, AsyncIterator
+from ..core.domain import TopicGraph, TopicNode, TopicEdge, StreamEntry
+from ..core.interfaces import StateStore
+from ..core.metrics import TurnTakingMetrics
+from .keyspace import EpisodeKeyspace
+from .pubsub import Subscription, DROP_OLDEST
+from .stream_writer import encode_stream_fields
+
+class _LocalBroker:
+    """In-process pub/sub with the same Subscription objects as PubSubMultiplexer."""
+
+    def __init__(self, maxsize: int = 256, policy: str = DROP_OLDEST):
+        self.maxsize = maxsize
+        self.policy = policy
+        self._subscribers: Dict[str, set] = {}
+
+    async def subscribe(self, channel: str) -> Subscription:
+        subscription = Subscription(self, channel, self.maxsize, self.policy)
+        self._subscribers.setdefault(channel, set()).add(subscription)
+        return subscription
+
+    async def _unsubscribe(self, subscription: Subscription) -> None:
+        subscribers = self._subscribers.get(subscription.channel)
+        if subscribers:
+            subscribers.discard(subscription)
+            if not subscribers:
+                del self._subscribers[subscription.channel]
+
+    async def publish(self, channel: str, data: str) -> None:
+        message = {"type": "message", "channel": channel, "data": data}
+        for subscription in list(self._subscribers.get(channel, ())):
+            await subscription._deliver(message)
+
+class _ConsumerGroup:
+    def __init__(self, last_id: tuple):
+        self.last_id = last_id
+        # entry id -> [consumer, delivered_at, delivery count]
+        self.pending: Dict[str, list] = {}
+
+class _Stream:
+    def __init__(self):
+        self.ids: List[tuple] = []
+        self.entries: Dict[str, dict] = {}
+        self.groups: Dict[str, _ConsumerGroup] = {}
+        self.last_id = (0, 0)
+        self.changed = asyncio.Event()
+
+    def add(self, fields: dict, maxlen: Optional[int]) -> str:
+        ms = int(time.time() * 1000)
+        entry_id = (ms, 0) if ms > self.last_id[0] else (self.last_id[0], self.last_id[1] + 1)
+        self.last_id = entry_id
+        key = f"{entry_id[0]}-{entry_id[1]}"
+        self.ids.append(entry_id)
+        # Redis returns every field value as a string
+        self.entries[key] = {k: str(v) for k, v in encode_stream_fields(fields).items()}
+        if maxlen is not None and len(self.ids) > maxlen:
+            for old in self.ids[:len(self.ids) - maxlen]:
+                self.entries.pop(f"{old[0]}-{old[1]}", None)
+            del self.ids[:len(self.ids) - maxlen]
+        self.changed.set()
+        self.changed = asyncio.Event()
+        return key
+
+class _MemoryStreamReader:
+    """Consumer-group semantics of StreamGroupReader without the round-trips."""
+
+    def __init__(self, stream: _Stream, stream_key: str, group: str, consumer: str, claim_idle_ms: Optional[int]):
+        self.stream_key = stream_key
+        self.consumer = consumer
+        self.claim_idle_ms = claim_idle_ms
+        self._stream = stream
+        self._group = stream.groups.setdefault(group, _ConsumerGroup(stream.last_id))
+        # Replay entries this consumer never acknowledged
+        self._replay = [entry_id for entry_id, p in self._group.pending.items() if p[0] == consumer]
+        self._next_claim = 0.0
+        self.delivered = 0
+        self.acked = 0
+        self.claimed = 0
+
+    @property
+    def stats(self) -> dict:
+        return {"buffered": 0, "delivered": self.delivered, "acked": self.acked, "claimed": self.claimed}
+
+    def _entry(self, entry_id: str) -> Optional[StreamEntry]:
+        fields = self._stream.entries.get(entry_id)
+        if fields is None:
+            # Trimmed while pending
+            self._group.pending.pop(entry_id, None)
+            return None
+        pending = self._group.pending.setdefault(entry_id, [self.consumer, 0.0, 0])
+        pending[0], pending[1], pending[2] = self.consumer, time.monotonic(), pending[2] + 1
+        self.delivered += 1
+        return StreamEntry(stream=self.stream_key, id=entry_id, fields=fields)
+
+    def _claim(self) -> Optional[StreamEntry]:
+        now = time.monotonic()
+        if not self.claim_idle_ms or now < self._next_claim:
+            return None
+        idle = self.claim_idle_ms / 1000
+        for entry_id, (consumer, delivered_at, _) in list(self._group.pending.items()):
+            if consumer != self.consumer and now - delivered_at >= idle:
+                entry = self._entry(entry_id)
+                if entry:
+                    self.claimed += 1
+                    return entry
+        self._next_claim = now + idle
+        return None
+
+    def _next_new(self) -> Optional[StreamEntry]:
+        ids = self._stream.ids
+        index = bisect.bisect_right(ids, self._group.last_id)
+        if index == len(ids):
+            return None
+        entry_id = self._group.last_id = ids[index]
+        return self._entry(f"{entry_id[0]}-{entry_id[1]}")
+
+    def __aiter__(self) -> "_MemoryStreamReader":
+        return self
+
+    async def __anext__(self) -> StreamEntry:
+        while True:
+            while self._replay:
+                entry = self._entry(self._replay.pop(0))
+                if entry:
+                    return entry
+            entry = self._claim() or self._next_new()
+            if entry:
+                return entry
+            changed = self._stream.changed
+            timeout = self.claim_idle_ms / 1000 if self.claim_idle_ms else None
+            try:
+                await asyncio.wait_for(changed.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    async def ack(self, *entry_ids: str) -> int:
+        acked = sum(1 for entry_id in entry_ids if self._group.pending.pop(entry_id, None) is not None)
+        self.acked += acked
+        return acked
+
+    async def close(self) -> None:
+        pass
+
+class _Episode:
+    """Graph and talking-stick state of one episode."""
+
+    def __init__(self):
+        self.nodes: Dict[str, TopicNode] = {}
+        self.edges: Dict[str, List[TopicEdge]] = {}
+        self.current: Optional[str] = None
+        self.version = 0
+        self.holder: Optional[str] = None
+        self.expires_at = 0.0
+        self.expiry: Optional[asyncio.TimerHandle] = None
+        # heap of (-priority, arrival, agent, lease, future)
+        self.waiters: list = []
+        self.arrivals = 0
+        # key -> flat record of string fields
+        self.records: Dict[str, Dict[str, str]] = {}
+
+class _MemoryBackend:
+    def __init__(self):
+        self.episodes: Dict[str, _Episode] = {}
+        self.streams: Dict[str, _Stream] = {}
+        self.broker = _LocalBroker()
+
+class InMemoryStateStore(StateStore):
+    """
+    Asyncio-native StateStore for single-process deployments and tests.
+
+    Mirrors RedisStateStore semantics: per-episode namespacing, versioned graphs
+    with invalidation messages, the priority/FIFO talking-stick queue with leases,
+    pub/sub with bounded per-consumer queues and streams with consumer groups.
+    Stores created with for_episode() share one backend. Graphs returned share
+    their node objects with the store and must be treated as read-only.
+    """
+
+    def __init__(self, episode_id: str = "default", stream_maxlen: Optional[int] = 10000, backend: Optional[_MemoryBackend] = None):
+        self.backend = backend or _MemoryBackend()
+        self.stream_maxlen = stream_maxlen
+        self.keys = EpisodeKeyspace(episode_id)
+        self.episode_id = episode_id
+        self.turn_metrics = TurnTakingMetrics()
+        self._episode = self.backend.episodes.setdefault(episode_id, _Episode())
+
+    def for_episode(self, episode_id: str) -> "InMemoryStateStore":
+        return InMemoryStateStore(episode_id, self.stream_maxlen, self.backend)
+
+    async def _announce(self, message: dict) -> None:
+        await self.publish_event(self.TOPIC_GRAPH_CHANNEL, message)
+
+    async def set_topic_graph(self, graph: TopicGraph) -> None:
+        episode = self._episode
+        episode.nodes = {node.id: node for node in graph.nodes}
+        episode.edges = {}
+        for edge in graph.edges:
+            episode.edges.setdefault(edge.source_id, []).append(edge)
+        episode.current = graph.current_node_id
+        episode.version += 1
+        await self._announce({"version": episode.version, "kind": "graph"})
+
+    async def upsert_topic_nodes(
+        self,
+        nodes: List[TopicNode],
+        edges: List[TopicEdge] = (),
+        current_node_id: Optional[str] = None,
+    ) -> None:
+        episode = self._episode
+        for node in nodes:
+            episode.nodes[node.id] = node
+        for edge in edges:
+            outgoing = episode.edges.setdefault(edge.source_id, [])
+            if edge not in outgoing:
+                outgoing.append(edge)
+        if current_node_id:
+            episode.current = current_node_id
+        episode.version += 1
+        node_ids = list(dict.fromkeys(node.id for node in nodes))
+        await self._announce({"version": episode.version, "kind": "nodes", "node_ids": node_ids})
+
+    async def get_topic_graph(self, node_ids: Optional[List[str]] = None) -> Optional[TopicGraph]:
+        episode = self._episode
+        ids = list(episode.nodes) if node_ids is None else [i for i in node_ids if i in episode.nodes]
+        if not ids:
+            return None
+        edges = [edge for node_id in ids for edge in episode.edges.get(node_id, ())]
+        return TopicGraph(nodes=[episode.nodes[i] for i in ids], edges=edges, current_node_id=episode.current)
+
+    async def get_topic_graph_version(self) -> int:
+        return self._episode.version
+
+    async def get_current_node(self) -> Optional[TopicNode]:
+        episode = self._episode
+        return episode.nodes.get(episode.current) if episode.current else None
+
+    async def update_current_node(self, node_id: str, expected_node_id: Optional[str] = None) -> bool:
+        episode = self._episode
+        if node_id not in episode.nodes:
+            return False
+        if expected_node_id and episode.current != expected_node_id:
+            return False
+        episode.current = node_id
+        episode.version += 1
+        await self._announce({"version": episode.version, "kind": "move", "current_node_id": node_id})
+        return True
+
+    # --- talking stick ---
+
+    def _holder(self) -> Optional[str]:
+        episode = self._episode
+        if episode.holder and asyncio.get_running_loop().time() >= episode.expires_at:
+            episode.holder = None
+        return episode.holder
+
+    def _grant(self, agent_id: str, lease: float, future: Optional[asyncio.Future] = None) -> None:
+        episode = self._episode
+        loop = asyncio.get_running_loop()
+        episode.holder = agent_id
+        episode.expires_at = loop.time() + lease
+        if episode.expiry:
+            episode.expiry.cancel()
+        episode.expiry = loop.call_later(lease, self._expire)
+        if future:
+            future.set_result(loop.time())
+
+    def _expire(self) -> None:
+        episode = self._episode
+        episode.expiry = None
+        if episode.holder and self._holder() is None:
+            self._promote()
+
+    def _live_waiters(self) -> list:
+        waiters = self._episode.waiters
+        while waiters and waiters[0][4].done():
+            heapq.heappop(waiters)
+        return waiters
+
+    def _promote(self, to_agent_id: Optional[str] = None) -> Optional[str]:
+        waiters = self._live_waiters()
+        if to_agent_id:
+            for entry in waiters:
+                if entry[2] == to_agent_id and not entry[4].done():
+                    self._grant(entry[2], entry[3], entry[4])
+                    return to_agent_id
+        while waiters:
+            _, _, agent_id, lease, future = heapq.heappop(waiters)
+            if not future.done():
+                self._grant(agent_id, lease, future)
+                return agent_id
+        self._episode.holder = None
+        return None
+
+    async def acquire_talking_stick(self, agent_id: str, timeout: int = 5) -> bool:
+        holder = self._holder()
+        if holder == agent_id:
+            self._grant(agent_id, timeout)
+            return True
+        if holder is not None:
+            return False
+        if self._live_waiters():
+            # A free stick goes to the head of the queue, not to a caller that didn't queue
+            self._promote()
+            return False
+        self._grant(agent_id, timeout)
+        return True
+
+    async def release_talking_stick(self, agent_id: str) -> None:
+        await self.handoff_talking_stick(agent_id)
+
+    async def wait_for_talking_stick(
+        self,
+        agent_id: str,
+        ttl: float = 5,
+        priority: int = 0,
+        timeout: Optional[float] = None,
+    ) -> bool:
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        metrics = self.turn_metrics
+        metrics.attempts += 1
+        holder = self._holder()
+        if holder == agent_id or (holder is None and not self._live_waiters()):
+            self._grant(agent_id, ttl)
+        else:
+            metrics.contended += 1
+            episode = self._episode
+            future = loop.create_future()
+            episode.arrivals += 1
+            heapq.heappush(episode.waiters, (-priority, episode.arrivals, agent_id, ttl, future))
+            if holder is None:
+                self._promote()
+            try:
+                granted_at = await asyncio.wait_for(asyncio.shield(future), timeout)
+            except asyncio.TimeoutError:
+                if not future.done():
+                    future.cancel()
+                    metrics.timeouts += 1
+                    return False
+                granted_at = future.result()
+            metrics.handoffs += 1
+            metrics.handoff.record(loop.time() - granted_at)
+        metrics.acquired += 1
+        metrics.wait.record(loop.time() - started)
+        return True
+
+    async def renew_talking_stick(self, agent_id: str, ttl: float = 5) -> bool:
+        if self._holder() != agent_id:
+            return False
+        self._grant(agent_id, ttl)
+        return True
+
+    async def handoff_talking_stick(self, agent_id: str, to_agent_id: Optional[str] = None) -> Optional[str]:
+        if self._holder() != agent_id:
+            return None
+        return self._promote(to_agent_id)
+
+    # --- pub/sub and streams ---
+
+    async def publish_event(self, channel: str, message: dict) -> None:
+        await self.backend.broker.publish(self.keys.channel(channel), json.dumps(message))
+
+    async def subscribe_to_channel(self, channel: str) -> Subscription:
+        return await self.backend.broker.subscribe(self.keys.channel(channel))
+
+    def _stream(self, stream_key: str) -> _Stream:
+        return self.backend.streams.setdefault(self.keys.key(stream_key), _Stream())
+
+    async def add_to_stream(self, stream_key: str, fields: dict) -> str:
+        return self._stream(stream_key).add(fields, None)
+
+    async def queue_stream_entry(self, stream_key: str, fields: dict) -> None:
+        # Nothing to batch in-process; apply the same trimming as the Redis writer
+        self._stream(stream_key).add(fields, self.stream_maxlen)
+
+    def read_stream(
+        self,
+        stream_key: str,
+        group: str,
+        consumer: str,
+        count: int = 100,
+        block_ms: int = 5000,
+        prefetch: int = 500,
+        claim_idle_ms: Optional[int] = 30000,
+    ) -> AsyncIterator[StreamEntry]:
+        return _MemoryStreamReader(self._stream(stream_key), self.keys.key(stream_key), group, consumer, claim_idle_ms)
+
+    async def create_stream_group(self, stream_key: str, group: str) -> None:
+        stream = self._stream(stream_key)
+        stream.groups.setdefault(group, _ConsumerGroup(stream.last_id))
+
+    async def create_record(self, key: str, fields: dict) -> bool:
+        if key in self._episode.records:
+            return False
+        self._episode.records[key] = {k: str(v) for k, v in fields.items()}
+        return True
+
+    async def update_record(self, key: str, fields: dict) -> None:
+        self._episode.records.setdefault(key, {}).update((k, str(v)) for k, v in fields.items())
+
+    async def get_record(self, key: str) -> Optional[dict]:
+        record = self._episode.records.get(key)
+        return dict(record) if record is not None else None
+
+    async def ack_stream(self, stream_key: str, group: str, *entry_ids: str) -> int:
+        stream_group = self._stream(stream_key).groups.get(group)
+        if not stream_group:
+            return 0
+        return sum(1 for entry_id in entry_ids if stream_group.pending.pop(entry_id, None) is not None)
+
+    async def claim_stream(self, stream_key: str, group: str, consumer: str, *entry_ids: str) -> int:
+        stream_group = self._stream(stream_key).groups.get(group)
+        if not stream_group:
+            return 0
+        now = time.monotonic()
+        claimed = 0
+        for entry_id in entry_ids:
+            pending = stream_group.pending.get(entry_id)
+            if pending is not None:
+                pending[0], pending[1] = consumer, now
+                claimed += 1
+        return claimed
+
+    async def close(self) -> None:
+        if self._episode.expiry:
+            self._episode.expiry.cancel()
+            self._episode.expiry = None
@@ -0,0 +1,164 @@
+import asyncio
+import logging
+from typing import Optional, Any, Dict, Set
+
+logger = logging.getLogger(__name__)
+
+# What to do when a consumer's queue is full
+DROP_OLDEST = "drop_oldest"
+DROP_NEWEST = "drop_newest"
+BLOCK = "block"
+
+# Put on a consumer's queue by close() to wake a consumer waiting for a message
+_CLOSED = object()
+
+class Subscription:
+    """
+    One consumer's view of a channel: a bounded queue of messages that is also an
+    async iterator. Messages have the redis-py shape {"type", "channel", "data"}.
+    """
+
+    def __init__(self, multiplexer: "PubSubMultiplexer", channel: str, maxsize: int, policy: str):
+        if policy not in (DROP_OLDEST, DROP_NEWEST, BLOCK):
+            raise ValueError(f"Unknown slow-consumer policy: {policy}")
+        self.channel = channel
+        self.policy = policy
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self.delivered = 0
+        self.dropped = 0
+        self._multiplexer = multiplexer
+        self._closed = False
+
+    async def _deliver(self, message: dict) -> None:
+        if self._closed:
+            return
+        if self.policy == BLOCK:
+            # Backpressure: the shared reader waits, which slows every channel on the connection
+            await self.queue.put(message)
+            self.delivered += 1
+            return
+        if self.queue.full():
+            if self.dropped == 0:
+                logger.warning(f"Slow consumer on {self.channel}, dropping messages ({self.policy})")
+            self.dropped += 1
+            if self.policy == DROP_NEWEST:
+                return
+            self.queue.get_nowait()
+        self.queue.put_nowait(message)
+        self.delivered += 1
+
+    def listen(self) -> "Subscription":
+        """Same iteration style as redis-py's PubSub.listen()."""
+        return self
+
+    def __aiter__(self) -> "Subscription":
+        return self
+
+    async def __anext__(self) -> dict:
+        if self._closed and self.queue.empty():
+            raise StopAsyncIteration
+        message = await self.queue.get()
+        if message is _CLOSED:
+            raise StopAsyncIteration
+        return message
+
+    def _end(self) -> None:
+        self._closed = True
+        # A full queue means nobody is waiting; they stop once it is drained
+        if not self.queue.full():
+            self.queue.put_nowait(_CLOSED)
+
+    async def close(self) -> None:
+        if not self._closed:
+            self._end()
+            await self._multiplexer._unsubscribe(self)
+
+    async def __aenter__(self) -> "Subscription":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.close()
+
+class PubSubMultiplexer:
+    """
+    Shares one Redis subscriber connection between every consumer in the process.
+    Channels are subscribed on the server while at least one consumer holds them,
+    and each message is fanned out to the consumers' own bounded queues.
+    """
+
+    def __init__(self, client: Any, maxsize: int = 256, policy: str = DROP_OLDEST):
+        self.client = client
+        self.maxsize = maxsize
+        self.policy = policy
+        self._pubsub: Any = None
+        self._subscribers: Dict[str, Set[Subscription]] = {}
+        self._reader: Optional[asyncio.Task] = None
+        self._lock = asyncio.Lock()
+
+    @property
+    def stats(self) -> dict:
+        subscriptions = [sub for subs in self._subscribers.values() for sub in subs]
+        return {
+            "channels": len(self._subscribers),
+            "subscriptions": len(subscriptions),
+            "delivered": sum(sub.delivered for sub in subscriptions),
+            "dropped": sum(sub.dropped for sub in subscriptions),
+            "backlog": sum(sub.queue.qsize() for sub in subscriptions),
+        }
+
+    async def subscribe(self, channel: str, maxsize: Optional[int] = None, policy: Optional[str] = None) -> Subscription:
+        subscription = Subscription(self, channel, maxsize or self.maxsize, policy or self.policy)
+        async with self._lock:
+            if self._pubsub is None:
+                self._pubsub = self.client.pubsub()
+            subscribers = self._subscribers.get(channel)
+            if subscribers is None:
+                # Recorded only once subscribed, so a failed SUBSCRIBE is retried by the next consumer
+                await self._pubsub.subscribe(channel)
+                subscribers = self._subscribers[channel] = set()
+            subscribers.add(subscription)
+            if self._reader is None:
+                self._reader = asyncio.create_task(self._read())
+        return subscription
+
+    async def _unsubscribe(self, subscription: Subscription) -> None:
+        async with self._lock:
+            subscribers = self._subscribers.get(subscription.channel)
+            if not subscribers:
+                return
+            subscribers.discard(subscription)
+            if not subscribers:
+                del self._subscribers[subscription.channel]
+                await self._pubsub.unsubscribe(subscription.channel)
+
+    async def _read(self) -> None:
+        while True:
+            try:
+                message = await self._pubsub.get_message(ignore_subscribe_messages=True, timeout=None)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # redis-py reconnects and resubscribes on the next read
+                logger.error(f"Pub/sub reader error: {e}")
+                await asyncio.sleep(1)
+                continue
+            if not message or message.get("type") != "message":
+                continue
+            for subscription in list(self._subscribers.get(message["channel"], ())):
+                await subscription._deliver(message)
+
+    async def close(self) -> None:
+        if self._reader:
+            self._reader.cancel()
+            try:
+                await self._reader
+            except asyncio.CancelledError:
+                pass
+            self._reader = None
+        if self._pubsub is not None:
+            await self._pubsub.aclose()
+            self._pubsub = None
+        for subscribers in self._subscribers.values():
+            for subscription in subscribers:
+                subscription._end()
+        self._subscribers.clear()
@@ -1,63 +1,601 @@
 import redis.asyncio as redis
+import copy
 import json
-from typing import Optional, Any
-from ..core.domain import TopicGraph
+import asyncio
+import hashlib
+import logging
+from redis.exceptions import NoScriptError, WatchError
+from typing import Optional, Any, List, AsyncIterator
+from ..core.domain import TopicGraph, TopicNode, TopicEdge, StreamEntry
 from ..core.interfaces import StateStore
+from ..core.metrics import TurnTakingMetrics
+from .stream_writer import StreamBatchWriter, encode_stream_fields
+from .pubsub import PubSubMultiplexer, Subscription
+from .stream_reader import StreamGroupReader
+from .keyspace import EpisodeKeyspace
+from .codec import get_codec, decode_node, decode_edges
+
+logger = logging.getLogger(__name__)
+
+class ScriptRegistry:
+    """
+    Lua scripts loaded once per server and invoked by SHA.
+    SHAs are computed locally, so EVALSHA can be sent before load_all() has run;
+    a NOSCRIPT reply (cold start or Redis restart) reloads every script and retries.
+    """
+
+    def __init__(self, client: Any):
+        self.client = client
+        self._scripts: dict = {}
+        self.reloads = 0
+
+    def register(self, name: str, source: str) -> str:
+        sha = hashlib.sha1(source.encode()).hexdigest()
+        self._scripts[name] = (source, sha)
+        return sha
+
+    def sha(self, name: str) -> str:
+        return self._scripts[name][1]
+
+    async def load_all(self) -> None:
+        pipe = self.client.pipeline(transaction=False)
+        for source, _ in self._scripts.values():
+            pipe.script_load(source)
+        await pipe.execute()
+
+    async def run(self, name: str, keys: List[str], args: List[Any], client: Any = None) -> Any:
+        """client: run on another connection to the same server (e.g. one without response decoding)."""
+        _, sha = self._scripts[name]
+        client = client or self.client
+        try:
+            return await client.evalsha(sha, len(keys), *keys, *args)
+        except NoScriptError:
+            logger.info(f"Script cache empty on server, reloading Lua scripts ({name})")
+            self.reloads += 1
+            await self.load_all()
+            return await client.evalsha(sha, len(keys), *keys, *args)
+
+# Moves the current-node pointer in one server-side step.
+# KEYS: nodes hash, current pointer, version counter
+# ARGV: target node id, expected current node id ("" = don't care), invalidation channel
+# Returns the new graph version, 0 on a compare-and-set miss, -1 for an unknown node.
+_MOVE_NODE_SCRIPT = """
+if redis.call("hexists", KEYS[1], ARGV[1]) == 0 then
+    return -1
+end
+if ARGV[2] ~= "" and redis.call("get", KEYS[2]) ~= ARGV[2] then
+    return 0
+end
+redis.call("set", KEYS[2], ARGV[1])
+local version = redis.call("incr", KEYS[3])
+redis.call("publish", ARGV[3], cjson.encode({version = version, kind = "move", current_node_id = ARGV[1]}))
+return version
+"""
+
+# Reads the current pointer and its node payload atomically.
+# KEYS: nodes hash, current pointer
+_CURRENT_NODE_SCRIPT = """
+local node_id = redis.call("get", KEYS[2])
+if not node_id then
+    return false
+end
+return redis.call("hget", KEYS[1], node_id)
+"""
+
+# KEYS: record hash. ARGV: field, value, ... Returns 1 if created, 0 if it existed.
+_RECORD_CREATE_SCRIPT = """
+if redis.call("exists", KEYS[1]) == 1 then
+    return 0
+end
+redis.call("hset", KEYS[1], unpack(ARGV))
+return 1
+"""
+
+# Talking-stick queue. Shared KEYS for the scripts below:
+#   KEYS[1] stick holder (string, PX lease)
+#   KEYS[2] wait queue (zset agent -> priority/arrival score)
+#   KEYS[3] waiters (hash agent -> "deadline_ms:lease_ms")
+#   KEYS[4] arrival counter
+# ARGV[1] is the prefix of the per-agent wake lists the waiters BLPOP on. The prefix
+# carries the episode hash tag, so the wake lists share the other keys' cluster slot.
+# Waiters past their deadline are treated as gone and skipped.
+_STICK_HELPERS = """
+local t = redis.call("time")
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+
+local function grant(agent, lease)
+    redis.call("set", KEYS[1], agent, "PX", lease)
+    local wake = ARGV[1] .. agent
+    redis.call("rpush", wake, now)
+    redis.call("pexpire", wake, lease)
+end
+
+local function take(agent)
+    local entry = redis.call("hget", KEYS[3], agent)
+    redis.call("zrem", KEYS[2], agent)
+    redis.call("hdel", KEYS[3], agent)
+    if not entry then
+        return nil
+    end
+    local deadline, lease = string.match(entry, "(%d+):(%d+)")
+    if tonumber(deadline) < now then
+        return nil
+    end
+    return lease
+end
+
+local function promote()
+    while true do
+        local head = redis.call("zrange", KEYS[2], 0, 0)[1]
+        if not head then
+            return ""
+        end
+        local lease = take(head)
+        if lease then
+            grant(head, lease)
+            return head
+        end
+    end
+end
+"""
+
+# ARGV: wake prefix, agent, lease ms, priority, wait deadline ms (0 = don't queue)
+# Returns 1 if the caller holds the stick, 0 if it is queued.
+_STICK_ACQUIRE_SCRIPT = _STICK_HELPERS + """
+local agent = ARGV[2]
+local holder = redis.call("get", KEYS[1])
+if holder == agent then
+    redis.call("pexpire", KEYS[1], ARGV[3])
+    return 1
+end
+if not holder then
+    -- Drop waiters that gave up; a live waiter at the head has precedence
+    while true do
+        local head = redis.call("zrange", KEYS[2], 0, 0)[1]
+        if not head or head == agent then
+            break
+        end
+        local entry = redis.call("hget", KEYS[3], head)
+        if entry and tonumber(string.match(entry, "(%d+):")) >= now then
+            break
+        end
+        redis.call("zrem", KEYS[2], head)
+        redis.call("hdel", KEYS[3], head)
+    end
+    local head = redis.call("zrange", KEYS[2], 0, 0)[1]
+    if not head or head == agent then
+        redis.call("zrem", KEYS[2], agent)
+        redis.call("hdel", KEYS[3], agent)
+        redis.call("del", ARGV[1] .. agent)
+        redis.call("set", KEYS[1], agent, "PX", ARGV[3])
+        return 1
+    end
+    promote()
+end
+if tonumber(ARGV[5]) > 0 then
+    if not redis.call("zscore", KEYS[2], agent) then
+        -- Higher priority first, FIFO within a priority
+        local seq = redis.call("incr", KEYS[4])
+        redis.call("zadd", KEYS[2], -tonumber(ARGV[4]) * 4294967296 + seq, agent)
+        redis.call("del", ARGV[1] .. agent)
+    end
+    redis.call("hset", KEYS[3], agent, (now + tonumber(ARGV[5])) .. ":" .. ARGV[3])
+end
+return 0
+"""
+
+# ARGV: wake prefix, agent, target agent ("" = next in queue)
+# Returns the new holder ("" if nobody was waiting), or false if the caller did not hold the stick.
+_STICK_HANDOFF_SCRIPT = _STICK_HELPERS + """
+if redis.call("get", KEYS[1]) ~= ARGV[2] then
+    return false
+end
+redis.call("del", KEYS[1])
+if ARGV[3] ~= "" then
+    local lease = take(ARGV[3])
+    if lease then
+        grant(ARGV[3], lease)
+        return ARGV[3]
+    end
+end
+return promote()
+"""
+
+# ARGV: wake prefix, agent
+# Leaves the queue. Returns 1 if the stick was granted before the waiter gave up.
+_STICK_CANCEL_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[2] then
+    return 1
+end
+redis.call("zrem", KEYS[2], ARGV[2])
+redis.call("hdel", KEYS[3], ARGV[2])
+redis.call("del", ARGV[1] .. ARGV[2])
+return 0
+"""
+
+# KEYS: stick holder. ARGV: agent, lease ms
+_STICK_RENEW_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("pexpire", KEYS[1], ARGV[2])
+end
+return 0
+"""
 
 class RedisStateStore(StateStore):
-    def __init__(self, redis_url: str = "redis://redis:6379"):
+    """
+    StateStore for one episode. Keys, streams and channels are scoped to the episode
+    (see EpisodeKeyspace); use for_episode() to address another episode over the
+    same connections.
+    """
+
+    def __init__(
+        self,
+        redis_url: str = "redis://redis:6379",
+        episode_id: str = "default",
+        stream_maxlen: Optional[int] = 10000,
+        stream_batch_size: int = 100,
+        stream_flush_interval: float = 0.05,
+        codec: str = "json",
+        trusted_reads: bool = False,
+    ):
         self.client = redis.from_url(redis_url, decode_responses=True)
-        self.topic_key = "topic_graph"
-        self.stick_key = "talking_stick"
+        # Graph payloads may be binary (see codec.py), so they go through a client
+        # that returns bytes. Reads decode any format; writes use `codec`.
+        self.raw_client = redis.from_url(redis_url, decode_responses=False)
+        self.codec = get_codec(codec)
+        # Assemble graphs from decoded nodes without re-checking them; only safe when
+        # every writer of the episode's keys is our own code
+        self.trusted_reads = trusted_reads
+        # Fire-and-forget stream entries are pipelined in the background
+        self.stream_writer = StreamBatchWriter(
+            self.client,
+            max_batch=stream_batch_size,
+            max_delay=stream_flush_interval,
+            maxlen=stream_maxlen,
+        )
+        # One subscriber connection for every listener in the process
+        self.pubsub = PubSubMultiplexer(self.client)
+        self._set_episode(episode_id)
+        # Every read-modify-write on shared state goes through a registered script
+        self.scripts = ScriptRegistry(self.client)
+        self.scripts.register("current_node", _CURRENT_NODE_SCRIPT)
+        self.scripts.register("move_node", _MOVE_NODE_SCRIPT)
+        self.scripts.register("stick_acquire", _STICK_ACQUIRE_SCRIPT)
+        self.scripts.register("stick_handoff", _STICK_HANDOFF_SCRIPT)
+        self.scripts.register("stick_cancel", _STICK_CANCEL_SCRIPT)
+        self.scripts.register("stick_renew", _STICK_RENEW_SCRIPT)
+        self.scripts.register("record_create", _RECORD_CREATE_SCRIPT)
+        self._owns_client = True
+
+    def _set_episode(self, episode_id: str) -> None:
+        self.keys = EpisodeKeyspace(episode_id)
+        self.episode_id = episode_id
+        self.topic_key = self.keys.key("topic_graph")
+        self.stick_key = self.keys.key("talking_stick")
+        # The graph is stored per node so that reads and moves stay O(1) in graph size:
+        #   nodes   - hash  node_id -> encoded TopicNode (codec.py)
+        #   order   - list  node ids in plan order
+        #   edges   - hash  source_id -> encoded list of outgoing TopicEdges
+        #   current - string current node id
+        #   version - counter bumped on every graph write
+        self.nodes_key = f"{self.topic_key}:nodes"
+        self.order_key = f"{self.topic_key}:order"
+        self.edges_key = f"{self.topic_key}:edges"
+        self.current_key = f"{self.topic_key}:current"
+        self.version_key = f"{self.topic_key}:version"
+        self.stick_keys = [
+            self.stick_key,
+            f"{self.stick_key}:queue",
+            f"{self.stick_key}:waiters",
+            f"{self.stick_key}:seq",
+        ]
+        self.stick_wake_prefix = f"{self.stick_key}:wake:"
+        self.turn_metrics = TurnTakingMetrics()
+
+    def for_episode(self, episode_id: str) -> "RedisStateStore":
+        """
+        A store for another episode sharing this store's connection pool, pub/sub
+        connection, stream writer and scripts. Only the original store closes them.
+        """
+        scoped = copy.copy(self)
+        scoped._set_episode(episode_id)
+        scoped._owns_client = False
+        return scoped
+
+    async def connect(self) -> None:
+        """Preload Lua scripts so the first atomic operation doesn't pay for a NOSCRIPT retry."""
+        await self.scripts.load_all()
 
     async def set_topic_graph(self, graph: TopicGraph) -> None:
-        # Pydantic v2: model_dump_json
-        await self.client.set(self.topic_key, graph.model_dump_json())
+        outgoing: dict = {}
+        for edge in graph.edges:
+            outgoing.setdefault(edge.source_id, []).append(edge)
 
-    async def get_topic_graph(self) -> Optional[TopicGraph]:
-        data = await self.client.get(self.topic_key)
+        # MULTI/EXEC so readers never observe a half-written graph
+        pipe = self.raw_client.pipeline(transaction=True)
+        pipe.delete(self.nodes_key, self.order_key, self.edges_key, self.current_key)
+        if graph.nodes:
+            pipe.hset(self.nodes_key, mapping={n.id: self.codec.encode_node(n) for n in graph.nodes})
+            pipe.rpush(self.order_key, *[n.id for n in graph.nodes])
+        if outgoing:
+            pipe.hset(self.edges_key, mapping={
+                source_id: self.codec.encode_edges(edges)
+                for source_id, edges in outgoing.items()
+            })
+        if graph.current_node_id:
+            pipe.set(self.current_key, graph.current_node_id)
+        pipe.incr(self.version_key)
+        results = await pipe.execute()
+        # Readers holding a cached copy refetch once they see the new version
+        await self.publish_event(self.TOPIC_GRAPH_CHANNEL, {"version": results[-1], "kind": "graph"})
+
+    async def upsert_topic_nodes(
+        self,
+        nodes: List[TopicNode],
+        edges: List[TopicEdge] = (),
+        current_node_id: Optional[str] = None,
+    ) -> None:
+        """
+        Writes only the given nodes and the edge lists of the affected sources.
+        Edge lists are merged client-side (they may be binary encoded), so the
+        write is an optimistic WATCH/MULTI transaction retried on conflict.
+        """
+        payloads = {node.id: self.codec.encode_node(node) for node in nodes}
+        node_ids = list(payloads)
+        outgoing: dict = {}
+        for edge in edges:
+            outgoing.setdefault(edge.source_id, []).append(edge)
+        sources = list(outgoing)
+
+        async with self.raw_client.pipeline(transaction=True) as pipe:
+            while True:
+                try:
+                    await pipe.watch(self.nodes_key, self.edges_key)
+                    existing = await pipe.hmget(self.nodes_key, node_ids) if node_ids else []
+                    stored_edges = await pipe.hmget(self.edges_key, sources) if sources else []
+                    merged = {}
+                    for source_id, payload in zip(sources, stored_edges):
+                        current = decode_edges(payload) if payload else []
+                        current.extend(edge for edge in outgoing[source_id] if edge not in current)
+                        merged[source_id] = self.codec.encode_edges(current)
+
+                    pipe.multi()
+                    if payloads:
+                        pipe.hset(self.nodes_key, mapping=payloads)
+                    new_ids = [node_id for node_id, payload in zip(node_ids, existing) if payload is None]
+                    if new_ids:
+                        pipe.rpush(self.order_key, *new_ids)
+                    if merged:
+                        pipe.hset(self.edges_key, mapping=merged)
+                    if current_node_id:
+                        pipe.set(self.current_key, current_node_id)
+                    pipe.incr(self.version_key)
+                    results = await pipe.execute()
+                    break
+                except WatchError:
+                    # Another writer touched the graph between our read and write
+                    continue
+        await self.publish_event(
+            self.TOPIC_GRAPH_CHANNEL, {"version": results[-1], "kind": "nodes", "node_ids": node_ids}
+        )
+
+    async def get_topic_graph_version(self) -> int:
+        version = await self.client.get(self.version_key)
+        return int(version) if version else 0
+
+    async def get_topic_graph(self, node_ids: Optional[List[str]] = None) -> Optional[TopicGraph]:
+        """
+        Returns the topic graph, or only the requested nodes and their outgoing edges.
+        """
+        pipe = self.raw_client.pipeline(transaction=True)
+        if node_ids is None:
+            pipe.lrange(self.order_key, 0, -1)
+            pipe.hgetall(self.nodes_key)
+            pipe.hgetall(self.edges_key)
+            pipe.get(self.current_key)
+            order, node_map, edge_map, current = await pipe.execute()
+            if not order:
+                return None
+            node_data = [node_map.get(node_id) for node_id in order]
+            edge_data = [edge_map.get(node_id) for node_id in order]
+        else:
+            if not node_ids:
+                return None
+            pipe.hmget(self.nodes_key, node_ids)
+            pipe.hmget(self.edges_key, node_ids)
+            pipe.get(self.current_key)
+            node_data, edge_data, current = await pipe.execute()
+            if not any(node_data):
+                return None
+
+        nodes = []
+        edges = []
+        for node_payload, edges_payload in zip(node_data, edge_data):
+            if not node_payload:
+                continue
+            nodes.append(decode_node(node_payload))
+            if edges_payload:
+                edges.extend(decode_edges(edges_payload))
+        if isinstance(current, bytes):
+            current = current.decode()
+        if self.trusted_reads:
+            return TopicGraph.model_construct(nodes=nodes, edges=edges, current_node_id=current)
+        return TopicGraph(nodes=nodes, edges=edges, current_node_id=current)
+
+    async def get_current_node(self) -> Optional[TopicNode]:
+        data = await self.scripts.run(
+            "current_node", [self.nodes_key, self.current_key], [], client=self.raw_client
+        )
         if data:
-            # Pydantic v2: model_validate_json
-            return TopicGraph.model_validate_json(data)
+            return decode_node(data)
         return None
 
-    async def update_current_node(self, node_id: str) -> None:
-        graph = await self.get_topic_graph()
-        if graph:
-            graph.current_node_id = node_id
-            await self.set_topic_graph(graph)
+    async def update_current_node(self, node_id: str, expected_node_id: Optional[str] = None) -> bool:
+        """
+        Atomically moves the current node pointer without touching the rest of the graph.
+        expected_node_id: only move if the graph is still on this node (compare-and-set).
+        """
+        version = await self.scripts.run(
+            "move_node",
+            [self.nodes_key, self.current_key, self.version_key],
+            [node_id, expected_node_id or "", self.keys.channel(self.TOPIC_GRAPH_CHANNEL)]
+        )
+        return int(version) > 0
 
     async def acquire_talking_stick(self, agent_id: str, timeout: int = 5) -> bool:
         """
-        Uses Redis SET NX to acquire a lock.
+        Takes the stick if it is free and nobody is queued for it, without queueing.
+        A free stick with live waiters goes to the head of the queue instead.
         timeout: Lock expiry in seconds to prevent deadlocks.
         """
-        acquired = await self.client.set(self.stick_key, agent_id, nx=True, ex=timeout)
+        acquired = await self.scripts.run(
+            "stick_acquire", self.stick_keys,
+            [self.stick_wake_prefix, agent_id, int(timeout * 1000), 0, 0]
+        )
         return bool(acquired)
 
     async def release_talking_stick(self, agent_id: str) -> None:
-        """Release only if the caller owns the lock."""
-        # Lua script to ensure atomicity
-        script = """
-        if redis.call("get", KEYS[1]) == ARGV[1] then
-            return redis.call("del", KEYS[1])
-        else
-            return 0
-        end
+        """Release only if the caller owns the lock; the next waiter is woken in the same step."""
+        await self.handoff_talking_stick(agent_id)
+
+    async def wait_for_talking_stick(
+        self,
+        agent_id: str,
+        ttl: float = 5,
+        priority: int = 0,
+        timeout: Optional[float] = None,
+    ) -> bool:
+        """
+        Queue for the talking stick and block until it is granted.
+        Waiters sleep on a per-agent BLPOP and are woken by the release/handoff that
+        grants them the stick, so there is no polling. The block is bounded by the
+        lease so an expired holder cannot stall the queue for longer than one lease.
+        """
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        lease_ms = int(ttl * 1000)
+        wake_key = f"{self.stick_wake_prefix}{agent_id}"
+        metrics = self.turn_metrics
+        metrics.attempts += 1
+        contended = False
+        while True:
+            remaining = None if timeout is None else timeout - (loop.time() - started)
+            if remaining is not None and remaining <= 0:
+                granted = await self.scripts.run(
+                    "stick_cancel", self.stick_keys[:3], [self.stick_wake_prefix, agent_id]
+                )
+                if not granted:
+                    metrics.timeouts += 1
+                    return False
+                break
+            block = ttl if remaining is None else min(ttl, remaining)
+            # Keep our queue entry alive a little longer than the next block
+            wait_ms = int(block * 1000) + lease_ms
+            granted = await self.scripts.run(
+                "stick_acquire", self.stick_keys,
+                [self.stick_wake_prefix, agent_id, lease_ms, priority, wait_ms]
+            )
+            if granted:
+                break
+            if not contended:
+                contended = True
+                metrics.contended += 1
+            # TIME runs as soon as BLPOP returns, so the grant time pushed by the
+            # releaser and the wake time come from the same (server) clock
+            pipe = self.client.pipeline(transaction=False)
+            pipe.blpop([wake_key], timeout=block)
+            pipe.time()
+            woken, (seconds, micros) = await pipe.execute()
+            if woken:
+                metrics.handoffs += 1
+                woken_ms = int(seconds) * 1000 + int(micros) // 1000
+                metrics.handoff.record(max(0, woken_ms - int(woken[1])) / 1000)
+                break
+
+        waited = loop.time() - started
+        metrics.acquired += 1
+        metrics.wait.record(waited)
+        return True
+
+    async def renew_talking_stick(self, agent_id: str, ttl: float = 5) -> bool:
+        """Heartbeat: extend the lease if the caller still holds the stick."""
+        renewed = await self.scripts.run("stick_renew", [self.stick_key], [agent_id, int(ttl * 1000)])
+        return bool(renewed)
+
+    async def handoff_talking_stick(self, agent_id: str, to_agent_id: Optional[str] = None) -> Optional[str]:
+        """
+        Pass the stick to to_agent_id if it is waiting, otherwise to the next waiter.
+        Returns the new holder, or None if the stick is now free.
         """
-        await self.client.eval(script, 1, self.stick_key, agent_id)
+        holder = await self.scripts.run(
+            "stick_handoff", self.stick_keys, [self.stick_wake_prefix, agent_id, to_agent_id or ""]
+        )
+        return holder or None
 
     async def publish_event(self, channel: str, message: dict) -> None:
-        """Publish a message to a channel."""
-        await self.client.publish(channel, json.dumps(message))
+        """Publish a message to the episode's channel."""
+        await self.client.publish(self.keys.channel(channel), json.dumps(message))
 
     async def add_to_stream(self, stream_key: str, fields: dict) -> str:
-        """Add a message to a Redis Stream."""
+        """Add a message to the episode's Redis Stream."""
         # xadd returns the message ID as a string
-        return await self.client.xadd(stream_key, fields)
+        return await self.client.xadd(self.keys.key(stream_key), encode_stream_fields(fields))
+
+    async def queue_stream_entry(self, stream_key: str, fields: dict) -> None:
+        """Buffer an entry for the next pipelined batch write."""
+        await self.stream_writer.add(self.keys.key(stream_key), fields)
+
+    def read_stream(
+        self,
+        stream_key: str,
+        group: str,
+        consumer: str,
+        count: int = 100,
+        block_ms: int = 5000,
+        prefetch: int = 500,
+        claim_idle_ms: Optional[int] = 30000,
+    ) -> AsyncIterator[StreamEntry]:
+        """Consumer-group reader with batched, blocking, prefetching XREADGROUP."""
+        return StreamGroupReader(
+            self.client, self.keys.key(stream_key), group, consumer,
+            count=count, block_ms=block_ms, prefetch=prefetch, claim_idle_ms=claim_idle_ms
+        )
+
+    async def create_stream_group(self, stream_key: str, group: str) -> None:
+        await StreamGroupReader(self.client, self.keys.key(stream_key), group, "").ensure_group()
+
+    async def create_record(self, key: str, fields: dict) -> bool:
+        args = [item for field, value in fields.items() for item in (field, str(value))]
+        return bool(await self.scripts.run("record_create", [self.keys.key(key)], args))
+
+    async def update_record(self, key: str, fields: dict) -> None:
+        await self.client.hset(self.keys.key(key), mapping={k: str(v) for k, v in fields.items()})
+
+    async def get_record(self, key: str) -> Optional[dict]:
+        record = await self.client.hgetall(self.keys.key(key))
+        return record or None
+
+    async def ack_stream(self, stream_key: str, group: str, *entry_ids: str) -> int:
+        if not entry_ids:
+            return 0
+        return await self.client.xack(self.keys.key(stream_key), group, *entry_ids)
+
+    async def claim_stream(self, stream_key: str, group: str, consumer: str, *entry_ids: str) -> int:
+        if not entry_ids:
+            return 0
+        # JUSTID: resets the idle time without counting another delivery
+        claimed = await self.client.xclaim(self.keys.key(stream_key), group, consumer, 0, list(entry_ids), justid=True)
+        return len(claimed)
+
+    async def subscribe_to_channel(self, channel: str) -> Subscription:
+        """Subscribe to the episode's channel over the shared connection and return a listener."""
+        return await self.pubsub.subscribe(self.keys.channel(channel))
 
-    async def subscribe_to_channel(self, channel: str) -> Any:
-        """Subscribe to a channel and return a listener."""
-        pubsub = self.client.pubsub()
-        await pubsub.subscribe(channel)
-        return pubsub
+    async def close(self) -> None:
+        """Flush buffered stream entries and close the connection pool."""
+        if not self._owns_client:
+            return
+        await self.stream_writer.close()
+        await self.pubsub.close()
+        await self.client.aclose()
+        await self.raw_client.aclose()
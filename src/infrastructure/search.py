@@ -0,0 +1,51 @@
+import logging
+from typing import Any, Dict, List, Optional
+import httpx
+from ..core.interfaces import SearchProvider
+
+logger = logging.getLogger(__name__)
+
+class HttpSearchProvider(SearchProvider):
+    """
+    SearchProvider for JSON search APIs: GET url?<query_param>=<query>.
+
+    Accepts a bare result list or an object with "results" or "items" (Google
+    Custom Search), and maps "link" to "url". One pooled client is shared by all
+    queries, so concurrent sub-queries reuse connections.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        query_param: str = "q",
+        params: Optional[Dict[str, str]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: float = 10.0,
+        max_connections: int = 16,
+    ):
+        self.url = url
+        self.query_param = query_param
+        self.params = params or {}
+        self.client = httpx.AsyncClient(
+            headers=headers,
+            timeout=timeout,
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+        )
+
+    async def search(self, query: str) -> List[Dict[str, Any]]:
+        response = await self.client.get(self.url, params={**self.params, self.query_param: query})
+        response.raise_for_status()
+        data = response.json()
+        if isinstance(data, dict):
+            data = data.get("results", data.get("items", []))
+        return [
+            {
+                "title": item.get("title", ""),
+                "snippet": item.get("snippet", ""),
+                "url": item.get("url") or item.get("link", ""),
+            }
+            for item in data
+        ]
+
+    async def close(self) -> None:
+        await self.client.aclose()
@@ -0,0 +1,158 @@
+import re
+import json
+import time
+import asyncio
+import hashlib
+import logging
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+from ..core.interfaces import SearchProvider
+from ..core.metrics import LatencyRecorder
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r"\s+")
+# Sentence punctuation closing a query; "C++" or "C#" keep their symbols
+_TRAILING = re.compile(r"[\s?!.]+$")
+
+def normalize_query(query: str) -> str:
+    """
+    Cache key for a query: case, spacing and a closing "?", "!" or "." don't
+    change the results. Other symbols are kept, they can carry meaning.
+    """
+    return _TRAILING.sub("", _WHITESPACE.sub(" ", query.casefold()).strip())
+
+class CachedSearchProvider(SearchProvider):
+    """
+    Two-tier search cache layered on another SearchProvider.
+
+    Lookups go to an in-process LRU first, then (if a Redis client is given) to
+    a tier shared by every producer, and only then to the backend. Keys are
+    normalized queries. Each entry carries its own expiry: `ttl` for results,
+    `empty_ttl` for empty result lists so a transient miss is retried sooner.
+    Concurrent lookups of the same key share one backend call (single-flight).
+    Redis errors are logged and treated as misses; backend errors propagate and
+    are not cached.
+
+    Cached result lists are shared between callers and must be treated as read-only.
+    """
+
+    def __init__(
+        self,
+        provider: SearchProvider,
+        redis_client: Any = None,
+        ttl: float = 6 * 3600,
+        empty_ttl: float = 300,
+        max_entries: int = 1024,
+        prefix: str = "podcaster:research",
+    ):
+        self.provider = provider
+        self.redis = redis_client
+        self.ttl = ttl
+        self.empty_ttl = empty_ttl
+        self.max_entries = max_entries
+        self.prefix = prefix
+        # normalized query -> (expires_at, results)
+        self._local: OrderedDict[str, Tuple[float, List[Dict[str, Any]]]] = OrderedDict()
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self.local_hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.shared_errors = 0
+        self.backend_latency = LatencyRecorder("research.backend")
+
+    @property
+    def stats(self) -> dict:
+        lookups = self.local_hits + self.shared_hits + self.misses + self.coalesced
+        return {
+            "local_hits": self.local_hits,
+            "shared_hits": self.shared_hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "shared_errors": self.shared_errors,
+            "hit_rate": (lookups - self.misses) / lookups if lookups else 0.0,
+            "entries": len(self._local),
+        }
+
+    def _redis_key(self, key: str) -> str:
+        return f"{self.prefix}:{hashlib.sha1(key.encode()).hexdigest()}"
+
+    def _entry_ttl(self, results: List[Dict[str, Any]]) -> float:
+        return self.ttl if results else self.empty_ttl
+
+    def _get_local(self, key: str) -> Optional[List[Dict[str, Any]]]:
+        entry = self._local.get(key)
+        if entry is None:
+            return None
+        expires_at, results = entry
+        if time.monotonic() >= expires_at:
+            del self._local[key]
+            return None
+        self._local.move_to_end(key)
+        return results
+
+    def _put_local(self, key: str, results: List[Dict[str, Any]], ttl: float) -> None:
+        self._local[key] = (time.monotonic() + ttl, results)
+        self._local.move_to_end(key)
+        while len(self._local) > self.max_entries:
+            self._local.popitem(last=False)
+
+    async def search(self, query: str) -> List[Dict[str, Any]]:
+        key = normalize_query(query)
+        results = self._get_local(key)
+        if results is not None:
+            self.local_hits += 1
+            return results
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._fetch(key, query))
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._finish_flight(key, done))
+        else:
+            self.coalesced += 1
+        # The lookup is not tied to any one caller: a cancelled caller leaves it running for the others
+        return await asyncio.shield(task)
+
+    def _finish_flight(self, key: str, task: asyncio.Task) -> None:
+        self._inflight.pop(key, None)
+        if not task.cancelled():
+            # Mark the exception retrieved even if every caller has gone away
+            task.exception()
+
+    async def _fetch(self, key: str, query: str) -> List[Dict[str, Any]]:
+        if self.redis is not None:
+            try:
+                pipe = self.redis.pipeline(transaction=False)
+                pipe.get(self._redis_key(key))
+                pipe.ttl(self._redis_key(key))
+                data, ttl = await pipe.execute()
+                if data is not None:
+                    results = json.loads(data)
+                    self.shared_hits += 1
+                    # Keep the shared expiry so the tiers age together
+                    self._put_local(key, results, ttl if ttl and ttl > 0 else self._entry_ttl(results))
+                    return results
+            except Exception as e:
+                self.shared_errors += 1
+                logger.warning(f"Shared research cache read failed: {e}")
+
+        self.misses += 1
+        with self.backend_latency.time():
+            results = await self.provider.search(query)
+        ttl = self._entry_ttl(results)
+        self._put_local(key, results, ttl)
+        if self.redis is not None:
+            try:
+                await self.redis.set(self._redis_key(key), json.dumps(results), ex=max(1, int(ttl)))
+            except Exception as e:
+                self.shared_errors += 1
+                logger.warning(f"Shared research cache write failed: {e}")
+        return results
+
+    def clear(self) -> None:
+        """Drops the in-process tier."""
+        self._local.clear()
+
+    async def close(self) -> None:
+        await self.provider.close()
@@ -0,0 +1,190 @@
+import time
+import asyncio
+import logging
+from typing import Optional, Any, List
+from redis.exceptions import ResponseError
+from ..core.domain import StreamEntry
+
+logger = logging.getLogger(__name__)
+
+class StreamGroupReader:
+    """
+    Async iterator over a Redis Stream through a consumer group.
+
+    A background task keeps up to `prefetch` entries buffered using blocking
+    XREADGROUP calls of at most `count` entries each; it reads only once there
+    is room, and asks for no more than the room left, so at most `prefetch`
+    entries (or one per waiting consumer, if more) are held at a time. With
+    prefetch=0 nothing is read ahead: entries are fetched only for a consumer
+    already waiting in __anext__. On start it replays entries that
+    were delivered to this consumer but never acknowledged, and every
+    `claim_idle_ms` it claims entries left pending by dead consumers (XAUTOCLAIM).
+    Entries stay pending until ack() is called; delivery is at-least-once, so an
+    entry held longer than claim_idle_ms can be seen twice.
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        stream_key: str,
+        group: str,
+        consumer: str,
+        count: int = 100,
+        block_ms: int = 5000,
+        prefetch: int = 500,
+        claim_idle_ms: Optional[int] = 30000,
+        start_id: str = "$",
+    ):
+        self.client = client
+        self.stream_key = stream_key
+        self.group = group
+        self.consumer = consumer
+        self.count = count
+        self.block_ms = block_ms
+        self.prefetch = prefetch
+        self.claim_idle_ms = claim_idle_ms
+        self.start_id = start_id
+        # Bounded by _wait_for_room() rather than maxsize, so reads never overshoot
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._waiting = 0
+        self._room = asyncio.Event()
+        self._fetcher: Optional[asyncio.Task] = None
+        self.delivered = 0
+        self.acked = 0
+        self.claimed = 0
+
+    @property
+    def stats(self) -> dict:
+        return {
+            "buffered": self._queue.qsize(),
+            "delivered": self.delivered,
+            "acked": self.acked,
+            "claimed": self.claimed,
+        }
+
+    async def ensure_group(self) -> None:
+        try:
+            await self.client.xgroup_create(self.stream_key, self.group, id=self.start_id, mkstream=True)
+        except ResponseError as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+
+    def _free(self) -> int:
+        return max(self.prefetch, self._waiting) - self._queue.qsize()
+
+    async def _wait_for_room(self) -> int:
+        """Waits until entries may be fetched and returns how many."""
+        while self._free() <= 0:
+            self._room.clear()
+            await self._room.wait()
+        return min(self.count, self._free())
+
+    async def _enqueue(self, entries: List[Any]) -> int:
+        added = 0
+        for entry_id, fields in entries:
+            if fields is None:
+                # Entry was trimmed from the stream while pending
+                await self.client.xack(self.stream_key, self.group, entry_id)
+                continue
+            self._queue.put_nowait(StreamEntry(stream=self.stream_key, id=entry_id, fields=fields))
+            added += 1
+        return added
+
+    async def _read(self, last_id: str, block: Optional[int]) -> List[Any]:
+        count = await self._wait_for_room()
+        response = await self.client.xreadgroup(
+            self.group, self.consumer, {self.stream_key: last_id},
+            count=count, block=block
+        )
+        if not response:
+            return []
+        if isinstance(response, dict):
+            # RESP3
+            return response.get(self.stream_key, [[]])[0]
+        return response[0][1]
+
+    async def _claim(self) -> None:
+        start = "0-0"
+        while True:
+            count = await self._wait_for_room()
+            result = await self.client.xautoclaim(
+                self.stream_key, self.group, self.consumer,
+                self.claim_idle_ms, start_id=start, count=count
+            )
+            start, entries = result[0], result[1]
+            self.claimed += await self._enqueue(entries)
+            if not entries or start in ("0-0", b"0-0"):
+                return
+
+    async def _run(self) -> None:
+        await self.ensure_group()
+        # Replay our own unacknowledged entries from before a restart
+        last_id = "0"
+        while True:
+            entries = await self._read(last_id, None)
+            if not entries:
+                break
+            await self._enqueue(entries)
+            last_id = entries[-1][0]
+
+        next_claim = 0.0
+        while True:
+            try:
+                if self.claim_idle_ms and time.monotonic() >= next_claim:
+                    await self._claim()
+                    next_claim = time.monotonic() + self.claim_idle_ms / 1000
+                await self._enqueue(await self._read(">", self.block_ms))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Stream reader {self.group}/{self.consumer} failed on {self.stream_key}: {e}")
+                await asyncio.sleep(1)
+
+    def start(self) -> None:
+        if self._fetcher is None:
+            self._fetcher = asyncio.create_task(self._run())
+
+    def __aiter__(self) -> "StreamGroupReader":
+        self.start()
+        return self
+
+    async def __anext__(self) -> StreamEntry:
+        self.start()
+        if not self._queue.empty():
+            self.delivered += 1
+            entry = self._queue.get_nowait()
+            self._room.set()
+            return entry
+        getter = asyncio.ensure_future(self._queue.get())
+        self._waiting += 1
+        self._room.set()
+        try:
+            done, _ = await asyncio.wait({getter, self._fetcher}, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            self._waiting -= 1
+            # Taking an entry frees room below prefetch
+            self._room.set()
+            if not getter.done():
+                # Cancelled or the fetcher stopped; don't let the getter swallow a later entry
+                getter.cancel()
+        if getter in done:
+            self.delivered += 1
+            return getter.result()
+        # The fetcher only stops on close() or a startup error (e.g. wrong key type)
+        if self._fetcher.cancelled():
+            raise StopAsyncIteration
+        self._fetcher.result()
+        raise StopAsyncIteration
+
+    async def ack(self, *entry_ids: str) -> int:
+        if not entry_ids:
+            return 0
+        acked = await self.client.xack(self.stream_key, self.group, *entry_ids)
+        self.acked += acked
+        return acked
+
+    async def close(self) -> None:
+        """Stop prefetching. Buffered but unacknowledged entries stay pending for a later claim."""
+        if self._fetcher:
+            self._fetcher.cancel()
+            await asyncio.gather(self._fetcher, return_exceptions=True)
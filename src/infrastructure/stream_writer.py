@@ -0,0 +1,117 @@
+import json
+import asyncio
+import logging
+from typing import Optional, Any, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+def encode_stream_fields(fields: dict) -> dict:
+    """Redis stream values must be flat; nested values are stored as JSON."""
+    encoded = {}
+    for key, value in fields.items():
+        if isinstance(value, (dict, list, tuple, bool)) or value is None:
+            value = json.dumps(value)
+        encoded[key] = value
+    return encoded
+
+class StreamBatchWriter:
+    """
+    Buffers stream entries and writes them with pipelined XADDs.
+
+    A batch is flushed when it reaches max_batch entries or at most max_delay
+    seconds after its first entry was buffered, whichever comes first. Streams are
+    trimmed with an approximate MAXLEN on every write so they stay bounded.
+    Callers only wait on Redis when more than max_pending entries are buffered.
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        max_batch: int = 100,
+        max_delay: float = 0.05,
+        maxlen: Optional[int] = 10000,
+        max_pending: int = 10000,
+    ):
+        self.client = client
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.maxlen = maxlen
+        self.max_pending = max_pending
+        self._buffer: List[Tuple[str, dict]] = []
+        self._has_data = asyncio.Event()
+        self._batch_full = asyncio.Event()
+        self._flusher: Optional[asyncio.Task] = None
+        self._flush_lock = asyncio.Lock()
+        self._closed = False
+        self.entries_written = 0
+        self.batches_written = 0
+        self.entries_failed = 0
+
+    @property
+    def pending(self) -> int:
+        return len(self._buffer)
+
+    @property
+    def stats(self) -> dict:
+        return {
+            "pending": self.pending,
+            "entries_written": self.entries_written,
+            "batches_written": self.batches_written,
+            "entries_failed": self.entries_failed,
+        }
+
+    async def add(self, stream_key: str, fields: dict) -> None:
+        if self._closed:
+            raise RuntimeError("StreamBatchWriter is closed")
+        self._buffer.append((stream_key, encode_stream_fields(fields)))
+        if self._flusher is None:
+            self._flusher = asyncio.create_task(self._run())
+        self._has_data.set()
+        if len(self._buffer) >= self.max_batch:
+            self._batch_full.set()
+        if len(self._buffer) > self.max_pending:
+            # Backpressure: Redis is not keeping up, write inline
+            await self.flush()
+
+    async def _run(self) -> None:
+        while not self._closed:
+            # Sleep until there is something to write, then give the batch
+            # max_delay to fill up
+            await self._has_data.wait()
+            try:
+                await asyncio.wait_for(self._batch_full.wait(), timeout=self.max_delay)
+            except asyncio.TimeoutError:
+                pass
+            self._has_data.clear()
+            self._batch_full.clear()
+            await self.flush()
+
+    async def flush(self) -> None:
+        """Write everything buffered so far in pipelines of max_batch entries."""
+        async with self._flush_lock:
+            while self._buffer:
+                batch = self._buffer[:self.max_batch]
+                del self._buffer[:self.max_batch]
+                pipe = self.client.pipeline(transaction=False)
+                for stream_key, fields in batch:
+                    pipe.xadd(stream_key, fields, maxlen=self.maxlen, approximate=True)
+                try:
+                    await pipe.execute()
+                except Exception as e:
+                    # Conversation events are best-effort; never stall the audio loop on them
+                    self.entries_failed += len(batch)
+                    logger.error(f"Failed to write {len(batch)} stream entries: {e}")
+                    continue
+                self.entries_written += len(batch)
+                self.batches_written += 1
+
+    async def close(self) -> None:
+        """Flush-on-shutdown hook: stops the background flusher and drains the buffer."""
+        self._closed = True
+        if self._flusher:
+            # Let an in-flight batch finish instead of cancelling it mid-write
+            self._has_data.set()
+            self._batch_full.set()
+            await self._flusher
+            self._flusher = None
+        await self.flush()
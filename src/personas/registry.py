@@ -0,0 +1,161 @@
+import os
+import json
+import time
+import asyncio
+import logging
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+from ..core.domain import HostPersona
+from ..core.metrics import LatencyRecorder
+
+logger = logging.getLogger(__name__)
+
+# Persona files ship next to this module, independent of the working directory
+PERSONA_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# (mtime_ns, size) of a persona file when it was last read
+_Stamp = Tuple[int, int]
+
+class PersonaRegistry:
+    """
+    Validated HostPersonas of a directory of `<persona_id>.json` files.
+
+    load() reads and validates every file once; agents then share the same frozen
+    HostPersona objects, so the cost of a host is a dict lookup rather than disk
+    I/O and validation. scan() reloads only files whose mtime or size changed and
+    drops deleted ones; watch() runs it periodically off the event loop. A file
+    that fails to load keeps the previous version of its persona and is retried
+    when it changes again.
+    """
+
+    def __init__(self, directory: str = PERSONA_DIR):
+        self.directory = directory
+        self._personas: Dict[str, HostPersona] = {}
+        self._stamps: Dict[str, _Stamp] = {}
+        self._watcher: Optional[asyncio.Task] = None
+        self.reloads = 0
+        self.errors = 0
+        # Time to read and validate one file, and the last full or incremental scan
+        self.load_time = LatencyRecorder("personas.load")
+        self.last_scan_seconds = 0.0
+
+    @property
+    def stats(self) -> dict:
+        return {
+            "personas": len(self._personas),
+            "reloads": self.reloads,
+            "errors": self.errors,
+            "load_p50_ms": self.load_time.percentile(50) * 1000,
+            "last_scan_ms": self.last_scan_seconds * 1000,
+        }
+
+    def __len__(self) -> int:
+        return len(self._personas)
+
+    def __contains__(self, persona_id: str) -> bool:
+        return persona_id in self._personas
+
+    def ids(self) -> List[str]:
+        return sorted(self._personas)
+
+    def _path(self, persona_id: str) -> str:
+        return os.path.join(self.directory, f"{persona_id}.json")
+
+    def _read(self, persona_id: str) -> HostPersona:
+        with self.load_time.time():
+            with open(self._path(persona_id), "r") as f:
+                data = json.load(f)
+            return HostPersona(**data)
+
+    def get(self, persona_id: str) -> Optional[HostPersona]:
+        """
+        The persona for `persona_id`, or None if there is no such file. Personas
+        added since the last scan are loaded on first use; invalid files raise.
+        """
+        persona = self._personas.get(persona_id)
+        if persona is not None or persona_id in self._stamps:
+            return persona
+        path = self._path(persona_id)
+        if not os.path.exists(path):
+            return None
+        persona = self._read(persona_id)
+        self._personas[persona_id] = persona
+        try:
+            stat = os.stat(path)
+            self._stamps[persona_id] = (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            # Unknown stamp: the next scan reads the file again
+            pass
+        return persona
+
+    def load(self) -> int:
+        """Loads every persona in the directory; returns how many are available."""
+        self.scan()
+        logger.info(f"Loaded {len(self._personas)} personas from {self.directory} in {self.last_scan_seconds * 1000:.1f} ms")
+        return len(self._personas)
+
+    def scan(self) -> List[str]:
+        """Reloads new and changed persona files, forgets deleted ones; returns the ids that changed."""
+        started = time.perf_counter()
+        seen: Dict[str, _Stamp] = {}
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                if entry.name.endswith(".json") and entry.is_file():
+                    stat = entry.stat()
+                    seen[entry.name[:-len(".json")]] = (stat.st_mtime_ns, stat.st_size)
+
+        changed = []
+        for persona_id, stamp in seen.items():
+            if self._stamps.get(persona_id) == stamp:
+                continue
+            # Recorded even on failure so a broken file is not re-read until it changes
+            self._stamps[persona_id] = stamp
+            try:
+                persona = self._read(persona_id)
+            except Exception as e:
+                self.errors += 1
+                logger.error(f"Failed to load persona {persona_id}, keeping the previous version: {e}")
+                continue
+            if persona_id in self._personas:
+                self.reloads += 1
+            self._personas[persona_id] = persona
+            changed.append(persona_id)
+
+        for persona_id in list(self._stamps):
+            if persona_id not in seen:
+                del self._stamps[persona_id]
+                if self._personas.pop(persona_id, None) is not None:
+                    changed.append(persona_id)
+
+        self.last_scan_seconds = time.perf_counter() - started
+        return changed
+
+    def watch(self, interval: float = 2.0) -> None:
+        """Rescans the directory every `interval` seconds until stop() is awaited."""
+        if self._watcher is None:
+            self._watcher = asyncio.create_task(self._watch(interval))
+
+    async def _watch(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                # Stat calls and parsing stay off the loop that paces audio
+                changed = await asyncio.to_thread(self.scan)
+                if changed:
+                    logger.info(f"Reloaded personas: {', '.join(sorted(changed))}")
+            except Exception as e:
+                logger.warning(f"Persona scan of {self.directory} failed: {e}")
+
+    async def stop(self) -> None:
+        if self._watcher is not None:
+            self._watcher.cancel()
+            try:
+                await self._watcher
+            except asyncio.CancelledError:
+                pass
+            self._watcher = None
+
+@lru_cache(maxsize=None)
+def default_persona_registry() -> PersonaRegistry:
+    """Process-wide registry of the bundled personas, shared by every host."""
+    return PersonaRegistry()
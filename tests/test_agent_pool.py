@@ -0,0 +1,79 @@
+import asyncio
+import pytest
+from src.agents.pool import AgentPool
+from src.agents.researcher.agent import ResearchAgent
+
+class Worker:
+    pass
+
+@pytest.mark.asyncio
+async def test_instances_are_reused():
+    pool = AgentPool(Worker, size=2)
+    async with pool.acquire() as first:
+        pass
+    async with pool.acquire() as second:
+        assert second is first
+    assert pool.created == 1
+    assert pool.stats["acquisitions"] == 2
+
+@pytest.mark.asyncio
+async def test_pool_bounds_concurrency():
+    pool = AgentPool(Worker, size=2)
+    pool.warm()
+    assert pool.created == 2
+    seen = set()
+
+    async def job():
+        async with pool.acquire() as worker:
+            seen.add(id(worker))
+            await asyncio.sleep(0.02)
+
+    await asyncio.gather(*(job() for _ in range(6)))
+    assert pool.peak_in_use == 2
+    assert pool.waits == 4
+    assert len(seen) == 2 and pool.created == 2
+    assert pool.utilization == 0
+
+def test_pool_size_must_be_positive():
+    with pytest.raises(ValueError):
+        AgentPool(Worker, size=0)
+
+@pytest.mark.asyncio
+async def test_producer_research_uses_warm_agents():
+    from src.agents.producer.agent import ProducerAgent
+    pool = AgentPool(ResearchAgent, size=1, name="research_agents")
+    producer = ProducerAgent(None, research_pool=pool)
+    await asyncio.gather(producer.perform_research("WebRTC"), producer.perform_research("Podcasts"))
+    assert pool.created == 1
+    assert pool.acquisitions == 2
+
+@pytest.mark.asyncio
+async def test_producer_research_runs_on_the_pooled_agent():
+    from src.agents.producer.agent import ProducerAgent
+    researched = []
+
+    class RecordingResearcher(ResearchAgent):
+        async def research(self, topic, fanout, sub_queries=6):
+            researched.append((id(self), topic))
+            return await super().research(topic, fanout, sub_queries)
+
+    pool = AgentPool(RecordingResearcher, size=1, name="research_agents")
+    producer = ProducerAgent(None, research_pool=pool)
+    await producer.perform_research("WebRTC")
+    await producer.perform_research("Podcasts")
+    agent, = pool._idle
+    assert researched == [(id(agent), "WebRTC"), (id(agent), "Podcasts")]
+
+def test_default_research_pool_follows_the_event_loop():
+    from src.agents.producer.agent import ProducerAgent, default_research_pool
+
+    async def contended_research():
+        producer = ProducerAgent(None, research_concurrency=1)
+        await asyncio.gather(producer.perform_research("WebRTC"), producer.perform_research("Podcasts"))
+        return default_research_pool(1)
+
+    # A restarted runtime (or another test) runs on a new loop
+    first = asyncio.run(contended_research())
+    second = asyncio.run(contended_research())
+    assert second is not first
+    assert second.acquisitions == 2
@@ -0,0 +1,110 @@
+import random
+import pytest
+from src.infrastructure.audio_framer import AudioFramer, InboundAudioAggregator
+
+def pcm(start: int, count: int) -> bytes:
+    # Distinct 16-bit samples so misplaced bytes show up
+    return b"".join((i % 30000).to_bytes(2, "little") for i in range(start, start + count))
+
+def drain(framer: AudioFramer) -> bytes:
+    out = bytearray()
+    while (frame := framer.next_frame()) is not None:
+        assert len(frame) == framer.frame_bytes
+        out += frame
+    return bytes(out)
+
+def test_irregular_chunks_become_exact_frames():
+    framer = AudioFramer(sample_rate=24000, frame_ms=20, capacity_ms=100)
+    assert framer.frame_bytes == 960
+    audio = pcm(0, 24000)
+    rng = random.Random(7)
+    out, offset = bytearray(), 0
+    while offset < len(audio):
+        # Odd sizes split samples across chunks
+        size = rng.randint(1, 1501)
+        framer.write(audio[offset:offset + size])
+        offset += size
+        out += drain(framer)
+    assert bytes(out) == audio
+    assert framer.buffered_bytes == 0
+    # The 100 ms ring was wrapped many times without growing
+    assert framer.grows == 0
+
+def test_odd_byte_waits_for_the_rest_of_its_sample():
+    framer = AudioFramer(sample_rate=1000, frame_ms=10)
+    framer.write(pcm(0, 9) + pcm(9, 1)[:1])
+    assert framer.next_frame() is None
+    framer.write(pcm(9, 1)[1:])
+    assert bytes(framer.next_frame()) == pcm(0, 10)
+
+def test_pad_completes_the_last_frame_with_silence():
+    framer = AudioFramer(sample_rate=1000, frame_ms=10)
+    framer.write(pcm(1, 13) + b"\x07")
+    assert bytes(framer.next_frame()) == pcm(1, 10)
+    framer.pad()
+    # The three whole samples are kept, the stray byte can't be played
+    assert bytes(framer.next_frame()) == pcm(11, 3) + bytes(14)
+    assert framer.stats["padded"] == 1 and framer.stats["dropped_bytes"] == 1
+    framer.pad()
+    assert framer.next_frame() is None
+
+def test_frames_are_views_into_the_ring():
+    framer = AudioFramer(sample_rate=1000, frame_ms=10, capacity_ms=20)
+    framer.write(pcm(0, 20))
+    first, second = framer.next_frame(), framer.next_frame()
+    framer.write(pcm(20, 10))
+    # The first slot is reused; no frame objects are created per read
+    assert framer.next_frame() is first
+    assert first.obj is second.obj
+
+def test_ring_grows_instead_of_dropping_audio():
+    framer = AudioFramer(sample_rate=1000, frame_ms=10, capacity_ms=20)
+    framer.write(pcm(0, 15))
+    framer.next_frame()
+    framer.write(pcm(15, 40))
+    assert framer.grows == 1 and framer.capacity % framer.frame_bytes == 0
+    assert drain(framer) == pcm(10, 40)
+    framer.write(pcm(0, 7))
+    # 5 samples short of a frame were left, plus the 7 new ones
+    assert framer.clear() == 24
+    assert framer.buffered_bytes == 0
+
+def test_only_10_and_20_ms_frames():
+    with pytest.raises(ValueError):
+        AudioFramer(frame_ms=15)
+
+def test_inbound_frames_are_packed_into_chunks():
+    aggregator = InboundAudioAggregator(sample_rate=24000, chunk_ms=60)
+    chunks = []
+    for i in range(20):
+        # Frames arrive as int16 views, like rtc.AudioFrame.data
+        chunk = aggregator.push(memoryview(bytearray(pcm(i * 240, 240))).cast("h"))
+        if chunk is not None:
+            chunks.append(chunk)
+    assert [len(chunk) for chunk in chunks] == [2880] * 3
+    assert aggregator.buffered_ms == 20
+    chunks.append(aggregator.flush())
+    assert b"".join(chunks) == pcm(0, 4800)
+    assert aggregator.flush() is None
+    assert aggregator.stats["frames_per_chunk"] == 5
+
+def test_speech_onset_flushes_only_in_adaptive_mode():
+    adaptive = InboundAudioAggregator(sample_rate=24000, chunk_ms=100)
+    steady = InboundAudioAggregator(sample_rate=24000, chunk_ms=100, adaptive=False)
+    for aggregator in (adaptive, steady):
+        aggregator.push(pcm(0, 240))
+        aggregator.push(pcm(240, 240))
+    assert adaptive.speech_started() == pcm(0, 480)
+    assert adaptive.stats["onset_flushes"] == 1
+    assert steady.speech_started() is None
+    assert steady.buffered_ms == 20
+    assert adaptive.speech_started() is None
+
+def test_inbound_chunks_never_split_frames():
+    aggregator = InboundAudioAggregator(sample_rate=24000, chunk_ms=40)
+    assert aggregator.push(pcm(0, 700)) is None
+    # A larger frame than expected still goes out whole
+    assert aggregator.push(pcm(700, 1000)) == pcm(0, 1700)
+    for chunk_ms in (20, 250):
+        with pytest.raises(ValueError):
+            InboundAudioAggregator(chunk_ms=chunk_ms)
@@ -0,0 +1,43 @@
+import pytest
+from src.core.domain import TopicNode, TopicEdge
+from src.infrastructure.codec import (
+    JsonCodec, BinaryCodec, CodecError, get_codec, decode_node, decode_edges, COMPRESSED_CONTENT
+)
+
+NODE = TopicNode(id="n1", label="Intro", content="Key facts. " * 200, metadata={"order": 1, "tags": ["ai"]})
+EDGES = [
+    TopicEdge(source_id="n1", target_id="n2"),
+    TopicEdge(source_id="n1", target_id="n3", condition="sentiment == 'skeptical'"),
+]
+
+@pytest.mark.parametrize("codec", [JsonCodec(), BinaryCodec()])
+def test_round_trip(codec):
+    assert decode_node(codec.encode_node(NODE)) == NODE
+    assert decode_edges(codec.encode_edges(EDGES)) == EDGES
+    assert decode_edges(codec.encode_edges([])) == []
+
+def test_binary_compresses_large_content():
+    payload = BinaryCodec().encode_node(NODE)
+    assert payload[3] & COMPRESSED_CONTENT
+    assert len(payload) < len(JsonCodec().encode_node(NODE)) / 5
+
+    small = TopicNode(id="n2", label="Body", content="Short")
+    assert not BinaryCodec().encode_node(small)[3] & COMPRESSED_CONTENT
+    assert decode_node(BinaryCodec().encode_node(small)) == small
+
+def test_reads_legacy_json_strings():
+    # Payloads written by agents that predate the codec
+    assert decode_node(NODE.model_dump_json()) == NODE
+    assert decode_edges('[{"source_id": "a", "target_id": "b"}]')[0].target_id == "b"
+
+def test_rejects_unknown_or_corrupt_payloads():
+    payload = bytearray(BinaryCodec().encode_node(NODE))
+    payload[2] = 99
+    with pytest.raises(CodecError):
+        decode_node(bytes(payload))
+    with pytest.raises(CodecError):
+        decode_node(BinaryCodec().encode_node(NODE)[:20])
+    with pytest.raises(CodecError):
+        decode_node(BinaryCodec().encode_edges(EDGES))
+    with pytest.raises(ValueError):
+        get_codec("xml")
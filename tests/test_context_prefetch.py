@@ -0,0 +1,68 @@
+import asyncio
+import pytest
+from src.core.domain import TopicGraph, TopicNode, TopicEdge
+from src.infrastructure.memory_store import InMemoryStateStore
+from src.agents.universal_host.context import ContextPrefetcher
+
+class CountingStore(InMemoryStateStore):
+    def __init__(self):
+        super().__init__()
+        self.reads = []
+
+    async def get_topic_graph(self, node_ids=None):
+        self.reads.append(list(node_ids) if node_ids else None)
+        return await super().get_topic_graph(node_ids=node_ids)
+
+async def make_store():
+    store = CountingStore()
+    await store.set_topic_graph(TopicGraph(
+        nodes=[TopicNode(id=i, label=i.title(), content=f"{i} facts") for i in ["intro", "debate", "outro", "bonus"]],
+        edges=[
+            TopicEdge(source_id="intro", target_id="debate", condition="sentiment == skeptical"),
+            TopicEdge(source_id="intro", target_id="outro"),
+            TopicEdge(source_id="debate", target_id="bonus"),
+        ],
+        current_node_id="intro",
+    ))
+    store.reads.clear()
+    return store
+
+@pytest.mark.asyncio
+async def test_successors_are_prepared_ahead():
+    store = await make_store()
+    prefetcher = ContextPrefetcher(store)
+    prefetcher.prefetch_from("intro")
+    await asyncio.gather(*prefetcher._tasks)
+
+    # Only subset reads: the node itself, then its successors
+    assert store.reads == [["intro"], ["debate", "outro"]]
+    context = await prefetcher.get("debate")
+    assert context.text == "Current Topic: Debate\nKey Facts: debate facts"
+    assert prefetcher.stats == {"prepared": 2, "hits": 1, "misses": 0}
+    assert len(store.reads) == 2
+
+@pytest.mark.asyncio
+async def test_get_waits_for_in_flight_prefetch():
+    store = await make_store()
+    prefetcher = ContextPrefetcher(store)
+    prefetcher.prefetch_from("intro")
+    # Not awaited: the transition arrives while the prefetch is still running
+    context = await prefetcher.get("outro")
+    assert context.node_id == "outro"
+    assert prefetcher.hits == 1 and prefetcher.misses == 0
+    await prefetcher.close()
+
+@pytest.mark.asyncio
+async def test_miss_renders_on_demand_and_clear_drops_stale():
+    store = await make_store()
+    prefetcher = ContextPrefetcher(store)
+    context = await prefetcher.get("bonus")
+    assert context.label == "Bonus"
+    assert prefetcher.misses == 1
+
+    prefetcher.prefetch_from("intro")
+    # A rewrite lands before the prefetch finishes; its results must not be kept
+    prefetcher.clear()
+    await asyncio.gather(*prefetcher._tasks)
+    assert prefetcher.stats["prepared"] == 0
+    assert await prefetcher.get("missing") is None
@@ -1,8 +1,9 @@
 import pytest
 import asyncio
 from unittest.mock import AsyncMock, patch, MagicMock
-from src.core.domain import TopicGraph, TopicNode
+from src.core.domain import TopicGraph, TopicNode, TopicEdge
 from src.infrastructure.redis_store import RedisStateStore
+from redis.exceptions import NoScriptError
 import json
 
 @pytest.mark.asyncio
@@ -19,27 +20,77 @@ async def test_domain_models():
 
 @pytest.mark.asyncio
 async def test_redis_store_set_get():
-    """Test RedisStateStore logic using mocks."""
+    """Test RedisStateStore per-node layout using mocks."""
     # Mock redis connection
     mock_client = AsyncMock()
+    mock_pipe = MagicMock()
+    mock_pipe.execute = AsyncMock()
+    mock_client.pipeline = MagicMock(return_value=mock_pipe)
 
     with patch("redis.asyncio.from_url", return_value=mock_client):
         store = RedisStateStore()
 
         node = TopicNode(id="1", label="Test", content="Content")
-        graph = TopicGraph(nodes=[node], current_node_id="1")
+        node2 = TopicNode(id="2", label="Next", content="More")
+        edge = TopicEdge(source_id="1", target_id="2")
+        graph = TopicGraph(nodes=[node, node2], edges=[edge], current_node_id="1")
 
-        # Test Set
+        # Test Set: nodes, edges and pointer are written separately in one transaction
+        mock_pipe.execute.return_value = [1, 2, 2, 2, True, 3]
         await store.set_topic_graph(graph)
-        mock_client.set.assert_called_once()
-        args, _ = mock_client.set.call_args
-        assert args[0] == "topic_graph"
-        assert json.loads(args[1]) == graph.model_dump(mode='json')
+        mock_client.pipeline.assert_called_with(transaction=True)
+        _, kwargs = mock_pipe.hset.call_args_list[0]
+        assert json.loads(kwargs["mapping"]["1"]) == node.model_dump(mode='json')
+        _, kwargs = mock_pipe.hset.call_args_list[1]
+        assert json.loads(kwargs["mapping"]["1"]) == [edge.model_dump(mode='json')]
+        mock_pipe.rpush.assert_called_with("podcaster:{default}:topic_graph:order", "1", "2")
+        mock_pipe.set.assert_called_with("podcaster:{default}:topic_graph:current", "1")
+        mock_pipe.incr.assert_called_with("podcaster:{default}:topic_graph:version")
+        mock_client.publish.assert_called_with("podcaster:{default}:TOPIC_GRAPH_UPDATED", json.dumps({"version": 3, "kind": "graph"}))
 
         # Test Get
-        mock_client.get.return_value = graph.model_dump_json()
+        mock_pipe.execute.return_value = [
+            ["1", "2"],
+            {"1": node.model_dump_json(), "2": node2.model_dump_json()},
+            {"1": json.dumps([edge.model_dump(mode='json')])},
+            "1",
+        ]
         retrieved = await store.get_topic_graph()
-        assert retrieved.nodes[0].id == "1"
+        assert [n.id for n in retrieved.nodes] == ["1", "2"]
+        assert retrieved.edges[0].target_id == "2"
+        assert retrieved.current_node_id == "1"
+
+        # Test Get subset
+        mock_pipe.execute.return_value = [[node2.model_dump_json()], [None], "1"]
+        subset = await store.get_topic_graph(node_ids=["2"])
+        mock_pipe.hmget.assert_any_call("podcaster:{default}:topic_graph:nodes", ["2"])
+        assert [n.id for n in subset.nodes] == ["2"]
+        assert subset.edges == []
+
+@pytest.mark.asyncio
+async def test_update_current_node():
+    """Test that node moves are a single server-side script call."""
+    mock_client = AsyncMock()
+
+    with patch("redis.asyncio.from_url", return_value=mock_client):
+        store = RedisStateStore()
+
+        mock_client.evalsha.return_value = 7
+        assert await store.update_current_node("2", expected_node_id="1") is True
+        args, _ = mock_client.evalsha.call_args
+        assert args[0] == store.scripts.sha("move_node")
+        assert args[1:] == (
+            3, "podcaster:{default}:topic_graph:nodes", "podcaster:{default}:topic_graph:current", "podcaster:{default}:topic_graph:version",
+            "2", "1", "podcaster:{default}:TOPIC_GRAPH_UPDATED"
+        )
+        mock_client.get.assert_not_called()
+        mock_client.set.assert_not_called()
+
+        # Compare-and-set miss / unknown node
+        mock_client.evalsha.return_value = 0
+        assert await store.update_current_node("3", expected_node_id="1") is False
+        mock_client.evalsha.return_value = -1
+        assert await store.update_current_node("missing") is False
 
 @pytest.mark.asyncio
 async def test_acquire_talking_stick():
@@ -49,14 +100,17 @@ async def test_acquire_talking_stick():
     with patch("redis.asyncio.from_url", return_value=mock_client):
         store = RedisStateStore()
 
-        # Scenario 1: Success
-        mock_client.set.return_value = True
+        # Scenario 1: Success, through the queue-aware script without queueing
+        mock_client.evalsha.return_value = 1
         result = await store.acquire_talking_stick("agent1")
         assert result is True
-        mock_client.set.assert_called_with("talking_stick", "agent1", nx=True, ex=5)
+        args, _ = mock_client.evalsha.call_args
+        assert args[0] == store.scripts.sha("stick_acquire")
+        assert args[6:] == ("podcaster:{default}:talking_stick:wake:", "agent1", 5000, 0, 0)
+        mock_client.set.assert_not_called()
 
-        # Scenario 2: Failure (Lock held by someone else)
-        mock_client.set.return_value = None # redis-py returns None if NX fails
+        # Scenario 2: Failure (Lock held by someone else, or waiters queued)
+        mock_client.evalsha.return_value = 0
         result = await store.acquire_talking_stick("agent2")
         assert result is False
 
@@ -69,4 +123,85 @@ async def test_release_talking_stick():
         store = RedisStateStore()
 
         await store.release_talking_stick("agent1")
-        mock_client.eval.assert_called_once()
+        mock_client.evalsha.assert_called_once()
+        mock_client.eval.assert_not_called()
+        args, _ = mock_client.evalsha.call_args
+        assert args[0] == store.scripts.sha("stick_handoff")
+
+@pytest.mark.asyncio
+async def test_scripts_reload_after_noscript():
+    """Test that a Redis restart (empty script cache) is handled transparently."""
+    mock_client = AsyncMock()
+    mock_pipe = MagicMock()
+    mock_pipe.execute = AsyncMock()
+    mock_client.pipeline = MagicMock(return_value=mock_pipe)
+
+    with patch("redis.asyncio.from_url", return_value=mock_client):
+        store = RedisStateStore()
+
+        await store.connect()
+        assert mock_pipe.script_load.call_count == 7
+
+        mock_client.evalsha.side_effect = [NoScriptError("NOSCRIPT"), 1]
+        assert await store.renew_talking_stick("agent1") is True
+        assert mock_client.evalsha.call_count == 2
+        assert mock_pipe.script_load.call_count == 14
+        assert store.scripts.reloads == 1
+
+@pytest.mark.asyncio
+async def test_wait_for_talking_stick_blocks_on_wake_list():
+    """Test that a queued waiter blocks on its wake list instead of polling."""
+    mock_client = AsyncMock()
+
+    with patch("redis.asyncio.from_url", return_value=mock_client):
+        store = RedisStateStore()
+
+        # Queued on the first attempt, then woken by the holder's handoff
+        mock_client.evalsha.return_value = 0
+        mock_pipe = MagicMock()
+        mock_client.pipeline = MagicMock(return_value=mock_pipe)
+        # Granted at server time 1000.000s, woken at 1000.004s; the client clock plays no part
+        mock_pipe.execute = AsyncMock(return_value=[
+            ["podcaster:{default}:talking_stick:wake:agent2", "1000000"], [1000, 4000],
+        ])
+        assert await store.wait_for_talking_stick("agent2", ttl=5, priority=1) is True
+        mock_client.evalsha.assert_called_once()
+        args, _ = mock_client.evalsha.call_args
+        prefix = "podcaster:{default}:talking_stick"
+        assert args[1:6] == (4, prefix, f"{prefix}:queue", f"{prefix}:waiters", f"{prefix}:seq")
+        assert args[6:10] == (f"{prefix}:wake:", "agent2", 5000, 1)
+        mock_pipe.blpop.assert_called_once_with([f"{prefix}:wake:agent2"], timeout=5)
+        mock_pipe.time.assert_called_once()
+
+        metrics = store.turn_metrics.summary()
+        assert metrics["acquired"] == 1
+        assert metrics["contention_rate"] == 1.0
+        assert metrics["handoff"]["count"] == 1
+        assert store.turn_metrics.handoff.percentile(50) == pytest.approx(0.004)
+
+        # Handoff returns the new holder
+        mock_client.evalsha.return_value = "agent3"
+        assert await store.handoff_talking_stick("agent2", "agent3") == "agent3"
+        mock_client.evalsha.return_value = ""
+        assert await store.handoff_talking_stick("agent3") is None
+
+@pytest.mark.asyncio
+async def test_episode_keyspace():
+    """Test that every key of an episode shares one cluster hash tag."""
+    mock_client = AsyncMock()
+
+    with patch("redis.asyncio.from_url", return_value=mock_client):
+        store = RedisStateStore(episode_id="ep-42")
+        other = store.for_episode("ep-43")
+
+        assert store.nodes_key == "podcaster:{ep-42}:topic_graph:nodes"
+        assert other.stick_key == "podcaster:{ep-43}:talking_stick"
+        assert other.client is store.client
+
+        await other.add_to_stream("conversation_stream", {"event": "TURN"})
+        mock_client.xadd.assert_called_with("podcaster:{ep-43}:conversation_stream", {"event": "TURN"})
+        await store.publish_event("EPISODE_READY", {"initial_node": "1"})
+        mock_client.publish.assert_called_with("podcaster:{ep-42}:EPISODE_READY", json.dumps({"initial_node": "1"}))
+
+        with pytest.raises(ValueError):
+            store.for_episode("bad}id")
@@ -0,0 +1,191 @@
+import pytest
+import asyncio
+import json
+from src.core.interfaces import StateStore
+from src.core.domain import TopicGraph, TopicNode
+from src.infrastructure.graph_cache import CachedStateStore
+
+class FakePubSub:
+    def __init__(self):
+        self.queue = asyncio.Queue()
+
+    async def listen(self):
+        while True:
+            yield await self.queue.get()
+
+    async def close(self):
+        pass
+
+# Versioned store that counts backend reads
+class CountingStateStore(StateStore):
+    def __init__(self, graph: TopicGraph):
+        self.graph = graph
+        self.version = 1
+        self.reads = 0
+        self.pubsub = FakePubSub()
+
+    def announce(self, message: dict):
+        self.pubsub.queue.put_nowait({"type": "message", "data": json.dumps(message)})
+
+    async def set_topic_graph(self, graph):
+        self.graph = graph
+        self.version += 1
+        self.announce({"version": self.version, "kind": "graph"})
+
+    async def get_topic_graph(self, node_ids=None):
+        self.reads += 1
+        return self.graph
+
+    async def get_topic_graph_version(self):
+        return self.version
+
+    async def update_current_node(self, node_id, expected_node_id=None):
+        self.graph = self.graph.model_copy(update={"current_node_id": node_id})
+        self.version += 1
+        self.announce({"version": self.version, "kind": "move", "current_node_id": node_id})
+        return True
+
+    async def acquire_talking_stick(self, agent_id, timeout=5):
+        return True
+
+    async def release_talking_stick(self, agent_id):
+        pass
+
+    async def wait_for_talking_stick(self, agent_id, ttl=5, priority=0, timeout=None):
+        return True
+
+    async def renew_talking_stick(self, agent_id, ttl=5):
+        return True
+
+    async def handoff_talking_stick(self, agent_id, to_agent_id=None):
+        return None
+
+    async def publish_event(self, channel, message):
+        pass
+
+    async def add_to_stream(self, stream_key, fields):
+        return "mock-id"
+
+    def read_stream(self, stream_key, group, consumer, **kwargs):
+        raise NotImplementedError
+
+    async def ack_stream(self, stream_key, group, *entry_ids):
+        return 0
+
+    async def claim_stream(self, stream_key, group, consumer, *entry_ids):
+        return 0
+
+    async def create_stream_group(self, stream_key, group):
+        pass
+
+    async def create_record(self, key, fields):
+        return True
+
+    async def update_record(self, key, fields):
+        pass
+
+    async def get_record(self, key):
+        return None
+
+    async def subscribe_to_channel(self, channel):
+        assert channel == StateStore.TOPIC_GRAPH_CHANNEL
+        return self.pubsub
+
+def make_graph():
+    return TopicGraph(
+        nodes=[TopicNode(id="1", label="Intro", content="Welcome"), TopicNode(id="2", label="Body", content="Content")],
+        current_node_id="1",
+    )
+
+@pytest.mark.asyncio
+async def test_cache_hits_until_invalidated():
+    backend = CountingStateStore(make_graph())
+    cache = CachedStateStore(backend)
+
+    for _ in range(10):
+        graph = await cache.get_topic_graph()
+    assert graph.current_node_id == "1"
+    assert backend.reads == 1
+    assert cache.hits == 9 and cache.misses == 1
+
+    # A node move is patched in place without a refetch
+    await backend.update_current_node("2")
+    await asyncio.sleep(0)
+    assert (await cache.get_current_node()).id == "2"
+    assert backend.reads == 1
+    # Graphs handed out earlier are not mutated
+    assert graph.current_node_id == "1"
+
+    # A full rewrite forces exactly one refetch
+    await backend.set_topic_graph(make_graph())
+    await asyncio.sleep(0)
+    await cache.get_topic_graph()
+    await cache.get_topic_graph()
+    assert backend.reads == 2
+    assert cache.invalidations == 2
+
+    await cache.stop()
+
+class RacingStateStore(CountingStateStore):
+    """Moves the current node while a graph read is in flight."""
+
+    move_during_read = None
+
+    async def get_topic_graph(self, node_ids=None):
+        graph = await super().get_topic_graph(node_ids)
+        if self.move_during_read:
+            node_id, self.move_during_read = self.move_during_read, None
+            await self.update_current_node(node_id)
+            # The cache's listener sees the move before the read returns
+            await asyncio.sleep(0.01)
+        return graph
+
+@pytest.mark.asyncio
+async def test_move_during_refetch_is_not_lost():
+    backend = RacingStateStore(make_graph())
+    cache = CachedStateStore(backend)
+    await cache.get_topic_graph()
+
+    # Stale at the current version, e.g. after a resubscribe
+    await cache.stop()
+    backend.move_during_read = "2"
+    # The refetch returns the graph from before the move...
+    assert (await cache.get_topic_graph()).current_node_id == "1"
+    # ...but doesn't cache it over the move
+    assert (await cache.get_topic_graph()).current_node_id == "2"
+    assert (await cache.get_current_node()).id == "2"
+    assert backend.reads == 3
+    await cache.stop()
+
+@pytest.mark.asyncio
+async def test_cache_without_subscription_checks_version():
+    backend = CountingStateStore(make_graph())
+    cache = CachedStateStore(backend, subscribe=False)
+
+    await cache.get_topic_graph()
+    await cache.get_topic_graph()
+    assert backend.reads == 1
+
+    await backend.update_current_node("2")
+    graph = await cache.get_topic_graph()
+    assert graph.current_node_id == "2"
+    assert backend.reads == 2
+
+@pytest.mark.asyncio
+async def test_index_is_reused_across_moves():
+    backend = CountingStateStore(make_graph())
+    cache = CachedStateStore(backend)
+
+    index = await cache.get_topic_index()
+    assert index.node("2").label == "Body"
+    assert await cache.get_topic_index() is index
+
+    await backend.update_current_node("2")
+    await asyncio.sleep(0)
+    assert await cache.get_topic_index() is index
+    assert index.graph.current_node_id == "2"
+
+    await backend.set_topic_graph(make_graph())
+    await asyncio.sleep(0)
+    assert await cache.get_topic_index() is not index
+    await cache.stop()
@@ -0,0 +1,50 @@
+from src.core.domain import TopicGraph, TopicNode, TopicEdge
+from src.core.graph_index import TopicGraphIndex
+
+def make_graph(edges, current_node_id="a", ids="abcd"):
+    return TopicGraph(
+        nodes=[TopicNode(id=i, label=i.upper(), content="") for i in ids],
+        edges=[TopicEdge(source_id=s, target_id=t) for s, t in edges],
+        current_node_id=current_node_id,
+    )
+
+def test_lookups_and_adjacency():
+    index = TopicGraphIndex(make_graph([("a", "b"), ("a", "c"), ("c", "d"), ("b", "d")]))
+    assert len(index) == 4 and "c" in index and "z" not in index
+    assert index.node("c").label == "C"
+    assert index.node("z") is None
+    assert [n.id for n in index.successors("a")] == ["b", "c"]
+    assert [e.source_id for e in index.edges_to("d")] == ["c", "b"]
+    assert index.edges_from("d") == []
+    assert index.reachable() == {"a", "b", "c", "d"}
+    assert index.reachable("c") == {"c", "d"}
+
+def test_integrity_report():
+    graph = make_graph([("a", "b"), ("b", "a"), ("b", "x"), ("c", "d"), ("d", "c")])
+    report = TopicGraphIndex(graph).check()
+    assert not report.ok
+    assert [(e.source_id, e.target_id) for e in report.dangling_edges] == [("b", "x")]
+    assert report.unreachable == ["c", "d"]
+    assert sorted(sorted(c) for c in report.cycles) == [["a", "b"], ["c", "d"]]
+    assert any("cycle" in w for w in report.warnings)
+
+    report = TopicGraphIndex(make_graph([("a", "b")], current_node_id="missing")).check()
+    assert report.missing_start and not report.ok
+
+    graph = make_graph([("a", "b"), ("b", "c"), ("c", "d")])
+    graph.nodes.append(TopicNode(id="a", label="Again", content=""))
+    report = TopicGraphIndex(graph).check()
+    assert report.duplicate_ids == ["a"]
+
+    clean = TopicGraphIndex(make_graph([("a", "b"), ("b", "c"), ("c", "d")])).check()
+    assert clean.ok and not clean.warnings
+
+def test_large_chain_is_linear():
+    ids = [f"n{i}" for i in range(20000)]
+    graph = TopicGraph(
+        nodes=[TopicNode(id=i, label=i, content="") for i in ids],
+        edges=[TopicEdge(source_id=a, target_id=b) for a, b in zip(ids, ids[1:])] + [TopicEdge(source_id=ids[-1], target_id=ids[0])],
+    )
+    report = TopicGraphIndex(graph).check()
+    assert not report.unreachable
+    assert len(report.cycles) == 1 and len(report.cycles[0]) == 20000
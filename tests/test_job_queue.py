@@ -0,0 +1,184 @@
+import time
+import asyncio
+import pytest
+from src.core.domain import StreamEntry, TopicGraph, TopicNode
+from src.infrastructure.memory_store import InMemoryStateStore
+from src.infrastructure.job_queue import PlanningJobQueue, PlanningWorkerPool
+
+async def plan(job, store, report):
+    await report(0.5, "halfway")
+    await asyncio.sleep(0.05)
+    await store.set_topic_graph(TopicGraph(nodes=[TopicNode(id="intro", label=job.topic, content="")], current_node_id="intro"))
+
+async def wait_for_status(queue, job_ids, statuses=("succeeded", "failed"), timeout=3):
+    deadline = time.monotonic() + timeout
+    while True:
+        jobs = [await queue.get(job_id) for job_id in job_ids]
+        if all(job.status in statuses for job in jobs):
+            return jobs
+        assert time.monotonic() < deadline, [job.status for job in jobs]
+        await asyncio.sleep(0.01)
+
+@pytest.mark.asyncio
+async def test_submit_is_idempotent():
+    queue = PlanningJobQueue(InMemoryStateStore())
+    job = await queue.submit("WebRTC", job_id="nightly-webrtc")
+    again = await queue.submit("Something else", job_id="nightly-webrtc")
+    assert again.topic == "WebRTC" and again.status == "queued"
+    assert job.episode_id == "nightly-webrtc"
+
+@pytest.mark.asyncio
+async def test_workers_run_jobs_concurrently_into_episode_namespaces():
+    store = InMemoryStateStore()
+    queue = PlanningJobQueue(store)
+    # Submitted before any worker exists
+    jobs = [await queue.submit(f"topic {i}") for i in range(8)]
+    pool = PlanningWorkerPool(queue, plan, workers=4)
+    runner = asyncio.create_task(pool.run())
+    started = time.perf_counter()
+    done = await wait_for_status(queue, [job.id for job in jobs])
+    elapsed = time.perf_counter() - started
+    runner.cancel()
+    await asyncio.gather(runner, return_exceptions=True)
+
+    assert all(job.status == "succeeded" and job.progress == 1.0 for job in done)
+    # 8 jobs of 50ms on 4 workers run in two waves
+    assert elapsed < 0.3
+    for job in jobs:
+        graph = await store.for_episode(job.episode_id).get_topic_graph()
+        assert graph.nodes[0].label == job.topic
+    assert pool.stats["succeeded"] == 8
+
+@pytest.mark.asyncio
+async def test_failed_attempts_are_retried_then_given_up():
+    attempts = {}
+
+    async def flaky(job, store, report):
+        attempts[job.topic] = attempts.get(job.topic, 0) + 1
+        if job.topic == "broken" or attempts[job.topic] < 2:
+            raise ConnectionError("model unavailable")
+        await plan(job, store, report)
+
+    queue = PlanningJobQueue(InMemoryStateStore())
+    flaky_job = await queue.submit("flaky")
+    broken_job = await queue.submit("broken")
+    pool = PlanningWorkerPool(queue, flaky, workers=2, max_attempts=3)
+    runner = asyncio.create_task(pool.run())
+    flaky_done, broken_done = await wait_for_status(queue, [flaky_job.id, broken_job.id])
+    runner.cancel()
+    await asyncio.gather(runner, return_exceptions=True)
+
+    assert flaky_done.status == "succeeded" and flaky_done.attempts == 2
+    assert broken_done.status == "failed" and broken_done.attempts == 3
+    assert broken_done.error == "model unavailable"
+    assert attempts == {"flaky": 2, "broken": 3}
+
+@pytest.mark.asyncio
+async def test_retried_attempt_starts_from_an_empty_graph():
+    async def partial(job, store, report):
+        attempt = job.attempts + 1
+        # Plans are published node by node; the first attempt dies halfway
+        await store.upsert_topic_nodes([TopicNode(id=f"a{attempt}-intro", label="Intro", content="")], current_node_id=f"a{attempt}-intro")
+        if attempt == 1:
+            raise ConnectionError("model unavailable")
+        await store.upsert_topic_nodes([TopicNode(id=f"a{attempt}-body", label="Body", content="")])
+
+    store = InMemoryStateStore()
+    queue = PlanningJobQueue(store)
+    job = await queue.submit("WebRTC")
+    pool = PlanningWorkerPool(queue, partial, workers=1, max_attempts=2)
+    runner = asyncio.create_task(pool.run())
+    done, = await wait_for_status(queue, [job.id])
+    runner.cancel()
+    await asyncio.gather(runner, return_exceptions=True)
+
+    assert done.status == "succeeded" and done.attempts == 2
+    graph = await store.for_episode(job.episode_id).get_topic_graph()
+    assert [node.id for node in graph.nodes] == ["a2-intro", "a2-body"]
+    assert graph.current_node_id == "a2-intro"
+
+@pytest.mark.asyncio
+async def test_jobs_of_a_dead_worker_are_restarted_elsewhere():
+    runs = []
+
+    async def slow(job, store, report):
+        runs.append(job.attempts)
+        await asyncio.sleep(10 if len(runs) == 1 else 0)
+
+    store = InMemoryStateStore()
+    queue = PlanningJobQueue(store)
+    job = await queue.submit("WebRTC")
+    first = PlanningWorkerPool(queue, slow, workers=1, consumer="a", heartbeat_interval=0.05)
+    dying = asyncio.create_task(first.run())
+    await wait_for_status(queue, [job.id], statuses=("running",))
+    # The process dies: its job stays pending and stops heartbeating
+    dying.cancel()
+    await asyncio.gather(dying, return_exceptions=True)
+
+    second = PlanningWorkerPool(queue, slow, workers=1, consumer="b", heartbeat_interval=0.05)
+    runner = asyncio.create_task(second.run())
+    done, = await wait_for_status(queue, [job.id])
+    runner.cancel()
+    await asyncio.gather(runner, return_exceptions=True)
+
+    assert done.status == "succeeded"
+    assert done.worker == "b" and done.attempts == 2
+
+@pytest.mark.asyncio
+async def test_long_jobs_keep_their_entry_and_duplicates_are_acked():
+    async def long(job, store, report):
+        await asyncio.sleep(0.5)
+
+    store = InMemoryStateStore()
+    queue = PlanningJobQueue(store)
+    job = await queue.submit("WebRTC")
+    pools = [PlanningWorkerPool(queue, long, workers=1, consumer=name, heartbeat_interval=0.05) for name in "ab"]
+    runners = [asyncio.create_task(pool.run()) for pool in pools]
+    await wait_for_status(queue, [job.id], statuses=("running",))
+    # A duplicate entry of a job that is running elsewhere
+    await queue.requeue(job.id)
+    done, = await wait_for_status(queue, [job.id])
+    for runner in runners:
+        runner.cancel()
+    await asyncio.gather(*runners, return_exceptions=True)
+
+    # Running well past stale_after, the job was neither restarted nor passed around
+    assert done.status == "succeeded" and done.attempts == 1
+    assert sum(pool.stats["skipped"] for pool in pools) == 1
+    assert queue.store._stream(queue.STREAM).groups[queue.GROUP].pending == {}
+
+@pytest.mark.asyncio
+async def test_running_attempts_entry_is_not_acked_by_another_worker():
+    async def long(job, store, report):
+        await asyncio.sleep(10)
+
+    store = InMemoryStateStore()
+    queue = PlanningJobQueue(store)
+    job = await queue.submit("WebRTC")
+    pool = PlanningWorkerPool(queue, long, workers=1, consumer="a")
+    runner = asyncio.create_task(pool.run())
+    running, = await wait_for_status(queue, [job.id], statuses=("running",))
+    # The entry reaches a second worker while "a" still runs it (e.g. claimed during a missed heartbeat)
+    other = PlanningWorkerPool(queue, long, workers=1, consumer="b")
+    await other._process(StreamEntry(stream=queue.STREAM, id=running.entry_id, fields={"job_id": job.id}))
+    pending = queue.store._stream(queue.STREAM).groups[queue.GROUP].pending
+    runner.cancel()
+    await asyncio.gather(runner, return_exceptions=True)
+
+    assert other.stats["skipped"] == 1
+    # Still pending, so "a" keeps heartbeating it and it is restarted if "a" dies
+    assert running.entry_id in pending
+
+@pytest.mark.asyncio
+async def test_job_timeout_fails_the_attempt():
+    async def hang(job, store, report):
+        await asyncio.sleep(10)
+
+    queue = PlanningJobQueue(InMemoryStateStore())
+    job = await queue.submit("WebRTC")
+    pool = PlanningWorkerPool(queue, hang, workers=1, max_attempts=1, job_timeout=0.05)
+    runner = asyncio.create_task(pool.run())
+    done, = await wait_for_status(queue, [job.id])
+    runner.cancel()
+    await asyncio.gather(runner, return_exceptions=True)
+    assert done.status == "failed" and done.error == "TimeoutError"
@@ -0,0 +1,85 @@
+import json
+import os
+import asyncio
+import pytest
+from pydantic import ValidationError
+from src.personas.registry import PersonaRegistry
+
+def write_persona(directory, persona_id, name, mtime_ns=None, **fields):
+    path = directory / f"{persona_id}.json"
+    data = {"id": persona_id, "name": name, "voice_id": "v1", "system_prompt": "prompt", "a2a_id": persona_id, **fields}
+    path.write_text(json.dumps(data))
+    if mtime_ns is not None:
+        # Filesystems with coarse timestamps would otherwise hide quick edits
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+    return path
+
+def test_bundled_personas_load_independent_of_cwd(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    registry = PersonaRegistry()
+    assert registry.load() >= 1
+    persona = registry.get("host_sascha")
+    assert persona.name == "Sascha"
+    # One shared, immutable object for every host using it
+    assert registry.get("host_sascha") is persona
+    with pytest.raises(ValidationError):
+        persona.name = "Someone else"
+    assert registry.stats["load_p50_ms"] > 0
+
+def test_scan_reloads_only_changed_files(tmp_path):
+    write_persona(tmp_path, "ada", "Ada", mtime_ns=1_000_000_000)
+    write_persona(tmp_path, "bo", "Bo", mtime_ns=1_000_000_000)
+    (tmp_path / "notes.txt").write_text("not a persona")
+    registry = PersonaRegistry(str(tmp_path))
+    assert registry.load() == 2
+    assert registry.ids() == ["ada", "bo"]
+    bo = registry.get("bo")
+
+    reads = registry.load_time.count
+    assert registry.scan() == []
+    assert registry.load_time.count == reads
+
+    write_persona(tmp_path, "ada", "Ada Lovelace", mtime_ns=2_000_000_000)
+    assert registry.scan() == ["ada"]
+    assert registry.get("ada").name == "Ada Lovelace"
+    assert registry.get("bo") is bo
+    assert registry.load_time.count == reads + 1
+    assert registry.stats["reloads"] == 1
+
+    # A broken edit keeps the last good version and is not retried until it changes
+    (tmp_path / "bo.json").write_text("{not json")
+    assert registry.scan() == []
+    assert registry.get("bo") is bo
+    assert registry.scan() == []
+    assert registry.stats["errors"] == 1
+
+    os.remove(tmp_path / "ada.json")
+    assert registry.scan() == ["ada"]
+    assert "ada" not in registry
+    assert registry.get("ada") is None
+
+def test_unknown_and_invalid_personas(tmp_path):
+    registry = PersonaRegistry(str(tmp_path))
+    registry.load()
+    assert registry.get("missing") is None
+    # Files added after the last scan are loaded on first use
+    write_persona(tmp_path, "late", "Late")
+    assert registry.get("late").name == "Late"
+    write_persona(tmp_path, "loud", "Loud", interruption_sensitivity=3.0)
+    with pytest.raises(ValidationError):
+        registry.get("loud")
+
+@pytest.mark.asyncio
+async def test_watch_picks_up_new_personas(tmp_path):
+    registry = PersonaRegistry(str(tmp_path))
+    registry.load()
+    registry.watch(interval=0.01)
+    try:
+        write_persona(tmp_path, "nova", "Nova")
+        for _ in range(200):
+            if "nova" in registry:
+                break
+            await asyncio.sleep(0.01)
+        assert registry.get("nova").name == "Nova"
+    finally:
+        await registry.stop()
@@ -14,11 +14,11 @@ class MockStateStore(StateStore):
     async def set_topic_graph(self, graph: TopicGraph) -> None:
         self.graph = graph
 
-    async def get_topic_graph(self):
+    async def get_topic_graph(self, node_ids=None):
         return self.graph
 
-    async def update_current_node(self, node_id: str) -> None:
-        pass
+    async def update_current_node(self, node_id: str, expected_node_id=None) -> bool:
+        return True
 
     async def acquire_talking_stick(self, agent_id: str, timeout: int = 5) -> bool:
         return True
@@ -26,9 +26,39 @@ class MockStateStore(StateStore):
     async def release_talking_stick(self, agent_id: str) -> None:
         pass
 
+    async def wait_for_talking_stick(self, agent_id, ttl=5, priority=0, timeout=None):
+        return True
+
+    async def renew_talking_stick(self, agent_id, ttl=5):
+        return True
+
+    async def handoff_talking_stick(self, agent_id, to_agent_id=None):
+        return None
+
     async def publish_event(self, channel: str, message: dict) -> None:
         self.events.append((channel, message))
 
+    def read_stream(self, stream_key, group, consumer, **kwargs):
+        raise NotImplementedError
+
+    async def ack_stream(self, stream_key, group, *entry_ids):
+        return 0
+
+    async def claim_stream(self, stream_key, group, consumer, *entry_ids):
+        return 0
+
+    async def create_stream_group(self, stream_key, group):
+        pass
+
+    async def create_record(self, key, fields):
+        return True
+
+    async def update_record(self, key, fields):
+        pass
+
+    async def get_record(self, key):
+        return None
+
     async def subscribe_to_channel(self, channel: str):
         pass
 
@@ -36,22 +66,13 @@ class MockStateStore(StateStore):
         return "mock-id"
         pass
 
-# Dummy Agent to bypass strict initialization
-class DummyAgent:
-    def __init__(self, state_store):
-        self.state_store = state_store
-        self.model = "test-model"
-
 @pytest.mark.asyncio
 async def test_producer_tools():
     store = MockStateStore()
-
-    # We create a dummy instance and bind the ProducerAgent methods to it manually
-    agent = DummyAgent(store)
+    agent = ProducerAgent(store, streaming=False)
 
     # Test perform_research logic
-    # perform_research is defined on ProducerAgent. Since we didn't inherit, we call it unbound passing 'agent' as self.
-    summary_json = ProducerAgent.perform_research(agent, "WebRTC")
+    summary_json = await agent.perform_research("WebRTC")
 
     print(f"Summary: {summary_json}")
     # The summary is a JSON string containing key_facts
@@ -72,17 +93,102 @@ async def test_producer_tools():
         "current_node_id": "1"
     }
 
-    # We call finalize_episode, which is synchronous but spawns an async task using get_running_loop()
-    # Since pytest-asyncio runs the test in a loop, get_running_loop() should work.
-    result = ProducerAgent.finalize_episode(agent, graph_data)
+    # The episode is stored and announced by the time the tool returns
+    result = await agent.finalize_episode(graph_data)
     print(f"Result: {result}")
     assert "published" in result
 
-    # Allow the background task spawned by create_task to run
-    await asyncio.sleep(0.1)
-
     assert store.graph is not None
     assert len(store.graph.nodes) == 5
     assert len(store.events) > 0
     assert store.events[0][0] == "EPISODE_READY"
     assert store.events[0][1]["initial_node"] == "1"
+
+@pytest.mark.asyncio
+async def test_finalize_episode_rejects_broken_graph():
+    store = MockStateStore()
+    agent = ProducerAgent(store, streaming=False)
+
+    graph_data = {
+        "nodes": [{"id": "1", "label": "Intro", "content": "Welcome"}],
+        "edges": [{"source_id": "1", "target_id": "2"}],
+        "current_node_id": "1"
+    }
+    result = await agent.finalize_episode(graph_data)
+    assert result.startswith("Error validating graph")
+    assert "missing node" in result
+    assert store.graph is None
+
+class FailingStateStore(MockStateStore):
+    def __init__(self, delay=0.0):
+        super().__init__()
+        self.delay = delay
+
+    async def set_topic_graph(self, graph: TopicGraph) -> None:
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        raise ConnectionError("store unavailable")
+
+@pytest.mark.asyncio
+async def test_finalize_episode_surfaces_store_failures():
+    graph_data = {"nodes": [{"id": "1", "label": "Intro", "content": "Welcome"}], "current_node_id": "1"}
+
+    store = FailingStateStore()
+    with pytest.raises(ConnectionError):
+        await ProducerAgent(store, streaming=False).finalize_episode(graph_data)
+    assert store.events == []
+
+    # A hung store fails the call instead of blocking the producer
+    slow = FailingStateStore(delay=5)
+    with pytest.raises(asyncio.TimeoutError):
+        await ProducerAgent(slow, streaming=False, publish_timeout=0.05).finalize_episode(graph_data)
+
+@pytest.mark.asyncio
+async def test_streaming_plan_goes_live_on_first_node():
+    from src.infrastructure.memory_store import InMemoryStateStore
+    store = InMemoryStateStore()
+    ready = await store.subscribe_to_channel("EPISODE_READY")
+    producer = ProducerAgent(store)
+
+    result = await producer.publish_topic_node(
+        {"id": "1", "label": "Intro", "content": "Welcome"},
+        [{"source_id": "1", "target_id": "2"}, {"source_id": "1", "target_id": "3", "condition": "sentiment == skeptical"}],
+    )
+    assert "episode is live" in result
+    # Hosts can start while the rest of the plan is still being written
+    message = await asyncio.wait_for(ready.listen().__anext__(), 1)
+    assert json.loads(message["data"])["initial_node"] == "1"
+    assert (await store.get_current_node()).id == "1"
+
+    result = await producer.publish_topic_node({"id": "2", "label": "Body", "content": "Content"})
+    assert result == "Published 'Body'."
+    assert (await producer.publish_topic_node({"id": "x"})).startswith("Error validating node")
+    # Node 3 is referenced but was never published
+    assert (await producer.complete_episode()).startswith("Error validating graph")
+
+    await producer.publish_topic_node({"id": "3", "label": "Debate", "content": "Pushback"}, [{"source_id": "3", "target_id": "2"}])
+    assert await producer.complete_episode() == "Episode complete with 3 topics."
+    assert [n.id for n in (await store.get_topic_graph()).nodes] == ["1", "2", "3"]
+    assert (await store.get_current_node()).id == "1"
+    await ready.close()
+
+@pytest.mark.asyncio
+async def test_rerun_plan_replaces_the_previous_attempt():
+    from src.infrastructure.memory_store import InMemoryStateStore
+    from src.agents.producer.publisher import StreamingEpisodePublisher
+    store = InMemoryStateStore()
+
+    first = StreamingEpisodePublisher(store)
+    await first.add({"id": "a1", "label": "Intro", "content": "Welcome"}, [{"source_id": "a1", "target_id": "a2"}])
+    await first.add({"id": "a2", "label": "Body", "content": "Content"})
+
+    # A retried plan starts over instead of merging into the partial one
+    second = StreamingEpisodePublisher(store)
+    await second.add({"id": "b1", "label": "Intro", "content": "Welcome"}, [{"source_id": "b1", "target_id": "b2"}])
+    await second.add({"id": "b2", "label": "Body", "content": "Content"})
+
+    graph = await store.get_topic_graph()
+    assert [n.id for n in graph.nodes] == ["b1", "b2"]
+    assert [(e.source_id, e.target_id) for e in graph.edges] == [("b1", "b2")]
+    assert graph.current_node_id == "b1"
+    assert (await second.finish()).ok
@@ -0,0 +1,110 @@
+import pytest
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+from src.infrastructure.pubsub import PubSubMultiplexer, DROP_OLDEST, DROP_NEWEST
+
+class FakeRedisPubSub:
+    def __init__(self):
+        self.incoming = asyncio.Queue()
+        self.subscribe = AsyncMock()
+        self.unsubscribe = AsyncMock()
+        self.aclose = AsyncMock()
+
+    async def get_message(self, ignore_subscribe_messages=False, timeout=0.0):
+        return await self.incoming.get()
+
+    def publish(self, channel, data):
+        self.incoming.put_nowait({"type": "message", "channel": channel, "data": data})
+
+@pytest.fixture
+def redis_pubsub():
+    return FakeRedisPubSub()
+
+@pytest.fixture
+def mux(redis_pubsub):
+    client = MagicMock()
+    client.pubsub = MagicMock(return_value=redis_pubsub)
+    return PubSubMultiplexer(client, maxsize=2)
+
+@pytest.mark.asyncio
+async def test_one_connection_many_consumers(mux, redis_pubsub):
+    first = await mux.subscribe("EPISODE_READY")
+    second = await mux.subscribe("EPISODE_READY")
+    other = await mux.subscribe("TOPIC_GRAPH_UPDATED")
+
+    # One server-side subscription per channel, one connection overall
+    mux.client.pubsub.assert_called_once()
+    assert redis_pubsub.subscribe.await_count == 2
+
+    redis_pubsub.publish("EPISODE_READY", "go")
+    async for message in first.listen():
+        assert message["data"] == "go"
+        break
+    assert (await second.__anext__())["data"] == "go"
+    assert other.queue.empty()
+
+    # The channel is only unsubscribed when its last consumer leaves
+    await first.close()
+    redis_pubsub.unsubscribe.assert_not_awaited()
+    await second.close()
+    redis_pubsub.unsubscribe.assert_awaited_once_with("EPISODE_READY")
+
+    await mux.close()
+    redis_pubsub.aclose.assert_awaited_once()
+
+@pytest.mark.asyncio
+async def test_slow_consumer_policies(mux, redis_pubsub):
+    oldest = await mux.subscribe("events", policy=DROP_OLDEST)
+    newest = await mux.subscribe("events", policy=DROP_NEWEST)
+
+    for i in range(5):
+        redis_pubsub.publish("events", str(i))
+    await asyncio.sleep(0.01)
+
+    assert [oldest.queue.get_nowait()["data"] for _ in range(2)] == ["3", "4"]
+    assert [newest.queue.get_nowait()["data"] for _ in range(2)] == ["0", "1"]
+    assert oldest.dropped == 3 and newest.dropped == 3
+    assert mux.stats["dropped"] == 6
+
+    await mux.close()
+
+@pytest.mark.asyncio
+async def test_failed_subscribe_is_retried(mux, redis_pubsub):
+    redis_pubsub.subscribe.side_effect = [ConnectionError("connection lost"), None]
+    with pytest.raises(ConnectionError):
+        await mux.subscribe("events")
+    assert mux.stats["channels"] == 0
+
+    # The next consumer subscribes on the server instead of joining an empty channel
+    subscription = await mux.subscribe("events")
+    assert redis_pubsub.subscribe.await_count == 2
+    redis_pubsub.publish("events", "hello")
+    assert (await asyncio.wait_for(subscription.__anext__(), 1))["data"] == "hello"
+    await mux.close()
+
+@pytest.mark.asyncio
+async def test_close_wakes_a_waiting_consumer(mux, redis_pubsub):
+    subscription = await mux.subscribe("events")
+    received = []
+
+    async def consume():
+        async for message in subscription.listen():
+            received.append(message)
+
+    consumer = asyncio.create_task(consume())
+    await asyncio.sleep(0.01)
+    await subscription.close()
+    await asyncio.wait_for(consumer, 1)
+    assert received == []
+
+    # Closing the multiplexer ends the consumers still subscribed
+    remaining = await mux.subscribe("events")
+    consumer = asyncio.create_task(remaining.__anext__())
+    await asyncio.sleep(0.01)
+    await mux.close()
+    with pytest.raises(StopAsyncIteration):
+        await asyncio.wait_for(consumer, 1)
+
+def test_unknown_policy(mux):
+    with pytest.raises(ValueError):
+        asyncio.run(mux.subscribe("events", policy="explode"))
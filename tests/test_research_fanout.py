@@ -0,0 +1,83 @@
+import time
+import asyncio
+import httpx
+import pytest
+from src.core.interfaces import SearchProvider
+from src.agents.researcher.fanout import ResearchFanout, plan_sub_queries
+from src.infrastructure.search import HttpSearchProvider
+
+class SlowSearch(SearchProvider):
+    """Answers after a per-query delay and tracks how many searches overlap."""
+
+    def __init__(self, delays=None, default_delay=0.05, fail=()):
+        self.delays = delays or {}
+        self.default_delay = default_delay
+        self.fail = fail
+        self.in_flight = 0
+        self.peak = 0
+
+    async def search(self, query):
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            await asyncio.sleep(self.delays.get(query, self.default_delay))
+            if query in self.fail:
+                raise ConnectionError(query)
+            slug = query.replace(" ", "-")
+            return [
+                {"title": query, "snippet": f"{query} #1", "url": f"https://example.com/{slug}/1"},
+                {"title": query, "snippet": "shared", "url": "https://example.com/shared"},
+            ]
+        finally:
+            self.in_flight -= 1
+
+def test_plan_sub_queries():
+    queries = plan_sub_queries("WebRTC", 3)
+    assert queries == [("facts", "WebRTC"), ("counter", "WebRTC criticism"), ("news", "WebRTC latest news")]
+
+@pytest.mark.asyncio
+async def test_research_takes_as_long_as_the_slowest_query():
+    provider = SlowSearch(delays={"WebRTC history": 0.2}, default_delay=0.1)
+    fanout = ResearchFanout(provider, concurrency=6)
+    started = time.perf_counter()
+    summary = await fanout.research("WebRTC", 6)
+    elapsed = time.perf_counter() - started
+
+    # Six queries of 0.1-0.2s would take 0.7s one after another
+    assert elapsed < 0.4
+    assert provider.peak == 6
+    assert summary.key_facts[:2] == ["WebRTC #1", "WebRTC latest news #1"]
+    assert summary.conflicting_views[0] == "WebRTC criticism #1"
+    # The shared result is kept once
+    assert summary.primary_sources.count("https://example.com/shared") == 1
+    assert fanout.latency.count == 6
+
+@pytest.mark.asyncio
+async def test_concurrency_limit_and_partial_failures():
+    provider = SlowSearch(delays={"AI criticism": 5}, fail={"AI latest news"})
+    fanout = ResearchFanout(provider, concurrency=2, query_timeout=0.2)
+    summary = await fanout.research("AI", 4)
+
+    assert provider.peak == 2
+    # The hung and the failing query are skipped
+    assert fanout.failures == 2
+    assert summary.conflicting_views == []
+    assert "AI explained #1" in summary.key_facts
+
+@pytest.mark.asyncio
+async def test_research_fails_when_every_query_fails():
+    provider = SlowSearch(default_delay=0, fail={"AI", "AI criticism"})
+    with pytest.raises(RuntimeError):
+        await ResearchFanout(provider).research("AI", 2)
+
+@pytest.mark.asyncio
+async def test_http_search_provider_maps_results():
+    def handler(request):
+        assert request.url.params["q"] == "webrtc"
+        assert request.url.params["key"] == "secret"
+        return httpx.Response(200, json={"items": [{"title": "T", "snippet": "S", "link": "https://a"}]})
+
+    provider = HttpSearchProvider("https://search.test/api", params={"key": "secret"})
+    provider.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    assert await provider.search("webrtc") == [{"title": "T", "snippet": "S", "url": "https://a"}]
+    await provider.close()
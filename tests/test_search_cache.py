@@ -0,0 +1,131 @@
+import time
+import asyncio
+import pytest
+from src.core.interfaces import SearchProvider
+from src.infrastructure.search_cache import CachedSearchProvider, normalize_query
+
+class CountingSearch(SearchProvider):
+    def __init__(self, delay=0.0, fail=False, empty=False):
+        self.calls = []
+        self.delay = delay
+        self.fail = fail
+        self.empty = empty
+
+    async def search(self, query):
+        self.calls.append(query)
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise ConnectionError("search backend down")
+        return [] if self.empty else [{"title": query, "snippet": query, "url": f"https://example.com/{len(self.calls)}"}]
+
+class DictRedis:
+    """The handful of redis.asyncio calls the shared tier uses, over a dict."""
+
+    def __init__(self):
+        self.data = {}
+
+    async def get(self, key):
+        entry = self.data.get(key)
+        return entry[0] if entry and entry[1] > time.monotonic() else None
+
+    async def ttl(self, key):
+        entry = self.data.get(key)
+        return int(entry[1] - time.monotonic()) if entry else -2
+
+    async def set(self, key, value, ex):
+        self.data[key] = (value, time.monotonic() + ex)
+
+    def pipeline(self, transaction=True):
+        redis, calls = self, []
+
+        class Pipeline:
+            def get(self, key):
+                calls.append(redis.get(key))
+
+            def ttl(self, key):
+                calls.append(redis.ttl(key))
+
+            async def execute(self):
+                return [await call for call in calls]
+        return Pipeline()
+
+def test_normalize_query():
+    assert normalize_query("  WebRTC:  the Future?! ") == "webrtc: the future"
+    assert normalize_query("webrtc the future") == normalize_query("WEBRTC  the future.")
+    # Symbols that change the meaning of a query change its key
+    assert len({normalize_query(q) for q in ["C++", "C#", "C", "C++?"]}) == 3
+    assert normalize_query("node.js") == "node.js"
+
+@pytest.mark.asyncio
+async def test_local_hits_and_expiry():
+    backend = CountingSearch()
+    cache = CachedSearchProvider(backend, ttl=0.1)
+    first = await cache.search("WebRTC news")
+    assert await cache.search("webrtc  NEWS!") is first
+    assert backend.calls == ["WebRTC news"]
+
+    await asyncio.sleep(0.15)
+    await cache.search("WebRTC news")
+    assert len(backend.calls) == 2
+    assert cache.stats["local_hits"] == 1 and cache.stats["misses"] == 2
+
+@pytest.mark.asyncio
+async def test_lru_eviction_and_empty_ttl():
+    backend = CountingSearch()
+    cache = CachedSearchProvider(backend, max_entries=2)
+    for query in ["a", "b", "a", "c"]:
+        await cache.search(query)
+    # "b" was least recently used when "c" arrived
+    await cache.search("b")
+    assert backend.calls == ["a", "b", "c", "b"]
+
+    empty = CountingSearch(empty=True)
+    cache = CachedSearchProvider(empty, empty_ttl=0.05)
+    await cache.search("nothing")
+    await asyncio.sleep(0.1)
+    await cache.search("nothing")
+    assert len(empty.calls) == 2
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_queries_share_one_call():
+    backend = CountingSearch(delay=0.05)
+    cache = CachedSearchProvider(backend)
+    results = await asyncio.gather(*(cache.search(q) for q in ["AI"] * 9 + ["ai!"]))
+    assert len(backend.calls) == 1
+    assert all(r is results[0] for r in results)
+    assert cache.stats["coalesced"] == 9
+
+@pytest.mark.asyncio
+async def test_failures_reach_every_caller_and_are_not_cached():
+    backend = CountingSearch(delay=0.02, fail=True)
+    cache = CachedSearchProvider(backend)
+    results = await asyncio.gather(cache.search("AI"), cache.search("AI"), return_exceptions=True)
+    assert all(isinstance(r, ConnectionError) for r in results)
+    backend.fail = False
+    assert await cache.search("AI")
+    assert len(backend.calls) == 2
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_does_not_cancel_shared_lookup():
+    backend = CountingSearch(delay=0.05)
+    cache = CachedSearchProvider(backend)
+    first = asyncio.create_task(cache.search("AI"))
+    second = asyncio.create_task(cache.search("AI"))
+    await asyncio.sleep(0.01)
+    first.cancel()
+    assert await second
+    assert len(backend.calls) == 1
+
+@pytest.mark.asyncio
+async def test_shared_tier_serves_other_processes():
+    redis = DictRedis()
+    backend = CountingSearch()
+    producer_a = CachedSearchProvider(backend, redis_client=redis)
+    producer_b = CachedSearchProvider(backend, redis_client=redis)
+    results = await producer_a.search("WebRTC")
+    assert await producer_b.search("webrtc") == results
+    assert backend.calls == ["WebRTC"]
+    assert producer_b.stats["shared_hits"] == 1
+    # Now local to producer_b as well
+    await producer_b.search("WebRTC")
+    assert producer_b.stats["local_hits"] == 1
@@ -0,0 +1,309 @@
+import os
+import uuid
+import time
+import json
+import shutil
+import socket
+import asyncio
+import subprocess
+import pytest
+import pytest_asyncio
+from src.core.domain import TopicGraph, TopicNode, TopicEdge
+from src.core.interfaces import StateStore
+from src.infrastructure.memory_store import InMemoryStateStore
+from src.infrastructure.redis_store import RedisStateStore
+
+# Shared semantics every StateStore backend must provide. The Redis backend runs
+# against REDIS_TEST_URL, or a throwaway redis-server when one is on the PATH.
+
+@pytest.fixture(scope="module")
+def redis_url():
+    url = os.environ.get("REDIS_TEST_URL")
+    if url:
+        yield url
+        return
+    binary = shutil.which("redis-server")
+    if not binary:
+        pytest.skip("redis-server not available")
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    process = subprocess.Popen(
+        [binary, "--port", str(port), "--save", "", "--appendonly", "no"],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        deadline = time.monotonic() + 5
+        while True:
+            try:
+                socket.create_connection(("127.0.0.1", port), timeout=0.1).close()
+                break
+            except OSError:
+                if time.monotonic() > deadline:
+                    raise
+                time.sleep(0.05)
+        yield f"redis://127.0.0.1:{port}/0"
+    finally:
+        process.terminate()
+        process.wait()
+
+@pytest_asyncio.fixture(params=["memory", "redis", "redis-binary"])
+async def store(request):
+    episode_id = f"contract-{uuid.uuid4().hex[:8]}"
+    if request.param == "memory":
+        backend = InMemoryStateStore(episode_id=episode_id, stream_maxlen=50)
+    else:
+        url = request.getfixturevalue("redis_url")
+        codec = "binary" if request.param == "redis-binary" else "json"
+        backend = RedisStateStore(
+            url, episode_id=episode_id, stream_maxlen=50, stream_flush_interval=0.01,
+            codec=codec, trusted_reads=codec == "binary",
+        )
+    await backend.connect()
+    yield backend
+    await backend.close()
+
+def make_graph():
+    return TopicGraph(
+        nodes=[
+            TopicNode(id="intro", label="Intro", content="Welcome"),
+            TopicNode(id="body", label="Body", content="Content"),
+            TopicNode(id="outro", label="Outro", content="Bye"),
+        ],
+        edges=[
+            TopicEdge(source_id="intro", target_id="body"),
+            TopicEdge(source_id="body", target_id="outro", condition="time > 10"),
+        ],
+        current_node_id="intro",
+    )
+
+async def next_message(listener, timeout=2):
+    message = await asyncio.wait_for(listener.listen().__anext__(), timeout)
+    return json.loads(message["data"])
+
+@pytest.mark.asyncio
+async def test_topic_graph_round_trip(store):
+    assert await store.get_topic_graph() is None
+    graph = make_graph()
+    await store.set_topic_graph(graph)
+
+    loaded = await store.get_topic_graph()
+    assert [n.id for n in loaded.nodes] == ["intro", "body", "outro"]
+    assert loaded.edges == graph.edges
+    assert (await store.get_current_node()).id == "intro"
+
+    subset = await store.get_topic_graph(node_ids=["body", "missing"])
+    assert [n.id for n in subset.nodes] == ["body"]
+    assert [e.target_id for e in subset.edges] == ["outro"]
+
+@pytest.mark.asyncio
+async def test_graph_versions_and_invalidation(store):
+    listener = await store.subscribe_to_channel(StateStore.TOPIC_GRAPH_CHANNEL)
+    await store.set_topic_graph(make_graph())
+    version = await store.get_topic_graph_version()
+    assert await next_message(listener) == {"version": version, "kind": "graph"}
+
+    assert await store.update_current_node("body", expected_node_id="intro")
+    assert await next_message(listener) == {"version": version + 1, "kind": "move", "current_node_id": "body"}
+    # Compare-and-set miss and unknown node leave the graph untouched
+    assert not await store.update_current_node("outro", expected_node_id="intro")
+    assert not await store.update_current_node("nowhere")
+    assert await store.get_topic_graph_version() == version + 1
+    assert (await store.get_current_node()).id == "body"
+    await listener.close()
+
+@pytest.mark.asyncio
+async def test_upsert_topic_nodes(store):
+    listener = await store.subscribe_to_channel(StateStore.TOPIC_GRAPH_CHANNEL)
+    intro = TopicNode(id="intro", label="Intro", content="Welcome")
+    # The opening node may point at topics that are still being planned
+    await store.upsert_topic_nodes([intro], [TopicEdge(source_id="intro", target_id="body")], current_node_id="intro")
+    version = await store.get_topic_graph_version()
+    assert await next_message(listener) == {"version": version, "kind": "nodes", "node_ids": ["intro"]}
+    assert (await store.get_current_node()).id == "intro"
+
+    await store.upsert_topic_nodes(
+        [TopicNode(id="body", label="Body", content="Content"), TopicNode(id="intro", label="Intro", content="Hello")],
+        [TopicEdge(source_id="intro", target_id="body"), TopicEdge(source_id="intro", target_id="outro", condition="time > 10")],
+    )
+    graph = await store.get_topic_graph()
+    # Replaced nodes keep their position, duplicate edges are dropped
+    assert [(n.id, n.content) for n in graph.nodes] == [("intro", "Hello"), ("body", "Content")]
+    assert [e.target_id for e in graph.edges] == ["body", "outro"]
+    assert graph.current_node_id == "intro"
+    assert await store.get_topic_graph_version() == version + 1
+    await listener.close()
+
+@pytest.mark.asyncio
+async def test_talking_stick_lease(store):
+    assert await store.acquire_talking_stick("a", timeout=1)
+    assert not await store.acquire_talking_stick("b", timeout=1)
+    assert await store.renew_talking_stick("a", ttl=1)
+    assert not await store.renew_talking_stick("b", ttl=1)
+
+    # Only the holder can release
+    await store.release_talking_stick("b")
+    assert not await store.acquire_talking_stick("b", timeout=1)
+    await store.release_talking_stick("a")
+    assert await store.acquire_talking_stick("b", timeout=1)
+    await store.release_talking_stick("b")
+
+@pytest.mark.asyncio
+async def test_talking_stick_acquire_respects_waiters(store):
+    assert await store.wait_for_talking_stick("expiring", ttl=0.2)
+    waiter = asyncio.create_task(store.wait_for_talking_stick("queued", ttl=5, timeout=3))
+    await asyncio.sleep(0.3)
+    # The lease ran out, but a caller that never queued doesn't jump the waiter
+    assert not await store.acquire_talking_stick("eager", timeout=1)
+    assert await asyncio.wait_for(waiter, 3)
+    assert not await store.acquire_talking_stick("eager", timeout=1)
+    await store.release_talking_stick("queued")
+    assert await store.acquire_talking_stick("eager", timeout=1)
+    await store.release_talking_stick("eager")
+
+@pytest.mark.asyncio
+async def test_talking_stick_queue_order(store):
+    assert await store.wait_for_talking_stick("holder", ttl=5)
+    order = []
+
+    async def waiter(agent_id, priority):
+        assert await store.wait_for_talking_stick(agent_id, ttl=5, priority=priority, timeout=5)
+        order.append(agent_id)
+
+    tasks = []
+    for agent_id, priority in [("low-1", 0), ("low-2", 0), ("high", 1)]:
+        tasks.append(asyncio.create_task(waiter(agent_id, priority)))
+        await asyncio.sleep(0.05)
+
+    # Higher priority first, FIFO within a priority
+    holder = "holder"
+    for expected in ["high", "low-1", "low-2"]:
+        assert await store.handoff_talking_stick(holder) == expected
+        await asyncio.sleep(0.05)
+        holder = expected
+    await asyncio.gather(*tasks)
+    assert order == ["high", "low-1", "low-2"]
+    assert await store.handoff_talking_stick(holder) is None
+    assert store.turn_metrics.contended == 3
+
+@pytest.mark.asyncio
+async def test_talking_stick_handoff_and_timeout(store):
+    assert await store.wait_for_talking_stick("holder", ttl=5)
+    first = asyncio.create_task(store.wait_for_talking_stick("first", ttl=5, timeout=5))
+    await asyncio.sleep(0.05)
+    target = asyncio.create_task(store.wait_for_talking_stick("target", ttl=5, timeout=5))
+    await asyncio.sleep(0.05)
+
+    # A named handoff skips the queue
+    assert await store.handoff_talking_stick("holder", to_agent_id="target") == "target"
+    assert await target
+    assert not first.done()
+
+    assert not await store.wait_for_talking_stick("late", ttl=5, timeout=0.2)
+    assert store.turn_metrics.timeouts == 1
+    # The timed-out waiter left the queue
+    assert await store.handoff_talking_stick("target") == "first"
+    assert await first
+
+@pytest.mark.asyncio
+async def test_talking_stick_expired_lease_passes_on(store):
+    assert await store.wait_for_talking_stick("crashed", ttl=0.3)
+    started = time.monotonic()
+    # Waiters notice an abandoned stick within one of their own leases at the latest
+    assert await store.wait_for_talking_stick("next", ttl=1, timeout=3)
+    assert time.monotonic() - started < 2
+
+@pytest.mark.asyncio
+async def test_pubsub_fan_out_and_episode_scope(store):
+    first = await store.subscribe_to_channel("EVENTS")
+    second = await store.subscribe_to_channel("EVENTS")
+    other = await store.for_episode(f"{store.episode_id}-other").subscribe_to_channel("EVENTS")
+    await asyncio.sleep(0.05)
+
+    await store.publish_event("EVENTS", {"type": "ping"})
+    assert await next_message(first) == {"type": "ping"}
+    assert await next_message(second) == {"type": "ping"}
+    with pytest.raises(asyncio.TimeoutError):
+        await next_message(other, timeout=0.2)
+    for listener in (first, second, other):
+        await listener.close()
+
+@pytest.mark.asyncio
+async def test_stream_consumer_group(store):
+    reader = store.read_stream("conversation_stream", "hosts", "host-1", block_ms=100, claim_idle_ms=None)
+    # The group starts at the tail, created by the first read
+    pending = asyncio.ensure_future(reader.__anext__())
+    await asyncio.sleep(0.1)
+
+    entry_id = await store.add_to_stream("conversation_stream", {"type": "text", "metadata": {"n": 1}, "turn": 3})
+    entry = await asyncio.wait_for(pending, 2)
+    assert entry.id == entry_id
+    assert entry.fields == {"type": "text", "metadata": '{"n": 1}', "turn": "3"}
+
+    await store.queue_stream_entry("conversation_stream", {"type": "queued"})
+    entry = await asyncio.wait_for(reader.__anext__(), 2)
+    assert entry.fields["type"] == "queued"
+
+    assert await store.ack_stream("conversation_stream", "hosts", entry_id) == 1
+    assert await store.ack_stream("conversation_stream", "hosts", entry_id) == 0
+    await reader.close()
+
+    # Unacknowledged entries are replayed to the same consumer
+    reader = store.read_stream("conversation_stream", "hosts", "host-1", block_ms=100, claim_idle_ms=None)
+    entry = await asyncio.wait_for(reader.__anext__(), 2)
+    assert entry.fields["type"] == "queued"
+    assert await reader.ack(entry.id) == 1
+    await reader.close()
+
+@pytest.mark.asyncio
+async def test_stream_claims_from_dead_consumer(store):
+    dead = store.read_stream("jobs", "workers", "dead", block_ms=100, claim_idle_ms=None)
+    pending = asyncio.ensure_future(dead.__anext__())
+    await asyncio.sleep(0.1)
+    await store.add_to_stream("jobs", {"job": "1"})
+    lost = await asyncio.wait_for(pending, 2)
+    await dead.close()
+
+    await asyncio.sleep(0.2)
+    alive = store.read_stream("jobs", "workers", "alive", block_ms=100, claim_idle_ms=100)
+    claimed = await asyncio.wait_for(alive.__anext__(), 2)
+    assert claimed.id == lost.id
+    assert await alive.ack(claimed.id) == 1
+    await alive.close()
+
+@pytest.mark.asyncio
+async def test_claimed_entries_stay_with_a_busy_consumer(store):
+    busy = store.read_stream("jobs", "workers", "busy", block_ms=100, claim_idle_ms=None)
+    await store.add_to_stream("jobs", {"job": "1"})
+    held = await asyncio.wait_for(busy.__anext__(), 2)
+    await asyncio.sleep(0.2)
+    # Still working on it: resetting the idle time keeps other consumers off it
+    assert await store.claim_stream("jobs", "workers", "busy", held.id) == 1
+    other = store.read_stream("jobs", "workers", "other", block_ms=100, claim_idle_ms=150)
+    with pytest.raises(asyncio.TimeoutError):
+        await asyncio.wait_for(other.__anext__(), 0.1)
+    assert await store.ack_stream("jobs", "workers", held.id) == 1
+    assert await store.claim_stream("jobs", "workers", "busy", held.id) == 0
+    await busy.close()
+    await other.close()
+
+@pytest.mark.asyncio
+async def test_stream_group_created_ahead_of_consumers(store):
+    await store.create_stream_group("planning", "planners")
+    # Idempotent, and entries added before the first reader are kept for the group
+    await store.create_stream_group("planning", "planners")
+    await store.add_to_stream("planning", {"job_id": "1"})
+    reader = store.read_stream("planning", "planners", "worker", block_ms=100, claim_idle_ms=None)
+    entry = await asyncio.wait_for(reader.__anext__(), 2)
+    assert entry.fields["job_id"] == "1"
+    await reader.close()
+
+@pytest.mark.asyncio
+async def test_records(store):
+    assert await store.get_record("job:1") is None
+    assert await store.create_record("job:1", {"status": "queued", "attempts": 0})
+    assert not await store.create_record("job:1", {"status": "other"})
+    await store.update_record("job:1", {"status": "running", "progress": 0.5})
+    assert await store.get_record("job:1") == {"status": "running", "attempts": "0", "progress": "0.5"}
+    # Records are scoped to the episode like every other key
+    assert await store.for_episode("elsewhere").get_record("job:1") is None
@@ -0,0 +1,103 @@
+import pytest
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+from redis.exceptions import ResponseError
+from src.infrastructure.stream_reader import StreamGroupReader
+
+def make_client(batches):
+    """Mock client whose XREADGROUP returns the given batches, then blocks."""
+    client = MagicMock()
+    client.xgroup_create = AsyncMock(side_effect=ResponseError("BUSYGROUP Consumer Group name already exists"))
+    client.xack = AsyncMock(side_effect=lambda stream, group, *ids: len(ids))
+    client.xautoclaim = AsyncMock(return_value=["0-0", [("1-0", {"event": "claimed"})], []])
+    pending = list(batches)
+
+    async def xreadgroup(group, consumer, streams, count=None, block=None):
+        if pending:
+            return [["conversation_stream", pending.pop(0)[:count]]]
+        await asyncio.sleep(block / 1000 if block else 0)
+        return []
+
+    client.xreadgroup = AsyncMock(side_effect=xreadgroup)
+    return client
+
+@pytest.mark.asyncio
+async def test_reader_claims_reads_and_acks():
+    client = make_client([
+        [],  # nothing left pending for this consumer
+        [("2-0", {"event": "INTERRUPTION"}), ("3-0", {"event": "TURN"})],
+    ])
+    reader = StreamGroupReader(client, "conversation_stream", "producer", "p1", count=10, block_ms=50, prefetch=5, claim_idle_ms=1000)
+
+    entries = []
+    async for entry in reader:
+        entries.append(entry)
+        await reader.ack(entry.id)
+        if len(entries) == 3:
+            break
+
+    # Entries claimed from a dead consumer come first, then new ones
+    assert [e.id for e in entries] == ["1-0", "2-0", "3-0"]
+    assert entries[1].fields == {"event": "INTERRUPTION"}
+    client.xautoclaim.assert_awaited_with(
+        "conversation_stream", "producer", "p1", 1000, start_id="0-0", count=5
+    )
+    # Blocking reads of new entries use ">" with COUNT bounded by the prefetch window
+    _, kwargs = client.xreadgroup.call_args_list[1]
+    assert kwargs["block"] == 50
+    assert reader.stats["acked"] == 3 and reader.stats["claimed"] == 1
+
+    await reader.close()
+
+@pytest.mark.asyncio
+async def test_reader_surfaces_startup_errors():
+    client = make_client([])
+    client.xgroup_create = AsyncMock(side_effect=ResponseError("WRONGTYPE"))
+    reader = StreamGroupReader(client, "conversation_stream", "producer", "p1")
+
+    with pytest.raises(ResponseError):
+        async for _ in reader:
+            pass
+
+def entries(start, n):
+    return [(f"{i}-0", {"event": "TURN"}) for i in range(start, start + n)]
+
+@pytest.mark.asyncio
+async def test_reader_reads_no_more_than_the_free_window():
+    client = make_client([[], entries(1, 5), entries(6, 5)])
+    reader = StreamGroupReader(client, "conversation_stream", "producer", "p1", count=10, block_ms=50, prefetch=2, claim_idle_ms=None)
+    reader.start()
+    await asyncio.sleep(0.05)
+    # The buffer is full, so no further XREADGROUP is issued
+    assert [call.kwargs["count"] for call in client.xreadgroup.call_args_list] == [2, 2]
+    assert reader.stats["buffered"] == 2
+
+    await reader.__anext__()
+    await asyncio.sleep(0.05)
+    assert client.xreadgroup.call_args_list[-1].kwargs["count"] == 1
+    assert reader.stats["buffered"] == 2
+    await reader.close()
+
+@pytest.mark.asyncio
+async def test_reader_without_prefetch_reads_only_on_demand():
+    client = make_client([[], entries(1, 5)])
+    reader = StreamGroupReader(client, "conversation_stream", "producer", "p1", count=10, block_ms=50, prefetch=0, claim_idle_ms=None)
+    reader.start()
+    await asyncio.sleep(0.05)
+    client.xreadgroup.assert_not_awaited()
+
+    entry = await reader.__anext__()
+    assert entry.id == "1-0"
+    assert [call.kwargs["count"] for call in client.xreadgroup.call_args_list] == [1, 1]
+    await asyncio.sleep(0.05)
+    assert client.xreadgroup.await_count == 2 and reader.stats["buffered"] == 0
+    await reader.close()
+
+@pytest.mark.asyncio
+async def test_reader_refills_after_a_waiting_consumer_takes_an_entry():
+    client = make_client([[], entries(1, 1), entries(2, 1)])
+    reader = StreamGroupReader(client, "conversation_stream", "producer", "p1", count=10, block_ms=50, prefetch=1, claim_idle_ms=None)
+    assert (await reader.__anext__()).id == "1-0"
+    await asyncio.sleep(0.05)
+    assert reader.stats["buffered"] == 1
+    await reader.close()
@@ -0,0 +1,59 @@
+import pytest
+import asyncio
+import json
+from unittest.mock import AsyncMock, MagicMock
+from src.infrastructure.stream_writer import StreamBatchWriter, encode_stream_fields
+
+@pytest.fixture
+def mock_client():
+    client = MagicMock()
+    client.pipelines = []
+
+    def make_pipeline(transaction=True):
+        pipe = MagicMock()
+        pipe.execute = AsyncMock()
+        client.pipelines.append(pipe)
+        return pipe
+
+    client.pipeline = MagicMock(side_effect=make_pipeline)
+    return client
+
+def test_encode_stream_fields():
+    encoded = encode_stream_fields({"event": "INTERRUPTION", "metadata": {"last_token_index": 0}})
+    assert encoded["event"] == "INTERRUPTION"
+    assert json.loads(encoded["metadata"]) == {"last_token_index": 0}
+
+@pytest.mark.asyncio
+async def test_flush_on_batch_size(mock_client):
+    writer = StreamBatchWriter(mock_client, max_batch=3, max_delay=10, maxlen=500)
+
+    for i in range(3):
+        await writer.add("conversation_stream", {"i": i})
+    await asyncio.sleep(0.01)
+
+    # One pipelined round-trip for the full batch, with approximate trimming
+    assert len(mock_client.pipelines) == 1
+    pipe = mock_client.pipelines[0]
+    assert pipe.xadd.call_count == 3
+    pipe.xadd.assert_called_with("conversation_stream", {"i": 2}, maxlen=500, approximate=True)
+    pipe.execute.assert_awaited_once()
+    assert writer.stats["entries_written"] == 3
+
+    await writer.close()
+
+@pytest.mark.asyncio
+async def test_flush_on_interval_and_close(mock_client):
+    writer = StreamBatchWriter(mock_client, max_batch=100, max_delay=0.01)
+
+    await writer.add("conversation_stream", {"event": "A"})
+    assert writer.pending == 1
+    await asyncio.sleep(0.05)
+    assert writer.pending == 0
+    assert len(mock_client.pipelines) == 1
+
+    # close() drains whatever is still buffered
+    await writer.add("conversation_stream", {"event": "B"})
+    await writer.close()
+    assert writer.stats["entries_written"] == 2
+    with pytest.raises(RuntimeError):
+        await writer.add("conversation_stream", {"event": "C"})
@@ -0,0 +1,62 @@
+import pytest
+from src.core.domain import TopicGraph, TopicNode, TopicEdge
+from src.core.graph_index import TopicGraphIndex
+from src.core.conditions import compile_condition, ConditionError
+from src.core.traversal import TraversalEngine
+
+STATE = {"sentiment": "skeptical", "turns": 4, "guest": {"agrees": False}, "tags": ["ai", "ml"], "time": 130}
+
+@pytest.mark.parametrize("condition,expected", [
+    ("sentiment == skeptical", True),
+    ("sentiment == 'curious'", False),
+    ("turns >= 3 and not guest.agrees", True),
+    ("topic in [ai, 'open source'] or time > 120", True),
+    ("'ai' in tags and 'web' not in tags", True),
+    ("(turns > 10 or time > 100) and sentiment != happy", True),
+    ("missing > 3", False),
+    ("turns > 'text'", False),
+    ("guest.agrees == false", True),
+    ("", True),
+])
+def test_conditions(condition, expected):
+    assert compile_condition(condition)(STATE) is expected
+
+@pytest.mark.parametrize("condition", ["turns >", "a == b c", "(a", "__import__('os')", "a; b", "[a, (b)]"])
+def test_invalid_conditions(condition):
+    with pytest.raises(ConditionError):
+        compile_condition(condition)
+
+def make_engine():
+    graph = TopicGraph(
+        nodes=[TopicNode(id=i, label=i, content="") for i in ["intro", "debate", "deep", "outro"]],
+        edges=[
+            TopicEdge(source_id="intro", target_id="outro"),
+            TopicEdge(source_id="intro", target_id="debate", condition="sentiment == skeptical"),
+            TopicEdge(source_id="intro", target_id="deep", condition="turns >= 5"),
+            TopicEdge(source_id="debate", target_id="outro", condition="broken =="),
+        ],
+        current_node_id="intro",
+    )
+    return TraversalEngine(TopicGraphIndex(graph))
+
+def test_first_matching_condition_wins():
+    engine = make_engine()
+    decision = engine.choose_next("intro", {"sentiment": "skeptical", "turns": 9})
+    assert decision.next_node_id == "debate"
+    assert decision.reason == "condition 'sentiment == skeptical' matched"
+
+    decision = engine.choose_next("intro", {"turns": 9})
+    assert decision.next_node_id == "deep"
+
+def test_default_edge_and_staying():
+    engine = make_engine()
+    decision = engine.choose_next("intro", {"turns": 1})
+    assert decision.next_node_id == "outro" and "default" in decision.reason
+
+    decision = engine.choose_next("intro", {"turns": 1}, allow_default=False)
+    assert not decision.moved
+
+    # Unparseable conditions are reported and never taken
+    assert not engine.choose_next("debate", {}).moved
+    assert "broken ==" in engine.errors
+    assert engine.choose_next("outro", {}).reason == "no outgoing edges"
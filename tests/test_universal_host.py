@@ -72,7 +72,7 @@ def test_host_persona_validation():
 @pytest.mark.asyncio
 async def test_add_to_stream(store, mock_redis):
     msg_id = await store.add_to_stream("test_stream", {"foo": "bar"})
-    mock_redis.xadd.assert_called_with("test_stream", {"foo": "bar"})
+    mock_redis.xadd.assert_called_with("podcaster:{default}:test_stream", {"foo": "bar"})
     assert msg_id == "12345-0"
 
 @pytest.mark.asyncio
@@ -112,6 +112,528 @@ async def test_agent_initialization(store):
 
 @pytest.mark.asyncio
 async def test_acquire_talking_stick(store, mock_redis):
+    store.scripts.client = mock_redis
+    mock_redis.evalsha.return_value = 1
     acquired = await store.acquire_talking_stick("agent_1", timeout=5)
-    mock_redis.set.assert_called_with("talking_stick", "agent_1", nx=True, ex=5)
+    assert mock_redis.evalsha.call_args.args[0] == store.scripts.sha("stick_acquire")
     assert acquired is True
+
+@pytest.mark.asyncio
+async def test_advance_topic_follows_conditions():
+    from src.core.domain import TopicEdge
+    from src.infrastructure.memory_store import InMemoryStateStore
+
+    memory_store = InMemoryStateStore()
+    await memory_store.set_topic_graph(TopicGraph(
+        nodes=[TopicNode(id=i, label=i, content="") for i in ["intro", "debate", "outro"]],
+        edges=[
+            TopicEdge(source_id="intro", target_id="debate", condition="sentiment == skeptical"),
+            TopicEdge(source_id="intro", target_id="outro"),
+        ],
+        current_node_id="intro",
+    ))
+    persona = {"id": "host_sascha", "name": "Sascha", "voice_id": "v1", "system_prompt": "prompt", "a2a_id": "sascha"}
+    with patch("json.load", return_value=persona), patch("builtins.open"), \
+            patch("os.path.exists", return_value=True), \
+            patch("src.agents.universal_host.engine.LiveKitAdapter"):
+        agent = UniversalHostAgent("test_agent", "host_sascha", memory_store)
+
+    # Default edges wait for the minimum number of turns
+    decision = await agent.advance_topic()
+    assert not decision.moved
+
+    agent.update_conversation_state(sentiment="skeptical")
+    decision = await agent.advance_topic()
+    assert decision.next_node_id == "debate"
+    assert (await memory_store.get_current_node()).id == "debate"
+    # The new topic's context is active and the switch was timed
+    assert agent.active_context.node_id == "debate"
+    assert agent.topic_switch_latency.count == 1
+
+@pytest.mark.asyncio
+async def test_topic_changes_are_injected_into_live_session():
+    from types import SimpleNamespace
+    from src.core.domain import TopicEdge
+    from src.infrastructure.memory_store import InMemoryStateStore
+
+    memory_store = InMemoryStateStore()
+    await memory_store.set_topic_graph(TopicGraph(
+        nodes=[TopicNode(id=i, label=i.title(), content=f"{i} facts") for i in ["intro", "debate", "outro"]],
+        edges=[TopicEdge(source_id="intro", target_id="debate"), TopicEdge(source_id="debate", target_id="outro")],
+        current_node_id="intro",
+    ))
+    persona = {"id": "host_sascha", "name": "Sascha", "voice_id": "v1", "system_prompt": "prompt", "a2a_id": "sascha"}
+    with patch("json.load", return_value=persona), patch("builtins.open"), \
+            patch("os.path.exists", return_value=True), \
+            patch("src.agents.universal_host.engine.LiveKitAdapter") as MockAdapter:
+        agent = UniversalHostAgent("test_agent", "host_sascha", memory_store)
+    adapter = MockAdapter.return_value
+    adapter.start_session = AsyncMock()
+    agent.min_turns_per_topic = 1
+
+    async def run_live(**kwargs):
+        # Another host moves the episode while this session is running
+        await memory_store.update_current_node("debate", expected_node_id="intro")
+        await asyncio.sleep(0.05)
+        # Then this host finishes a turn and takes the default edge itself
+        yield SimpleNamespace(turn_complete=True)
+        await asyncio.sleep(0.05)
+
+    runner = MagicMock()
+    runner.run_live = run_live
+    with patch("src.agents.universal_host.engine.runners.Runner", return_value=runner), \
+            patch("src.agents.universal_host.engine.types") as mock_types:
+        task = asyncio.create_task(agent.run_loop())
+        await asyncio.sleep(0.01)
+        await memory_store.publish_event("EPISODE_READY", {"episode_id": "default"})
+        await asyncio.wait_for(task, timeout=2)
+
+    injected = [call.kwargs["text"] for call in mock_types.Part.call_args_list]
+    # One injection per topic, although the host's own move is also announced on the channel
+    assert len(injected) == 2
+    assert "Debate" in injected[0] and "Outro" in injected[1]
+    assert adapter.live_request_queue.send_content.call_count == 2
+    assert agent.active_context.node_id == "outro"
+    assert agent.topic_switch_latency.count == 2
+
+@pytest.mark.asyncio
+async def test_topic_moved_by_another_host_starts_a_fresh_topic():
+    from types import SimpleNamespace
+    from src.core.domain import TopicEdge
+    from src.infrastructure.memory_store import InMemoryStateStore
+
+    memory_store = InMemoryStateStore()
+    await memory_store.set_topic_graph(TopicGraph(
+        nodes=[TopicNode(id=i, label=i.title(), content=f"{i} facts") for i in ["intro", "debate", "outro"]],
+        edges=[TopicEdge(source_id="intro", target_id="debate"), TopicEdge(source_id="debate", target_id="outro")],
+        current_node_id="intro",
+    ))
+    persona = {"id": "host_sascha", "name": "Sascha", "voice_id": "v1", "system_prompt": "prompt", "a2a_id": "sascha"}
+    with patch("json.load", return_value=persona), patch("builtins.open"), \
+            patch("os.path.exists", return_value=True), \
+            patch("src.agents.universal_host.engine.LiveKitAdapter") as MockAdapter:
+        agent = UniversalHostAgent("test_agent", "host_sascha", memory_store)
+    adapter = MockAdapter.return_value
+    adapter.start_session = AsyncMock()
+    agent.min_turns_per_topic = 2
+
+    async def run_live(**kwargs):
+        # This host has already spent its turns on the intro when another host moves on
+        agent._conversation_state["turns_on_topic"] = 2
+        await memory_store.update_current_node("debate", expected_node_id="intro")
+        await asyncio.sleep(0.05)
+        yield SimpleNamespace(turn_complete=True)
+        await asyncio.sleep(0.05)
+
+    runner = MagicMock()
+    runner.run_live = run_live
+    with patch("src.agents.universal_host.engine.runners.Runner", return_value=runner), \
+            patch("src.agents.universal_host.engine.types"):
+        task = asyncio.create_task(agent.run_loop())
+        await asyncio.sleep(0.01)
+        await memory_store.publish_event("EPISODE_READY", {"episode_id": "default"})
+        await asyncio.wait_for(task, timeout=2)
+
+    # One turn on the debate is not enough to leave it
+    assert (await memory_store.get_current_node()).id == "debate"
+    assert agent.active_context.node_id == "debate"
+    assert agent._conversation_state["turns_on_topic"] == 1
+
+@pytest.mark.asyncio
+async def test_turns_do_not_wait_for_topic_evaluation():
+    from types import SimpleNamespace
+    from src.core.domain import TopicEdge
+    from src.infrastructure.memory_store import InMemoryStateStore
+
+    memory_store = InMemoryStateStore()
+    await memory_store.set_topic_graph(TopicGraph(
+        nodes=[TopicNode(id=i, label=i.title(), content=f"{i} facts") for i in ["intro", "debate"]],
+        edges=[TopicEdge(source_id="intro", target_id="debate")],
+        current_node_id="intro",
+    ))
+    persona = {"id": "host_sascha", "name": "Sascha", "voice_id": "v1", "system_prompt": "prompt", "a2a_id": "sascha"}
+    with patch("json.load", return_value=persona), patch("builtins.open"), \
+            patch("os.path.exists", return_value=True), \
+            patch("src.agents.universal_host.engine.LiveKitAdapter") as MockAdapter:
+        agent = UniversalHostAgent("test_agent", "host_sascha", memory_store)
+    adapter = MockAdapter.return_value
+    adapter.start_session = AsyncMock()
+    adapter.send_audio_chunk = AsyncMock()
+    agent.min_turns_per_topic = 1
+
+    # The store is slow: evaluating the topic takes until released
+    release = asyncio.Event()
+    evaluations = []
+    get_topic_index = memory_store.get_topic_index
+
+    async def slow_topic_index():
+        evaluations.append(len(evaluations))
+        await release.wait()
+        return await get_topic_index()
+
+    memory_store.get_topic_index = slow_topic_index
+
+    async def run_live(**kwargs):
+        yield SimpleNamespace(turn_complete=True)
+        await asyncio.sleep(0.01)
+        yield SimpleNamespace(turn_complete=True)
+        # Audio keeps flowing while the first evaluation waits on the store
+        yield SimpleNamespace(parts=[SimpleNamespace(inline_data=SimpleNamespace(data=b"pcm"))])
+        assert adapter.send_audio_chunk.await_count == 1 and evaluations == [0]
+        release.set()
+        await asyncio.sleep(0.05)
+
+    runner = MagicMock()
+    runner.run_live = run_live
+    with patch("src.agents.universal_host.engine.runners.Runner", return_value=runner), \
+            patch("src.agents.universal_host.engine.types"):
+        task = asyncio.create_task(agent.run_loop())
+        await asyncio.sleep(0.01)
+        await memory_store.publish_event("EPISODE_READY", {"episode_id": "default"})
+        await asyncio.wait_for(task, timeout=2)
+
+    # One evaluation at a time; the turn completed meanwhile got its own afterwards
+    assert evaluations == [0, 1]
+    assert (await memory_store.get_current_node()).id == "debate"
+
+@pytest.mark.asyncio
+async def test_turn_ends_after_its_own_audio():
+    from types import SimpleNamespace
+    from src.infrastructure.memory_store import InMemoryStateStore
+
+    memory_store = InMemoryStateStore()
+    await memory_store.set_topic_graph(TopicGraph(nodes=[TopicNode(id="intro", label="Intro", content="")], current_node_id="intro"))
+    persona = {"id": "host_sascha", "name": "Sascha", "voice_id": "v1", "system_prompt": "prompt", "a2a_id": "sascha"}
+    with patch("json.load", return_value=persona), patch("builtins.open"), \
+            patch("os.path.exists", return_value=True), \
+            patch("src.agents.universal_host.engine.LiveKitAdapter") as MockAdapter:
+        agent = UniversalHostAgent("test_agent", "host_sascha", memory_store)
+    adapter = MockAdapter.return_value
+    adapter.start_session = AsyncMock()
+    calls = []
+    adapter.send_audio_chunk = AsyncMock(side_effect=lambda data: calls.append(data))
+    adapter.end_of_turn.side_effect = lambda: calls.append("end_of_turn")
+
+    async def run_live(**kwargs):
+        # The last audio of a turn can arrive on the turn_complete event itself
+        yield SimpleNamespace(turn_complete=True, parts=[SimpleNamespace(inline_data=SimpleNamespace(data=b"tail"))])
+
+    runner = MagicMock()
+    runner.run_live = run_live
+    with patch("src.agents.universal_host.engine.runners.Runner", return_value=runner), \
+            patch("src.agents.universal_host.engine.types"):
+        task = asyncio.create_task(agent.run_loop())
+        await asyncio.sleep(0.01)
+        await memory_store.publish_event("EPISODE_READY", {"episode_id": "default"})
+        await asyncio.wait_for(task, timeout=2)
+
+    assert calls == [b"tail", "end_of_turn"]
+
+def test_hosts_share_registry_personas(store, tmp_path):
+    from src.personas.registry import PersonaRegistry
+
+    path = tmp_path / "host_ada.json"
+    path.write_text(json.dumps({"id": "host_ada", "name": "Ada", "voice_id": "v1", "system_prompt": "prompt", "a2a_id": "ada"}))
+    registry = PersonaRegistry(str(tmp_path))
+    registry.load()
+    with patch("src.agents.universal_host.engine.LiveKitAdapter"):
+        hosts = [UniversalHostAgent(f"host_{i}", "host_ada", store, persona_registry=registry) for i in range(3)]
+    assert all(host.persona is registry.get("host_ada") for host in hosts)
+
+    # An edit is picked up by the next session without rebuilding the host
+    path.write_text(json.dumps({"id": "host_ada", "name": "Ada Lovelace", "voice_id": "v1", "system_prompt": "prompt", "a2a_id": "ada"}))
+    registry.scan()
+    hosts[0]._load_persona()
+    assert hosts[0].persona.name == "Ada Lovelace"
+
+def runtime_personas(tmp_path, *persona_ids):
+    from src.personas.registry import PersonaRegistry
+
+    for persona_id in persona_ids:
+        (tmp_path / f"{persona_id}.json").write_text(json.dumps(
+            {"id": persona_id, "name": persona_id.title(), "voice_id": "v1", "system_prompt": "prompt", "a2a_id": persona_id}
+        ))
+    registry = PersonaRegistry(str(tmp_path))
+    registry.load()
+    return registry
+
+def test_host_runtime_shares_stores_and_vad(tmp_path):
+    from src.infrastructure.memory_store import InMemoryStateStore
+    from src.infrastructure import livekit_adapter
+    from src.agents.universal_host.runtime import HostRuntime
+
+    base = InMemoryStateStore("daily")
+    runtime = HostRuntime(base, runtime_personas(tmp_path, "ada", "bo", "cy"))
+    with patch("src.agents.universal_host.engine.LiveKitAdapter") as MockAdapter:
+        ada = runtime.add_host("ada")
+        bo = runtime.add_host("bo")
+        cy = runtime.add_host("cy", episode_id="late_show")
+        with pytest.raises(ValueError):
+            runtime.add_host("ada")
+        with pytest.raises(ValueError):
+            runtime.add_host("nobody")
+
+    # Hosts of one episode share its graph cache; all episodes share the backend
+    assert ada.state_store is bo.state_store
+    assert cy.state_store is not ada.state_store
+    assert cy.state_store.store.backend is base.backend
+    assert cy.room_id == "late_show" and ada.room_id is None
+    assert runtime.stats["hosts"] == 3 and runtime.stats["episodes"] == 2
+    # Every adapter sees the identities of all hosts, including ones added later
+    assert all(call.kwargs["peer_identities"] is runtime.identities for call in MockAdapter.call_args_list)
+    assert runtime.identities == {"host_ada", "host_bo", "host_cy"}
+
+    # One VAD model per process, however many adapters
+    livekit_adapter.default_vad.cache_clear()
+    with patch.object(livekit_adapter.silero.VAD, "load") as load:
+        adapters = [livekit_adapter.LiveKitAdapter(identity=f"host_{i}") for i in range(3)]
+    load.assert_called_once()
+    assert all(adapter._vad is adapters[0]._vad for adapter in adapters)
+    livekit_adapter.default_vad.cache_clear()
+
+@pytest.mark.asyncio
+async def test_host_runtime_charges_cpu_per_host(tmp_path):
+    import time
+    from src.infrastructure.memory_store import InMemoryStateStore
+    from src.agents.universal_host.runtime import HostRuntime
+
+    async def run_loop(self):
+        async def busy(seconds):
+            deadline = time.thread_time() + seconds
+            while time.thread_time() < deadline:
+                # Spin in 5 ms steps, yielding to the other host in between
+                step = time.thread_time() + 0.005
+                while time.thread_time() < step:
+                    pass
+                await asyncio.sleep(0)
+        # Work done in tasks the host starts counts towards the host
+        await asyncio.create_task(busy(0.2 if self.persona_id == "busy" else 0.01))
+
+    runtime = HostRuntime(InMemoryStateStore(), runtime_personas(tmp_path, "busy", "idle"))
+    with patch("src.agents.universal_host.engine.LiveKitAdapter"), \
+            patch.object(UniversalHostAgent, "run_loop", run_loop):
+        runtime.add_host("busy")
+        runtime.add_host("idle")
+        await runtime.start()
+        await asyncio.gather(*runtime._tasks.values())
+        stats = runtime.stats
+        await runtime.stop()
+
+    busy, idle = stats["per_host"]["busy"], stats["per_host"]["idle"]
+    assert busy["tasks"] == 2 and idle["tasks"] == 2
+    assert busy["cpu_seconds"] >= 0.15
+    assert idle["cpu_seconds"] < busy["cpu_seconds"] / 4
+    assert not busy["running"]
+    assert stats["rss_bytes"] > 0
+
+def test_host_runtime_routes_by_persona(tmp_path):
+    from contextlib import asynccontextmanager
+    from starlette.applications import Starlette
+    from starlette.responses import PlainTextResponse
+    from starlette.testclient import TestClient
+    from src.infrastructure.memory_store import InMemoryStateStore
+    from src.agents.universal_host.runtime import HostRuntime
+
+    def host_app(agent):
+        # Like to_a2a, routes are only registered in the app's lifespan
+        @asynccontextmanager
+        async def lifespan(app):
+            app.add_route("/", lambda request: PlainTextResponse(agent.persona.name))
+            yield
+        return Starlette(lifespan=lifespan)
+
+    runtime = HostRuntime(InMemoryStateStore(), runtime_personas(tmp_path, "ada", "bo"))
+    with patch("src.agents.universal_host.engine.LiveKitAdapter"):
+        runtime.add_host("ada")
+        runtime.add_host("bo")
+    with TestClient(runtime.build_app(host_app)) as client:
+        assert client.get("/ada/").text == "Ada"
+        assert client.get("/bo/").text == "Bo"
+        assert set(client.get("/hosts").json()["per_host"]) == {"ada", "bo"}
+
+@pytest.mark.asyncio
+async def test_adapter_sends_fixed_frames_in_real_time():
+    from types import SimpleNamespace
+    from src.infrastructure import livekit_adapter
+
+    adapter = livekit_adapter.LiveKitAdapter(vad_model=MagicMock(), frame_ms=10, lead_ms=30)
+    loop = asyncio.get_running_loop()
+    frame = SimpleNamespace(data=memoryview(bytearray(480)).cast("h"))
+    sent = []
+
+    async def capture_frame(captured):
+        sent.append((loop.time(), bytes(captured.data.cast("B"))))
+
+    adapter._sender.capture = capture_frame
+    audio = (bytes(range(256)) * 38)[:9721]
+    started = loop.time()
+    with patch.object(livekit_adapter.rtc.AudioFrame, "create", return_value=frame):
+        # 202.5 ms of audio in odd-sized chunks, all at once like a model burst
+        for offset in range(0, len(audio), 999):
+            await adapter.send_audio_chunk(audio[offset:offset + 999])
+        adapter.end_of_turn()
+        while len(sent) < 21:
+            await asyncio.sleep(0.01)
+
+    assert all(len(data) == 480 for _, data in sent)
+    assert b"".join(data for _, data in sent) == audio[:-1] + bytes(480 * 21 - len(audio) + 1)
+    # Sent at playout pace, never more than the lead ahead
+    assert sent[-1][0] - started >= 0.2 - 0.03 - 0.005
+    assert adapter.audio_stats["frames_sent"] == 21
+    await adapter._sender.close()
+
+@pytest.mark.asyncio
+async def test_barge_in_silences_host_and_reports_played_position():
+    from types import SimpleNamespace
+    from src.infrastructure import livekit_adapter
+
+    adapter = livekit_adapter.LiveKitAdapter(vad_model=MagicMock(), frame_ms=10, lead_ms=30)
+    loop = asyncio.get_running_loop()
+    sent = []
+
+    async def capture_frame(frame):
+        sent.append(loop.time())
+
+    adapter._sender.capture = capture_frame
+    adapter._sender.clear_downstream = clear_queue = MagicMock()
+    frame = SimpleNamespace(data=memoryview(bytearray(480)).cast("h"))
+    with patch.object(livekit_adapter.rtc.AudioFrame, "create", return_value=frame):
+        # Five 100 ms chunks from the model, then the user talks over chunk 1
+        for _ in range(5):
+            await adapter.send_audio_chunk(bytes(4800))
+        await asyncio.sleep(0.15)
+        position = adapter.barge_in(speech_started_at=loop.time() - 0.05)
+        frames_at_barge_in = len(sent)
+
+        # Nothing more goes out, including the rest of the turn still streaming in
+        await adapter.send_audio_chunk(bytes(4800))
+        await asyncio.sleep(0.05)
+        assert len(sent) == frames_at_barge_in
+        clear_queue.assert_called_once()
+        assert position["last_token_index"] == 1
+        assert 100 <= position["played_ms"] <= 200
+        assert 0.05 <= adapter.barge_in_latency.percentile(99) < 0.15
+
+        # The model's own interruption reports the same position and re-opens output
+        assert adapter.interrupt() == position
+        await adapter.send_audio_chunk(bytes(4800))
+        await asyncio.sleep(0.03)
+        assert len(sent) > frames_at_barge_in
+    assert adapter.audio_stats["barge_ins"] == 1
+    await adapter._sender.close()
+
+@pytest.mark.asyncio
+async def test_interruption_records_played_position():
+    from types import SimpleNamespace
+    from src.infrastructure.memory_store import InMemoryStateStore
+
+    memory_store = InMemoryStateStore()
+    await memory_store.set_topic_graph(TopicGraph(nodes=[TopicNode(id="intro", label="Intro", content="")], current_node_id="intro"))
+    memory_store.queue_stream_entry = AsyncMock()
+    persona = {"id": "host_sascha", "name": "Sascha", "voice_id": "v1", "system_prompt": "prompt", "a2a_id": "sascha"}
+    with patch("json.load", return_value=persona), patch("builtins.open"), \
+            patch("os.path.exists", return_value=True), \
+            patch("src.agents.universal_host.engine.LiveKitAdapter") as MockAdapter:
+        agent = UniversalHostAgent("test_agent", "host_sascha", memory_store)
+    adapter = MockAdapter.return_value
+    adapter.start_session = AsyncMock()
+    adapter.interrupt.return_value = {"last_token_index": 3, "played_ms": 812.4}
+
+    async def run_live(**kwargs):
+        yield SimpleNamespace(interrupted=True)
+
+    runner = MagicMock()
+    runner.run_live = run_live
+    with patch("src.agents.universal_host.engine.runners.Runner", return_value=runner), \
+            patch("src.agents.universal_host.engine.types"):
+        task = asyncio.create_task(agent.run_loop())
+        await asyncio.sleep(0.01)
+        await memory_store.publish_event("EPISODE_READY", {"episode_id": "default"})
+        await asyncio.wait_for(task, timeout=2)
+
+    adapter.interrupt.assert_called_once()
+    fields = memory_store.queue_stream_entry.call_args.args[1]
+    assert fields["event"] == "INTERRUPTION"
+    assert fields["metadata"] == {"last_token_index": 3, "played_ms": 812}
+
+@pytest.mark.asyncio
+async def test_inbound_audio_is_batched_and_flushed_around_speech():
+    from types import SimpleNamespace
+    from src.infrastructure import livekit_adapter
+
+    events = asyncio.Queue()
+
+    class VADStream:
+        def push_frame(self, frame):
+            pass
+
+        def __aiter__(self):
+            return self
+
+        async def __anext__(self):
+            return await events.get()
+
+    vad_model = MagicMock()
+    vad_model.stream.return_value = VADStream()
+    adapter = livekit_adapter.LiveKitAdapter(vad_model=vad_model, inbound_chunk_ms=60)
+    speech = livekit_adapter.vad.VADEventType
+    calls = []
+    adapter._queue = SimpleNamespace(
+        send_realtime=lambda blob: calls.append(("audio", blob["data"])),
+        send_activity_start=lambda: calls.append(("start", None)),
+        send_activity_end=lambda: calls.append(("end", None)),
+    )
+
+    async def frames():
+        for i in range(30):
+            yield SimpleNamespace(data=memoryview(bytearray([i]) * 480).cast("h"))
+            if i == 8:
+                await events.put(SimpleNamespace(type=speech.START_OF_SPEECH, speech_duration=0.05))
+            elif i == 20:
+                await events.put(SimpleNamespace(type=speech.END_OF_SPEECH))
+            await asyncio.sleep(0.001)
+
+    with patch.object(livekit_adapter.types, "Blob", side_effect=lambda **kwargs: kwargs):
+        await adapter._handle_audio_stream(frames())
+
+    audio = [data for kind, data in calls if kind == "audio"]
+    # Every frame arrives once, in order, in far fewer messages than frames
+    assert b"".join(audio) == b"".join(bytes([i]) * 480 for i in range(30))
+    assert adapter.inbound_frames == 30 and adapter.inbound_messages == len(audio) <= 8
+    # The partial chunk holding the onset goes out right after the activity starts,
+    # and the tail of the utterance before it ends
+    start, end = calls.index(("start", None)), calls.index(("end", None))
+    assert calls[start + 1][0] == "audio" and len(calls[start + 1][1]) < 2880
+    assert calls[end - 1][0] == "audio"
+    assert adapter.audio_stats["inbound_messages"] == len(audio)
+
+@pytest.mark.asyncio
+async def test_co_host_audio_does_not_barge_in():
+    from types import SimpleNamespace
+    from src.infrastructure import livekit_adapter
+
+    vad_model = MagicMock()
+    adapter = livekit_adapter.LiveKitAdapter(vad_model=vad_model, identity="host_ada", peer_identities={"host_bo"})
+    calls = []
+    adapter._queue = SimpleNamespace(
+        send_realtime=lambda blob: calls.append(("audio", blob["data"])),
+        send_activity_start=lambda: calls.append(("start", None)),
+        send_activity_end=lambda: calls.append(("end", None)),
+    )
+    adapter.barge_in = MagicMock()
+
+    assert adapter._is_agent(SimpleNamespace(identity="host_bo"))
+    assert not adapter._is_agent(SimpleNamespace(identity="listener-1"))
+
+    async def frames():
+        for i in range(12):
+            yield SimpleNamespace(data=memoryview(bytearray([i]) * 480).cast("h"))
+
+    with patch.object(livekit_adapter.types, "Blob", side_effect=lambda **kwargs: kwargs):
+        await adapter._handle_audio_stream(frames(), from_agent=True)
+
+    # The model still hears the co-host, but no VAD runs on its track
+    vad_model.stream.assert_not_called()
+    adapter.barge_in.assert_not_called()
+    assert [kind for kind, _ in calls] == ["audio"] * len(calls) and calls
+    assert b"".join(data for _, data in calls) == b"".join(bytes([i]) * 480 for i in range(12))